@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+녹화 페이지 기반 전체 파이프라인 벤치마크
+fake_services 대체 서버가 Google Trends/뉴스/이미지, YouTube 검색 결과의 녹화 페이지와
+Gemini/Imagen/WordPress/Telegram 응답을 제공하고, 임시 작업 디렉토리에서
+get_trending_keywords → generate_blog_content → _build_markdown_content → markdown_to_html → post_to_wordpress
+전 과정을 실행하여 단계별/전체 지연 시간, 동시 실행 시 분당 포스트 수, 최대 메모리(RSS)를 JSON으로 기록한다.
+
+실행: python -m benchmarks [--iterations 3] [--concurrency 1,2,4] [--baseline benchmarks/baseline.json]
+"""
+from benchmarks.pipeline import compare_reports, run_benchmark
+
+__all__ = ['compare_reports', 'run_benchmark']
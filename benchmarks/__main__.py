@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+파이프라인 벤치마크 실행
+
+예시:
+    python -m benchmarks --iterations 5 --concurrency 1,2,4
+    python -m benchmarks --save-baseline                     # 현재 결과를 기준값으로 저장
+    python -m benchmarks --fail-on-regression --tolerance 0.15
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from benchmarks.pipeline import REPO_ROOT, compare_reports, run_benchmark
+
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+
+
+def print_summary(report, comparison=None):
+    print(f"\n벤치마크 결과 ({report['git_revision'] or 'unknown'}, {report['total_seconds']}초)")
+    print(f"{'단계':<24}{'횟수':>6}{'p50(ms)':>12}{'p95(ms)':>12}")
+    for stage, stats in report['stages'].items():
+        print(f"{stage:<24}{stats['count']:>6}{stats.get('p50_ms', '-'):>12}{stats.get('p95_ms', '-'):>12}")
+    e2e = report['end_to_end']
+    print(f"{'end_to_end':<24}{e2e['count']:>6}{e2e.get('p50_ms', '-'):>12}{e2e.get('p95_ms', '-'):>12}"
+          f"  (실패 {e2e['failures']}회)")
+    for entry in report['throughput']:
+        print(f"동시 실행 {entry['concurrency']}: {entry['succeeded']}/{entry['posts']}개 성공, "
+              f"{entry['wall_seconds']}초, 분당 {entry['posts_per_minute']}개")
+    memory = report['memory']
+    print(f"최대 RSS: {memory['peak_rss_mb']} MB (브라우저 자식 프로세스 {memory['peak_rss_children_mb']} MB)")
+
+    for problem in report.get('problems') or []:
+        print(f"실패: {problem}")
+
+    if comparison:
+        print("\n기준값 비교")
+        for row in comparison:
+            mark = '회귀' if row['regression'] else ''
+            print(f"{row['metric']:<44}{row['baseline']:>12}{row['current']:>12}{row['change']:>+9.1%}  {mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recorded-fixture benchmark for the blog creation pipeline')
+    parser.add_argument('--iterations', type=int, default=3, help='Sequential runs used for per-stage latency (default: 3)')
+    parser.add_argument('--warmup', type=int, default=1, help='Runs discarded before measuring (default: 1)')
+    parser.add_argument('--concurrency', default='1,2,4', help='Comma-separated batch concurrency levels (default: 1,2,4)')
+    parser.add_argument('--posts', type=int, default=4, help='Posts per batch in the throughput phase (default: 4)')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help='Multiply fake service latency (default: 1.0)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for fake service jitter (default: 42)')
+    parser.add_argument('--keep-rate-limits', action='store_true', help='Keep rate_limits from system_config.json')
+    parser.add_argument('--warm-cache', action='store_true', help='Keep the Gemini response cache enabled')
+    parser.add_argument('--keep-workspace', action='store_true', help='Keep the temporary working directory')
+    parser.add_argument('--output', help='Report path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline report to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Write this report to the baseline path')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Allowed relative slowdown before a regression (default: 0.10)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help='Ignore latency changes smaller than this (default: 5.0)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 when a regression is found')
+    parser.add_argument('--verbose', action='store_true', help='Print system logs')
+    args = parser.parse_args()
+
+    concurrency = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    output = os.path.abspath(args.output) if args.output else os.path.join(
+        DEFAULT_RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    baseline_path = os.path.abspath(args.baseline)
+
+    try:
+        report = run_benchmark(
+            iterations=args.iterations,
+            warmup=args.warmup,
+            concurrency=concurrency,
+            posts=args.posts,
+            latency_scale=args.latency_scale,
+            seed=args.seed,
+            keep_rate_limits=args.keep_rate_limits,
+            warm_cache=args.warm_cache,
+            keep_workspace=args.keep_workspace,
+            verbose=args.verbose,
+        )
+    except RuntimeError as e:
+        print(f"벤치마크 실행 실패: {e}", file=sys.stderr)
+        sys.exit(2)
+    # 실패한 포스트가 섞인 측정값은 기준값으로 쓰지 않음
+    save_baseline = args.save_baseline and not report['problems']
+
+    comparison = None
+    if not args.save_baseline and os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison = compare_reports(report, baseline, tolerance=args.tolerance, min_delta_ms=args.min_delta_ms)
+        report['comparison'] = {
+            'baseline': baseline_path,
+            'baseline_revision': baseline.get('git_revision'),
+            'tolerance': args.tolerance,
+            'min_delta_ms': args.min_delta_ms,
+            'metrics': comparison,
+            'regressions': sum(1 for row in comparison if row['regression']),
+        }
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    if save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_summary(report, comparison)
+    print(f"\n보고서 저장: {output}")
+    if save_baseline:
+        print(f"기준값 저장: {baseline_path}")
+    elif args.save_baseline:
+        print("실패한 실행이 있어 기준값을 저장하지 않습니다.", file=sys.stderr)
+
+    if report['problems']:
+        sys.exit(2)
+    if args.fail_on_regression and comparison and any(row['regression'] for row in comparison):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
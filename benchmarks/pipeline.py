@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크 실행 및 기준값 비교
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REPORT_VERSION = 1
+
+# 계측할 메서드 → 보고서 단계 이름
+STAGE_METHODS = {
+    'get_trending_keywords': 'trends',
+    'fetch_google_news': 'news',
+    'fetch_ai_image': 'ai_image',
+    'fetch_google_image': 'image_search',
+    'fetch_youtube_video': 'youtube',
+    'get_related_posts': 'related_posts',
+    '_analyze_keyword_category': 'category',
+    '_stream_article': 'llm.article',
+    'generate_blog_content': 'generate_blog_content',
+    '_localize_images': 'download_images',
+    '_build_markdown_content': 'build_markdown',
+    'markdown_to_html': 'markdown_to_html',
+    'post_to_wordpress': 'post_to_wordpress',
+    'save_blog_post': 'save_blog_post',
+}
+
+
+def percentile(values, pct):
+    """선형 보간 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """초 단위 측정값 목록 → 밀리초 통계"""
+    if not samples:
+        return {'count': 0}
+    to_ms = lambda value: round(value * 1000, 2)
+    return {
+        'count': len(samples),
+        'mean_ms': to_ms(sum(samples) / len(samples)),
+        'p50_ms': to_ms(percentile(samples, 50)),
+        'p95_ms': to_ms(percentile(samples, 95)),
+        'min_ms': to_ms(min(samples)),
+        'max_ms': to_ms(max(samples)),
+    }
+
+
+class StageTimer:
+    """시스템 인스턴스의 메서드를 감싸 호출 시간을 단계별로 수집 (여러 스레드에서 동시에 기록)"""
+
+    def __init__(self):
+        self.active = True
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, stage, seconds):
+        if not self.active:
+            return
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, obj, method_name, stage):
+        """obj.method_name을 시간 측정 래퍼로 교체 (인스턴스 속성이므로 클래스에는 영향 없음)"""
+        original = getattr(obj, method_name, None)
+        if original is None:
+            return
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+
+        setattr(obj, method_name, timed)
+
+    def wrap_generate_text(self, obj):
+        """_generate_text는 호출 용도(purpose)별로 나눠 기록"""
+        original = obj._generate_text
+
+        def timed(prompt, purpose, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(prompt, purpose, *args, **kwargs)
+            finally:
+                self.record(f"llm.{purpose}", time.perf_counter() - started)
+
+        obj._generate_text = timed
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+
+    def summary(self):
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._samples.items()}
+        return {stage: summarize(values) for stage, values in sorted(samples.items())}
+
+
+def peak_rss_mb(who='self'):
+    """프로세스(또는 종료된 자식 프로세스)의 최대 RSS (MB, resource 모듈이 없으면 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    target = resource.RUSAGE_SELF if who == 'self' else resource.RUSAGE_CHILDREN
+    usage = resource.getrusage(target).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(usage / divisor, 1)
+
+
+def git_revision():
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+            capture_output=True, text=True, timeout=5
+        )
+        return output.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def prepare_workspace(directory, base_url, keep_rate_limits=False, warm_cache=False, log_echo=False):
+    """
+    임시 작업 디렉토리에 벤치마크용 system_config.json 작성
+    (스크래핑 주소는 대체 서버, 응답 캐시/컨텍스트 캐시/중복 검사는 끄고, 속도 제한은 선택적으로 해제)
+    """
+    from fake_services import source_urls_for
+
+    with open(os.path.join(REPO_ROOT, 'system_config.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config['source_urls'] = source_urls_for(base_url)
+    # 대체 서버는 cachedContents를 지원하지 않으므로 system_instruction 경로 사용
+    config['context_cache'] = {**config.get('context_cache', {}), 'enabled': False}
+    if not warm_cache:
+        llm_cache = config.setdefault('llm_cache', {})
+        llm_cache['policies'] = {
+            purpose: {**policy, 'enabled': False}
+            for purpose, policy in llm_cache.get('policies', {}).items()
+        }
+        for purpose in ('category', 'article'):
+            llm_cache['policies'].setdefault(purpose, {'enabled': False})
+    if not keep_rate_limits:
+        config['rate_limits'] = {}
+    # 로그 기록기 스레드의 콘솔 출력은 stdout 가로채기 범위 밖에서도 일어나므로 설정으로 끔
+    config['logging'] = {**config.get('logging', {}), 'echo': log_echo}
+    # 대체 Gemini의 본문은 키워드만 바뀌는 같은 템플릿이라 중복 검사가 켜져 있으면 첫 글 이후는 모두 보류되고,
+    # 키워드도 반복 측정을 위해 같은 목록을 다시 쓰므로 두 중복 검사 모두 끔
+    config['content_dedupe'] = {**config.get('content_dedupe', {}), 'enabled': False}
+    config['keyword_dedupe'] = {**config.get('keyword_dedupe', {}), 'enabled': False}
+
+    with open(os.path.join(directory, 'system_config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    return config
+
+
+def benchmark_env(base_url):
+    """모든 외부 호출을 대체 서버로 보내는 환경 변수"""
+    return {
+        'GEMINI_API_KEY': 'benchmark-key',
+        'GEMINI_API_BASE_URL': base_url,
+        'TELEGRAM_API_BASE_URL': base_url,
+        'TELEGRAM_TOKEN': 'benchmark-token',
+        'TELEGRAM_CHAT_ID': '1',
+        'WORDPRESS_URL': base_url,
+        'WORDPRESS_USERNAME': 'benchmark',
+        'WORDPRESS_APP_PASSWORD': 'benchmark',
+        'KEYWORD_SERVICE_URL': '',
+    }
+
+
+def run_benchmark(iterations=3, warmup=1, concurrency=(1, 2, 4), posts=4, latency_scale=1.0,
+                  seed=42, keep_rate_limits=False, warm_cache=False, keep_workspace=False, verbose=False):
+    """
+    대체 서버를 띄우고 임시 작업 디렉토리에서 파이프라인을 실행하여 보고서(dict) 반환
+
+    Args:
+        iterations: 단계별 측정용 순차 실행 횟수 (키워드 하나당 트렌드 조회 + 포스트 생성/게시)
+        warmup: 측정 전 버리는 실행 횟수 (브라우저 실행, 모델 생성 등 초기 비용 제외)
+        concurrency: 처리량을 측정할 동시 실행 수 목록
+        posts: 동시 실행 측정 시 배치당 포스트 수
+        latency_scale: 대체 서버 지연 시간 배율 (0이면 지연 없음)
+        keep_rate_limits: True면 system_config.json의 rate_limits 유지
+        warm_cache: True면 Gemini 응답 캐시 유지 (기본은 매 호출 실제 생성)
+        keep_workspace: True면 임시 작업 디렉토리를 삭제하지 않음
+        verbose: 시스템 로그를 그대로 출력
+
+    Gemini 클라이언트를 준비하지 못하면 측정할 수 없으므로 RuntimeError를 발생시키고,
+    측정 중 실패한 포스트는 보고서의 problems에 기록한다 (비어 있지 않으면 결과를 신뢰할 수 없음).
+    """
+    from fake_services import FakeServiceServer
+    import rate_limiter
+    # 작업 디렉토리로 이동하기 전에 import (저장소 루트 기준 모듈 경로)
+    from wordpress_trend_blog import WordPressTrendBlogSystem
+
+    server = FakeServiceServer('127.0.0.1', 0, seed=seed)
+    for settings in server.state.config.values():
+        for key in ('latency_ms', 'jitter_ms', 'chunk_delay_ms'):
+            if key in settings:
+                settings[key] = settings[key] * latency_scale
+    base_url = server.start()
+
+    workspace = tempfile.mkdtemp(prefix='trend_blog_bench_')
+    previous_cwd = os.getcwd()
+    previous_env = {key: os.environ.get(key) for key in benchmark_env(base_url)}
+    os.environ.update(benchmark_env(base_url))
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    started = time.perf_counter()
+    try:
+        os.chdir(workspace)
+        config = prepare_workspace(workspace, base_url, keep_rate_limits=keep_rate_limits, warm_cache=warm_cache,
+                                   log_echo=verbose)
+
+        with output:
+            system = WordPressTrendBlogSystem()
+            if not system.client_ready:
+                # 클라이언트 없이는 본문 생성이 바로 자리표시자를 반환하므로 측정값이 의미 없음
+                raise RuntimeError("Gemini 클라이언트를 준비하지 못했습니다 (google-generativeai 설치 확인).")
+            timer = StageTimer()
+            for method_name, stage in STAGE_METHODS.items():
+                timer.wrap(system, method_name, stage)
+            timer.wrap_generate_text(system)
+
+            # 1. 워밍업 (측정 제외)
+            timer.active = False
+            keywords = system.get_trending_keywords(force_refresh=True) or []
+            if not keywords:
+                raise RuntimeError("녹화된 트렌드 페이지에서 키워드를 가져오지 못했습니다.")
+            for idx in range(warmup):
+                system.create_post(keywords[idx % len(keywords)], do_post=True)
+
+            # 2. 단계별 지연 시간: 순차 실행
+            timer.reset()
+            timer.active = True
+            end_to_end = []
+            failures = 0
+            for idx in range(iterations):
+                run_started = time.perf_counter()
+                keywords = system.get_trending_keywords(force_refresh=True) or keywords
+                result = system.create_post(keywords[(warmup + idx) % len(keywords)], do_post=True)
+                end_to_end.append(time.perf_counter() - run_started)
+                if not (result.get('success') and result.get('posted')):
+                    failures += 1
+            stages = timer.summary()
+            timer.active = False
+
+            # 3. 처리량: run_blog_creation 배치를 동시 실행 수별로 실행
+            problems = []
+            if failures:
+                problems.append(f"순차 실행 {iterations}회 중 {failures}회 실패")
+            throughput = []
+            for level in concurrency:
+                system.keyword_store.remove([entry['keyword'] for entry in system.keyword_store.entries()])
+                batch_started = time.perf_counter()
+                results = system.run_blog_creation(do_post=True, batch_size=posts, concurrency=level)
+                wall = time.perf_counter() - batch_started
+                succeeded = sum(1 for result in results if result.get('success') and result.get('posted'))
+                throughput.append({
+                    'concurrency': level,
+                    'posts': len(results),
+                    'succeeded': succeeded,
+                    'wall_seconds': round(wall, 3),
+                    'posts_per_minute': round(succeeded / wall * 60, 2) if wall > 0 else None,
+                })
+                if succeeded < posts:
+                    problems.append(f"동시 실행 {level}: {posts}개 중 {succeeded}개만 성공")
+
+            system_stats = {
+                'browser_pool': system.browser_pool.stats(),
+                'response_cache': system.response_cache.stats(),
+                'rate_limiter': rate_limiter.limiter_stats(),
+            }
+            system.browser_pool.close()
+    finally:
+        os.chdir(previous_cwd)
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        with server.state.lock:
+            service_requests = json.loads(json.dumps(server.state.requests))
+        server.stop()
+        if not keep_workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    return {
+        'version': REPORT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'iterations': iterations,
+            'warmup': warmup,
+            'concurrency': list(concurrency),
+            'posts': posts,
+            'latency_scale': latency_scale,
+            'seed': seed,
+            'keep_rate_limits': keep_rate_limits,
+            'warm_cache': warm_cache,
+            'browser_pool_size': config.get('browser_pool', {}).get('size', 1),
+        },
+        'stages': stages,
+        'end_to_end': {**summarize(end_to_end), 'failures': failures},
+        'throughput': throughput,
+        'problems': problems,
+        'memory': {
+            'peak_rss_mb': peak_rss_mb('self'),
+            # 브라우저 풀 종료 후 회수된 Chromium 자식 프로세스 중 최대값
+            'peak_rss_children_mb': peak_rss_mb('children'),
+        },
+        'services': service_requests,
+        'system': system_stats,
+        'workspace': workspace if keep_workspace else None,
+        'total_seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+def _metrics_of(report):
+    """비교 대상 지표: 이름 → (값, 높을수록 좋은지)"""
+    metrics = {}
+    for stage, stats in (report.get('stages') or {}).items():
+        for key in ('p50_ms', 'p95_ms'):
+            if stats.get(key) is not None:
+                metrics[f"stages.{stage}.{key}"] = (stats[key], False)
+    for key in ('p50_ms', 'p95_ms'):
+        value = (report.get('end_to_end') or {}).get(key)
+        if value is not None:
+            metrics[f"end_to_end.{key}"] = (value, False)
+    for entry in report.get('throughput') or []:
+        if entry.get('posts_per_minute') is not None:
+            metrics[f"throughput.c{entry['concurrency']}.posts_per_minute"] = (entry['posts_per_minute'], True)
+    peak = (report.get('memory') or {}).get('peak_rss_mb')
+    if peak is not None:
+        metrics['memory.peak_rss_mb'] = (peak, False)
+    return metrics
+
+
+def compare_reports(current, baseline, tolerance=0.10, min_delta_ms=5.0):
+    """
+    현재 보고서를 기준 보고서와 비교
+
+    Args:
+        tolerance: 허용 변화율 (0.10이면 10%보다 나빠지면 회귀로 판단)
+        min_delta_ms: 지연 시간 지표는 이 값(ms) 이상 늘어난 경우에만 회귀로 판단 (짧은 단계의 측정 잡음 제외)
+
+    Returns:
+        list: [{'metric', 'baseline', 'current', 'change', 'regression'}, ...] (양쪽에 모두 있는 지표만)
+    """
+    current_metrics = _metrics_of(current)
+    rows = []
+    for name, (base_value, higher_is_better) in _metrics_of(baseline).items():
+        if name not in current_metrics:
+            continue
+        value = current_metrics[name][0]
+        change = (value - base_value) / base_value if base_value else 0.0
+        worse = -change if higher_is_better else change
+        regression = worse > tolerance
+        if name.endswith('_ms') and value - base_value < min_delta_ms:
+            regression = False
+        rows.append({
+            'metric': name,
+            'baseline': base_value,
+            'current': value,
+            'change': round(change, 4),
+            'regression': regression,
+        })
+    return rows
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Playwright 브라우저 풀
+Chromium 프로세스를 계속 띄워 두고 호출마다 격리된 컨텍스트/페이지를 빌려준다.
+Playwright sync API는 자신을 생성한 스레드에서만 사용할 수 있으므로
+브라우저마다 전용 작업 스레드를 두고 모든 페이지 작업을 그 스레드에서 실행한다.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class _BrowserSlot:
+    """Chromium 프로세스 1개와 이를 소유하는 전용 스레드"""
+
+    def __init__(self, index):
+        self.index = index
+        self.playwright = None
+        self.browser = None
+        self.pages_served = 0
+        self.tasks = queue.Queue()
+        self.thread = None
+        self._start_lock = threading.Lock()
+
+    def _worker(self):
+        while True:
+            item = self.tasks.get()
+            if item is None:
+                return
+            func, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, func):
+        # 전용 스레드는 첫 작업 시점에 시작 (풀 생성 자체는 부작용 없이 가볍게 유지)
+        with self._start_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker, name=f"browser-pool-{self.index}", daemon=True)
+                self.thread.start()
+        future = Future()
+        self.tasks.put((func, future))
+        return future
+
+
+class BrowserPool:
+    """
+    여러 스크래핑 메서드가 공유하는 장수명 Chromium 풀
+
+    Args:
+        size: 동시에 유지할 브라우저 프로세스 수
+        max_pages_per_browser: 이 수만큼 페이지를 처리하면 브라우저 재시작
+        max_memory_mb: 풀 전체 브라우저 메모리(RSS)가 이 값을 넘으면 재시작 (psutil 필요)
+        headless: 헤드리스 모드 여부
+        log: 로그 함수 (message 하나를 받는 callable)
+    """
+
+    def __init__(self, size=1, max_pages_per_browser=50, max_memory_mb=None, headless=True, log=None):
+        self.size = max(1, int(size))
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_memory_mb = max_memory_mb
+        self.headless = headless
+        self._log = log or (lambda message: None)
+
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+        self._idle = queue.Queue()
+        for slot in self._slots:
+            self._idle.put(slot)
+
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'launches': 0,
+            'launch_time_total': 0.0,
+            'last_launch_time': None,
+            'warm_hits': 0,
+            'pages': 0,
+            'recycles': 0,
+            'errors': 0,
+        }
+
+    def run(self, task, timeout=None):
+        """
+        풀의 브라우저에서 새 컨텍스트/페이지를 열어 task(page)를 실행
+
+        Args:
+            task: page 하나를 받아 결과를 반환하는 callable (브라우저 전용 스레드에서 실행됨)
+            timeout: 결과 대기 최대 시간(초)
+
+        Returns:
+            task의 반환값
+        """
+        if self._closed:
+            raise RuntimeError("브라우저 풀이 이미 종료되었습니다.")
+
+        slot = self._idle.get()
+        try:
+            future = slot.submit(lambda: self._run_in_slot(slot, task))
+            return future.result(timeout=timeout)
+        finally:
+            self._idle.put(slot)
+
+    def prewarm(self):
+        """모든 슬롯의 브라우저를 미리 실행"""
+        futures = [slot.submit(lambda s=slot: self._ensure_browser(s, count_hit=False)) for slot in self._slots]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                self._log(f"브라우저 사전 실행 실패: {e}")
+
+    def stats(self):
+        """풀 재사용률 및 브라우저 실행 시간 통계 반환"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        acquisitions = stats['launches'] + stats['warm_hits']
+        stats['hit_rate'] = round(stats['warm_hits'] / acquisitions, 3) if acquisitions else 0.0
+        stats['avg_launch_time'] = round(stats['launch_time_total'] / stats['launches'], 3) if stats['launches'] else 0.0
+        stats['launch_time_total'] = round(stats['launch_time_total'], 3)
+        stats['size'] = self.size
+        stats['alive'] = sum(1 for slot in self._slots if slot.browser is not None)
+        return stats
+
+    def close(self):
+        """모든 브라우저 및 전용 스레드 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        for slot in self._slots:
+            if slot.thread is None:
+                continue
+            try:
+                slot.submit(lambda s=slot: self._shutdown_slot(s)).result(timeout=30)
+            except Exception:
+                pass
+            slot.tasks.put(None)
+
+    def _run_in_slot(self, slot, task):
+        self._ensure_browser(slot)
+        context = None
+        try:
+            context = slot.browser.new_context()
+            page = context.new_page()
+            return task(page)
+        except Exception:
+            self._bump('errors')
+            raise
+        finally:
+            if context is not None:
+                try:
+                    context.close()
+                except Exception:
+                    pass
+            slot.pages_served += 1
+            self._bump('pages')
+            self._maybe_recycle(slot)
+
+    def _ensure_browser(self, slot, count_hit=True):
+        if slot.browser is not None and slot.browser.is_connected():
+            if count_hit:
+                self._bump('warm_hits')
+            return
+
+        # 비정상 종료된 브라우저 정리 후 새로 실행
+        self._shutdown_slot(slot)
+
+        from playwright.sync_api import sync_playwright
+
+        started = time.perf_counter()
+        slot.playwright = sync_playwright().start()
+        slot.browser = slot.playwright.chromium.launch(headless=self.headless)
+        elapsed = time.perf_counter() - started
+
+        with self._stats_lock:
+            self._stats['launches'] += 1
+            self._stats['launch_time_total'] += elapsed
+            self._stats['last_launch_time'] = round(elapsed, 3)
+        self._log(f"Chromium 실행 완료 (슬롯 {slot.index}, {elapsed:.2f}초)")
+
+    def _maybe_recycle(self, slot):
+        reason = None
+        if self.max_pages_per_browser and slot.pages_served >= self.max_pages_per_browser:
+            reason = f"페이지 {slot.pages_served}개 처리"
+        elif self.max_memory_mb:
+            memory_mb = self._browser_memory_mb()
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                reason = f"메모리 {memory_mb:.0f}MB 초과"
+
+        if reason:
+            self._log(f"브라우저 재시작 (슬롯 {slot.index}): {reason}")
+            self._shutdown_slot(slot)
+            self._bump('recycles')
+
+    def _shutdown_slot(self, slot):
+        if slot.browser is not None:
+            try:
+                slot.browser.close()
+            except Exception:
+                pass
+        if slot.playwright is not None:
+            try:
+                slot.playwright.stop()
+            except Exception:
+                pass
+        slot.browser = None
+        slot.playwright = None
+        slot.pages_served = 0
+
+    def _browser_memory_mb(self):
+        """현재 프로세스의 하위 프로세스(Playwright 드라이버 + Chromium) RSS 합계"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            children = psutil.Process().children(recursive=True)
+            total = 0
+            for child in children:
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+
+    def _bump(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+생성된 글 본문의 중복 검사
+키워드가 달라도 같은 이슈를 다룬 어제 글과 본문이 거의 같으면 발행 슬롯을 낭비하고 검색 노출에도 불리하다.
+새 글 본문을 문자 4-gram으로 나누어 bottom-k 서명(해시값이 가장 작은 k개)을 만들고,
+blog_posts/의 모든 글의 서명과 비교해 Jaccard 유사도 추정값이 높은 글을 찾는다.
+
+서명은 SQLite(content_signatures.db)에 저장하고 포스트 카탈로그의 content_hash와 비교해
+새로 생기거나 바뀐 글만 다시 계산한다. 메모리에서는 서명 해시값 → 글 역색인으로 후보를 찾으므로
+글이 수천 개여도 검사는 서명 계산(본문 길이에 비례) + 후보 몇 개의 비교로 끝난다.
+"""
+import heapq
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+
+from related_posts import strip_markdown
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+# 후보로 볼 최소 공유 서명 해시 수
+_MIN_SHARED = 2
+
+
+def content_sketch(content, k=128, shingle_size=4):
+    """
+    본문의 bottom-k 서명
+
+    Returns:
+        tuple: (오름차순 해시 tuple (최대 k개), 고유 shingle 수)
+    """
+    text = _NON_WORD.sub('', strip_markdown(content).lower())
+    hashes = {zlib.crc32(text[start:start + shingle_size].encode('utf-8'))
+              for start in range(max(len(text) - shingle_size + 1, 0))}
+    return tuple(heapq.nsmallest(k, hashes)), len(hashes)
+
+
+def estimate_similarity(sketch_a, sketch_b, k=128):
+    """두 bottom-k 서명으로 Jaccard 유사도 추정 (합집합의 가장 작은 k개 중 양쪽에 모두 있는 비율)"""
+    if not sketch_a or not sketch_b:
+        return 0.0
+    set_a, set_b = set(sketch_a), set(sketch_b)
+    union = heapq.nsmallest(k, set_a | set_b)
+    return sum(1 for value in union if value in set_a and value in set_b) / len(union)
+
+
+class ContentSignatureIndex:
+    """
+    Args:
+        catalog: PostCatalog (서명 대상 글 목록과 content_hash)
+        path: 서명 SQLite 파일 경로
+        k: 서명 크기
+        shingle_size: 문자 n-gram 길이
+        log: 로그 함수
+    """
+
+    def __init__(self, catalog, path='content_signatures.db', k=128, shingle_size=4, log=None):
+        self.catalog = catalog
+        self.path = path
+        self.k = k
+        self.shingle_size = shingle_size
+        self._log = log or (lambda message: None)
+        self._conn = None
+        self._lock = threading.RLock()
+        self._sketches = {}   # filename -> {'sketch', 'content_hash', 'keyword', 'title'}
+        self._postings = {}   # 서명 해시값 -> {filename, ...}
+        self._synced = threading.Event()
+        self._sync_thread = None
+
+    def _connect(self):
+        # 첫 사용 시 연결 (생성자는 파일 I/O 없이 가볍게 유지)
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS signatures (
+                    filename TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    keyword TEXT,
+                    title TEXT,
+                    shingles INTEGER NOT NULL,
+                    sketch BLOB NOT NULL,
+                    params TEXT NOT NULL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _params(self):
+        # 서명 방식이 바뀌면 저장된 서명은 다시 계산
+        return f"k={self.k};n={self.shingle_size}"
+
+    # 색인 구성
+
+    def warm(self):
+        """백그라운드에서 저장된 서명을 읽고 카탈로그와 맞추기 (이미 진행 중이면 그대로 둠)"""
+        with self._lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return self._sync_thread
+            self._sync_thread = threading.Thread(target=self.sync, name='content-signatures', daemon=True)
+            self._sync_thread.start()
+            return self._sync_thread
+
+    def wait(self, timeout=None):
+        if not self._synced.is_set():
+            self.warm()
+        return self._synced.wait(timeout)
+
+    def sync(self):
+        """
+        저장된 서명을 읽고 카탈로그와 맞춤 (새 글/바뀐 글만 서명 계산, 없어진 글 삭제)
+
+        Returns:
+            dict: {'added', 'removed', 'total'}
+        """
+        started = time.perf_counter()
+        result = {'added': 0, 'removed': 0, 'total': 0}
+        try:
+            entries = {entry['filename']: entry for entry in self.catalog.list()}
+            with self._lock:
+                conn = self._connect()
+                if not self._sketches:
+                    params = self._params()
+                    for filename, content_hash, keyword, title, sketch, row_params in conn.execute(
+                            "SELECT filename, content_hash, keyword, title, sketch, params FROM signatures"):
+                        if row_params == params:
+                            self._put(filename, content_hash, keyword, title, tuple(array('I', sketch)))
+
+                stale = [filename for filename, item in self._sketches.items()
+                         if entries.get(filename, {}).get('content_hash') != item['content_hash']]
+                stored = {row[0] for row in conn.execute("SELECT filename FROM signatures")}
+                missing = [filename for filename in stored if filename not in entries]
+                for filename in stale:
+                    self._drop(filename)
+                with conn:
+                    conn.executemany("DELETE FROM signatures WHERE filename = ?", [(name,) for name in missing])
+                known = set(self._sketches)
+            result['removed'] = len(missing)
+
+            for filename, entry in entries.items():
+                if filename in known:
+                    continue
+                try:
+                    with open(entry['path'], 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                self.add(entry, content)
+                result['added'] += 1
+
+            result['total'] = len(self._sketches)
+            if result['added'] or result['removed']:
+                self._log(f"본문 서명 색인 갱신: 추가 {result['added']}개, 삭제 {result['removed']}개, "
+                          f"전체 {result['total']}개 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        except Exception as e:
+            self._log(f"본문 서명 색인 생성 오류: {e}")
+        finally:
+            self._synced.set()
+        return result
+
+    def _put(self, filename, content_hash, keyword, title, sketch):
+        self._drop(filename)
+        self._sketches[filename] = {'sketch': sketch, 'content_hash': content_hash, 'keyword': keyword, 'title': title}
+        for value in sketch:
+            self._postings.setdefault(value, set()).add(filename)
+
+    def _drop(self, filename):
+        item = self._sketches.pop(filename, None)
+        if item is None:
+            return
+        for value in item['sketch']:
+            filenames = self._postings.get(value)
+            if filenames is not None:
+                filenames.discard(filename)
+                if not filenames:
+                    del self._postings[value]
+
+    def add(self, entry, content):
+        """
+        글 서명 추가/교체 (save_blog_post에서 카탈로그 등록 뒤 호출)
+
+        Args:
+            entry: PostCatalog 항목
+            content: 포스트 Markdown
+        """
+        sketch, shingles = content_sketch(content, self.k, self.shingle_size)
+        with self._lock:
+            self._put(entry['filename'], entry['content_hash'], entry.get('keyword'), entry.get('title'), sketch)
+            conn = self._connect()
+            with conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO signatures (filename, content_hash, keyword, title, shingles, sketch, params)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (entry['filename'], entry['content_hash'], entry.get('keyword'), entry.get('title'),
+                      shingles, array('I', sketch).tobytes(), self._params()))
+
+    # 조회
+
+    def check(self, content, top=3, min_similarity=0.05, exclude=None, timeout=10.0):
+        """
+        본문과 가장 비슷한 기존 글
+
+        Args:
+            content: 새 글 Markdown
+            top: 반환할 최대 개수
+            min_similarity: 이 값 미만은 반환하지 않음
+            exclude: 제외할 파일명 목록
+            timeout: 첫 색인 구성을 기다리는 최대 시간
+
+        Returns:
+            list: [{'filename', 'keyword', 'title', 'similarity'}, ...] (유사도 높은 순)
+        """
+        self.wait(timeout)
+        sketch, _ = content_sketch(content, self.k, self.shingle_size)
+        exclude = set(exclude or ())
+
+        with self._lock:
+            shared = {}
+            for value in sketch:
+                for filename in self._postings.get(value, ()):
+                    shared[filename] = shared.get(filename, 0) + 1
+
+            matches = []
+            for filename, count in shared.items():
+                if count < _MIN_SHARED or filename in exclude:
+                    continue
+                item = self._sketches[filename]
+                similarity = estimate_similarity(sketch, item['sketch'], self.k)
+                if similarity >= min_similarity:
+                    matches.append({'filename': filename, 'keyword': item['keyword'], 'title': item['title'],
+                                    'similarity': round(similarity, 3)})
+
+        matches.sort(key=lambda match: match['similarity'], reverse=True)
+        return matches[:top]
+
+    def stats(self):
+        with self._lock:
+            return {'documents': len(self._sketches), 'hashes': len(self._postings), 'synced': self._synced.is_set()}
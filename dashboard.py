@@ -6,6 +6,8 @@ import time
 import re
 from trend_blog_system import TrendBlogSystem
 from wordpress_trend_blog import WordPressTrendBlogSystem
+from keyword_service import KeywordServiceClient, KeywordServiceError, start_service_process
+from log_writer import format_record
 
 # 페이지 설정
 st.set_page_config(
@@ -61,23 +63,63 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Streamlit에서 안전하게 키워드 가져오기 (별도 프로세스)
-def get_trending_keywords_safe():
+# 로컬 키워드 서비스 클라이언트 (서비스가 없으면 한 번만 백그라운드로 실행)
+@st.cache_resource
+def get_keyword_service():
+    client = KeywordServiceClient()
+    if not client.is_available():
+        start_service_process()
+    return client
+
+# Streamlit에서 안전하게 키워드 가져오기
+def get_trending_keywords_safe(force_refresh=False):
     """
-    Streamlit 환경에서 Playwright를 안전하게 실행하기 위해 별도 프로세스 사용
-    Windows + Streamlit에서 asyncio subprocess NotImplementedError 회피
+    로컬 키워드 서비스에서 키워드 조회 (서비스가 캐시/브라우저를 유지)
+    서비스가 아직 준비되지 않았으면 기존 방식으로 폴백:
+    트렌드 캐시를 먼저 확인하고, 없을 때만 별도 프로세스로 Playwright 실행
+    (Windows + Streamlit에서 asyncio subprocess NotImplementedError 회피)
+    
+    - fresh 캐시: 즉시 반환
+    - stale 캐시: 즉시 반환하고 백그라운드 프로세스로 갱신
+    - 캐시 없음 또는 force_refresh: 별도 프로세스에서 새로 가져와 대기
     """
     import subprocess
     import json
     
+    client = get_keyword_service()
+    if client.is_available():
+        try:
+            return client.get_trending_keywords(force_refresh=force_refresh)
+        except KeywordServiceError as e:
+            st.error(f"키워드 서비스 오류: {e}")
+            return []
+    
+    cache = trend_sys.trends_cache
+    region = 'south_korea'
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    if not force_refresh:
+        keywords, state, _ = cache.lookup(region)
+        if state == cache.FRESH:
+            return keywords
+        if state == cache.STALE:
+            if not cache.is_refreshing(region):
+                subprocess.Popen(
+                    ['python', 'fetch_keywords.py', '--force'],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=script_dir
+                )
+            return keywords
+    
     try:
         result = subprocess.run(
-            ['python', 'fetch_keywords.py'],
+            ['python', 'fetch_keywords.py', '--force'],
             capture_output=True,
             text=True,
             encoding='utf-8',
             timeout=120,  # 2분 타임아웃
-            cwd=os.path.dirname(os.path.abspath(__file__))
+            cwd=script_dir
         )
         
         if result.returncode == 0:
@@ -93,17 +135,53 @@ def get_trending_keywords_safe():
         st.error(f"키워드 가져오기 오류: {e}")
         return []
 
+def trends_cache_caption():
+    """트렌드 캐시 갱신 시각 표시용 문자열"""
+    entry = trend_sys.trends_cache.get('south_korea')
+    if not entry:
+        return "캐시된 트렌드 없음"
+    age_min = trend_sys.trends_cache.age(entry) / 60
+    fetched = datetime.fromtimestamp(entry['fetched_at']).strftime('%H:%M:%S')
+    return f"마지막 갱신: {fetched} ({age_min:.0f}분 전)"
+
 # 시스템 인스턴스 초기화 (캐시)
 @st.cache_resource
 def get_systems():
-    return TrendBlogSystem(), WordPressTrendBlogSystem()
+    systems = TrendBlogSystem(), WordPressTrendBlogSystem()
+    # 뉴스/이미지 조회도 키워드 서비스의 브라우저 사용 (서비스가 없으면 각 메서드가 직접 실행으로 폴백)
+    for system in systems:
+        system.keyword_service = get_keyword_service()
+    return systems
 
 trend_sys, wp_sys = get_systems()
 
+def generate_with_live_preview(system, keyword):
+    """
+    스트리밍으로 본문을 생성하며 작성 중인 글을 실시간으로 표시
+    (생성 중 다른 버튼을 누르면 스크립트가 재실행되며 생성이 중단됨)
+    """
+    status = st.empty()
+    preview = st.empty()
+    status.info(f"'{keyword}' 리서치 및 본문 생성 중... (다른 버튼을 누르면 중단됩니다)")
+    
+    def on_chunk(delta, text):
+        preview.markdown(text + " ▌")
+        status.info(f"'{keyword}' 본문 작성 중... {len(text):,}자")
+    
+    content = system.generate_blog_content(keyword, on_chunk=on_chunk)
+    preview.empty()
+    stats = system.last_generation_stats
+    if content and stats:
+        speed = f", {stats['tokens_per_sec']}토큰/초" if stats['tokens_per_sec'] else ""
+        status.caption(f"첫 토큰 {stats['ttft']}초, 전체 {stats['elapsed']}초{speed}")
+    else:
+        status.empty()
+    return content
+
 # 사이드바
 st.sidebar.title("🔥 트렌드 블로그 관리")
 st.sidebar.markdown("---")
-menu = st.sidebar.radio("메뉴", ["시스템 개요", "키워드 생성기", "포스트 관리", "사용된 키워드", "시스템 설정", "시스템 로그"])
+menu = st.sidebar.radio("메뉴", ["시스템 개요", "키워드 생성기", "포스트 관리", "사용된 키워드", "시스템 설정", "시스템 로그", "실행 트레이스"])
 
 st.sidebar.markdown("---")
 st.sidebar.info(f"**페르소나**: {trend_sys.persona.capitalize()}")
@@ -111,6 +189,10 @@ if trend_sys.tg_token:
     st.sidebar.success("텔레그램 알림: 활성화")
 else:
     st.sidebar.warning("텔레그램 알림: 비활성화")
+if get_keyword_service().is_available():
+    st.sidebar.success("키워드 서비스: 실행 중")
+else:
+    st.sidebar.warning("키워드 서비스: 시작 대기 (기존 방식 사용)")
 
 # 메인 화면
 if menu == "시스템 개요":
@@ -128,22 +210,22 @@ if menu == "시스템 개요":
                 all_keywords = get_trending_keywords_safe()
                 selected_kw = trend_sys.select_keyword(all_keywords)
                 
-                if selected_kw:
-                    content = wp_sys.generate_blog_content(selected_kw)
-                    if content:
-                        filepath = wp_sys.save_blog_post(selected_kw, content)
-                        st.success(f"✅ 생성 완료: {selected_kw}")
-                        wp_sys._send_telegram_notification(f"✅ *블로그 로컬 저장 완료*\n\n*키워드*: {selected_kw}\n*파일*: `{os.path.basename(filepath)}`")
-                        
-                        # 세션 상태에 저장하여 다이얼로그 표시
-                        st.session_state.selected_preview = os.path.basename(filepath)
-                        st.session_state.show_wp_dialog = True
-                        st.session_state.dialog_content = content
-                        st.session_state.dialog_keyword = selected_kw
-                        st.session_state.dialog_filepath = filepath
-                        st.rerun()
-                else:
-                    st.warning("현재 사용 가능한 새로운 트렌드가 없습니다.")
+            if selected_kw:
+                content = generate_with_live_preview(wp_sys, selected_kw)
+                if content:
+                    filepath = wp_sys.save_blog_post(selected_kw, content)
+                    st.success(f"✅ 생성 완료: {selected_kw}")
+                    wp_sys._send_telegram_notification(f"✅ *블로그 로컬 저장 완료*\n\n*키워드*: {selected_kw}\n*파일*: `{os.path.basename(filepath)}`")
+                    
+                    # 세션 상태에 저장하여 다이얼로그 표시
+                    st.session_state.selected_preview = os.path.basename(filepath)
+                    st.session_state.show_wp_dialog = True
+                    st.session_state.dialog_content = content
+                    st.session_state.dialog_keyword = selected_kw
+                    st.session_state.dialog_filepath = filepath
+                    st.rerun()
+            else:
+                st.warning("현재 사용 가능한 새로운 트렌드가 없습니다.")
         st.markdown('</div>', unsafe_allow_html=True)
     
     # 워드프레스 포스팅 다이얼로그
@@ -161,7 +243,7 @@ if menu == "시스템 개요":
                     with st.spinner("워드프레스에 포스팅 중..."):
                         title = wp_sys.extract_title_from_markdown(st.session_state.dialog_content)
                         tags = wp_sys.extract_tags_from_markdown(st.session_state.dialog_content) or [st.session_state.dialog_keyword]
-                        success = wp_sys.post_to_wordpress(title, st.session_state.dialog_content, tags)
+                        success = wp_sys.post_to_wordpress(title, st.session_state.dialog_content, tags, keyword=st.session_state.dialog_keyword, filepath=st.session_state.dialog_filepath)
                         if success:
                             st.balloons()
                             st.success("워드프레스 포스팅 성공!")
@@ -186,12 +268,13 @@ if menu == "시스템 개요":
     with col2:
         st.markdown('<div class="status-card">', unsafe_allow_html=True)
         st.subheader("📈 실시간 트렌드")
+        force_refresh = st.checkbox("캐시 무시", key="force_refresh_overview")
         if st.button("키워드 새로고침"):
             with st.spinner("구글 트렌드 불러오는 중..."):
-                all_keywords = get_trending_keywords_safe()
-                used_keywords = trend_sys._load_used_keywords()
-                st.session_state.keywords = [kw for kw in all_keywords if kw not in used_keywords]
+                all_keywords = get_trending_keywords_safe(force_refresh=force_refresh)
+                st.session_state.keywords = trend_sys.keyword_store.unused(all_keywords)
         
+        st.caption(trends_cache_caption())
         keywords = st.session_state.get('keywords', [])
         if keywords:
             for kw in keywords[:10]:
@@ -204,11 +287,11 @@ if menu == "시스템 개요":
     with col3:
         st.markdown('<div class="status-card">', unsafe_allow_html=True)
         st.subheader("📝 최근 생성 포스트")
-        posts = sorted([f for f in os.listdir(trend_sys.blog_posts_dir) if f.endswith('.md')], reverse=True)
-        if posts:
-            for post in posts[:10]:
-                if st.button(f"📄 {post[:30]}", key=f"dash_{post}"):
-                    st.session_state.selected_preview = post
+        recent_posts = trend_sys.post_catalog.list(limit=10)
+        if recent_posts:
+            for post in recent_posts:
+                if st.button(f"📄 {(post['title'] or post['filename'])[:30]}", key=f"dash_{post['filename']}"):
+                    st.session_state.selected_preview = post['filename']
         else:
             st.write("아직 생성된 포스트가 없습니다.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -243,7 +326,7 @@ if menu == "시스템 개요":
         st.subheader("⚙️ 시스템 상태")
         st.write(f"**API 준비**: {'✅' if trend_sys.client_ready else '❌'}")
         st.write(f"**WP 준비**: {'✅' if wp_sys.wp_url else '❌'}")
-        st.write(f"**총 포스트 수**: {len(posts)}")
+        st.write(f"**총 포스트 수**: {trend_sys.post_catalog.count()}")
         
         st.markdown("---")
         st.subheader("🔔 알림 테스트")
@@ -274,25 +357,36 @@ elif menu == "키워드 생성기":
     tab1, tab2 = st.tabs(["트렌드 목록", "직접 입력"])
     
     with tab1:
-        if st.button("현재 트렌드 가져오기"):
-            all_keywords = get_trending_keywords_safe()
-            used_keywords = trend_sys._load_used_keywords()
-            st.session_state.keywords = [kw for kw in all_keywords if kw not in used_keywords]
+        col_fetch, col_force = st.columns([3, 1])
+        with col_force:
+            force_refresh = st.checkbox("캐시 무시", key="force_refresh_generator")
+        with col_fetch:
+            fetch_clicked = st.button("현재 트렌드 가져오기")
+        st.caption(trends_cache_caption())
+        if fetch_clicked:
+            all_keywords = get_trending_keywords_safe(force_refresh=force_refresh)
+            st.session_state.keywords = trend_sys.keyword_store.unused(all_keywords)
+            # 한 번의 요청으로 전체 분류 (생성 시 분류 캐시에서 재사용)
+            with st.spinner("키워드 카테고리 분류 중..."):
+                st.session_state.keyword_categories = wp_sys.classify_keywords(st.session_state.keywords)
             
         keywords = st.session_state.get('keywords', [])
         if keywords:
-            selected_kw = st.selectbox("작성할 키워드 선택:", keywords)
+            keyword_categories = st.session_state.get('keyword_categories', {})
+            selected_kw = st.selectbox(
+                "작성할 키워드 선택:", keywords,
+                format_func=lambda kw: f"{kw} ({keyword_categories[kw][0]})" if kw in keyword_categories else kw
+            )
             do_post = st.checkbox("워드프레스에 즉시 포스팅하시겠습니까?", value=False)
             
             if st.button("생성 및 발행"):
-                used_keywords = wp_sys._load_used_keywords()
-                if selected_kw in used_keywords:
+                if wp_sys.keyword_store.is_used(selected_kw):
                     st.error(f"'{selected_kw}'은(는) 이미 작성된 키워드입니다.")
                 else:
-                    with st.spinner(f"'{selected_kw}' 블로그 생성 중..."):
+                    with st.container():
                         # WordPress 시스템의 run_blog_creation을 활용하되, 특정 키워드만 처리하도록 로직이 필요함
                         # 여기서는 직접 메서드들을 호출
-                        content = wp_sys.generate_blog_content(selected_kw)
+                        content = generate_with_live_preview(wp_sys, selected_kw)
                         if content:
                             filepath = wp_sys.save_blog_post(selected_kw, content)
                             st.success(f"블로그 저장 완료: {filepath}")
@@ -300,7 +394,7 @@ elif menu == "키워드 생성기":
                             if do_post:
                                 title = wp_sys.extract_title_from_markdown(content)
                                 tags = wp_sys.extract_tags_from_markdown(content) or [selected_kw]
-                                success = wp_sys.post_to_wordpress(title, content, tags)
+                                success = wp_sys.post_to_wordpress(title, content, tags, keyword=selected_kw, filepath=filepath)
                                 if success:
                                     st.balloons()
                                     st.success("워드프레스 포스팅 성공!")
@@ -315,12 +409,11 @@ elif menu == "키워드 생성기":
     with tab2:
         manual_kw = st.text_input("직접 키워드 입력:")
         if st.button("수동 생성 실행") and manual_kw:
-            used_keywords = wp_sys._load_used_keywords()
-            if manual_kw in used_keywords:
+            if wp_sys.keyword_store.is_used(manual_kw):
                 st.error(f"'{manual_kw}'은(는) 이미 작성된 키워드입니다.")
             else:
-                with st.spinner(f"'{manual_kw}' 블로그 생성 중..."):
-                    content = wp_sys.generate_blog_content(manual_kw)
+                with st.container():
+                    content = generate_with_live_preview(wp_sys, manual_kw)
                     if content:
                         filepath = wp_sys.save_blog_post(manual_kw, content)
                         st.success("블로그 생성이 완료되었습니다.")
@@ -333,7 +426,13 @@ elif menu == "키워드 생성기":
 
 elif menu == "포스트 관리":
     st.title("📁 포스트 관리")
-    posts = sorted([f for f in os.listdir(trend_sys.blog_posts_dir) if f.endswith('.md')], reverse=True)
+    catalog_entries = {post['filename']: post for post in trend_sys.post_catalog.list()}
+    posts = list(catalog_entries)
+    
+    if st.button("🔄 카탈로그 다시 맞추기", help="blog_posts 폴더의 파일을 직접 추가/수정/삭제했을 때 사용합니다."):
+        result = trend_sys.post_catalog.reconcile()
+        st.success(f"추가 {result['added']}개, 갱신 {result['updated']}개, 삭제 {result['removed']}개")
+        st.rerun()
     
     if not posts:
         st.write("발견된 포스트가 없습니다.")
@@ -344,8 +443,15 @@ elif menu == "포스트 관리":
         if managed_file in posts:
             default_index = posts.index(managed_file)
             
-        selected_file = st.selectbox("조회/발행할 포스트 선택:", posts, index=default_index)
+        selected_file = st.selectbox(
+            "조회/발행할 포스트 선택:", posts, index=default_index,
+            format_func=lambda name: f"{name[:15]} {catalog_entries[name]['title'] or catalog_entries[name]['keyword']}"
+        )
+        entry = catalog_entries[selected_file]
         filepath = os.path.join(trend_sys.blog_posts_dir, selected_file)
+        if not os.path.exists(filepath):
+            st.error("파일을 찾을 수 없습니다. 카탈로그를 다시 맞춰 주세요.")
+            st.stop()
         
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -357,17 +463,28 @@ elif menu == "포스트 관리":
             st.markdown(content)
             
         with col_action:
+            st.subheader("정보")
+            st.caption(f"키워드: {entry['keyword']}")
+            if entry['category']:
+                st.caption(f"분류: {entry['category']}")
+            if entry['tags']:
+                st.caption(f"태그: {', '.join(entry['tags'])}")
+            st.caption(f"크기: {entry['size'] / 1024:.1f}KB")
+            if entry['wp_url']:
+                st.markdown(f"[워드프레스에서 보기]({entry['wp_url']})")
+            
             st.subheader("액션")
             if st.button("워드프레스에 포스팅"):
                 title = wp_sys.extract_title_from_markdown(content)
                 tags = wp_sys.extract_tags_from_markdown(content)
                 with st.spinner("워드프레스에 포스팅 중..."):
-                    success = wp_sys.post_to_wordpress(title, content, tags)
+                    success = wp_sys.post_to_wordpress(title, content, tags, filepath=filepath)
                     if success:
                         st.success("포스팅 완료!")
             
             if st.button("파일 삭제"):
                 os.remove(filepath)
+                trend_sys.post_catalog.remove(filepath)
                 st.warning("파일이 삭제되었습니다.")
                 st.rerun()
 
@@ -375,24 +492,33 @@ elif menu == "사용된 키워드":
     st.title("📚 사용된 키워드 관리")
     st.write("이미 사용된 키워드 목록을 확인하고 관리합니다.")
     
-    used_keywords = trend_sys._load_used_keywords()
+    used_entries = trend_sys.keyword_store.entries()
     
-    if not used_keywords:
+    if not used_entries:
         st.info("아직 사용된 키워드가 없습니다.")
     else:
-        # 키워드 데이터프레임으로 표시
-        df = pd.DataFrame(used_keywords, columns=["키워드"])
-        df = df.iloc[::-1] # 최신순
+        # 키워드 데이터프레임으로 표시 (최신순)
+        df = pd.DataFrame([
+            {
+                "키워드": entry['keyword'],
+                "사용 시각": datetime.fromtimestamp(entry['used_at']).strftime('%Y-%m-%d %H:%M'),
+                "포스트": os.path.basename(entry['post_path']) if entry['post_path'] else "",
+                "워드프레스": entry['post_url'] or "",
+                "상태": "만료 (재사용 가능)" if entry['expired'] else "사용됨",
+            }
+            for entry in used_entries
+        ])
         
-        st.markdown(f"**총 사용 키워드**: {len(used_keywords)}")
+        expire_days = trend_sys.keyword_store.expire_days
+        st.markdown(f"**총 사용 키워드**: {trend_sys.keyword_store.count()}"
+                    + (f" (사용 후 {expire_days}일이 지나면 재사용 가능)" if expire_days else ""))
         
         # 삭제 기능을 위한 멀티셀렉트
-        to_delete = st.multiselect("삭제할 키워드 선택:", used_keywords)
+        to_delete = st.multiselect("삭제할 키워드 선택:", [entry['keyword'] for entry in used_entries])
         
         if st.button("선택한 키워드 삭제"):
             if to_delete:
-                new_list = [kw for kw in used_keywords if kw not in to_delete]
-                trend_sys._save_used_keywords(new_list)
+                trend_sys.keyword_store.remove(to_delete)
                 st.success(f"{len(to_delete)}개의 키워드가 삭제되었습니다.")
                 st.rerun()
             else:
@@ -403,24 +529,193 @@ elif menu == "사용된 키워드":
 
     # The following 'else' block was misplaced and is now correctly associated with the log file check for "시스템 로그"
 elif menu == "시스템 로그":
+    import html
+    from log_reader import LogReader
+    
     st.title("🪵 시스템 로그")
     st.write("`system_log.txt` 실시간 로그 확인")
     
+    reader = LogReader(trend_sys.log_file)
     if os.path.exists(trend_sys.log_file):
-        with open(trend_sys.log_file, 'r', encoding='utf-8') as f:
-            logs = f.readlines()
+        # 파일 끝에 추가된 부분만 색인 (전체를 다시 읽지 않음)
+        log_index = reader.update_index()
         
-        # 마지막 100줄만 표시
-        log_text = "".join(logs[-100:]).replace("\n", "<br>")
-        st.markdown(f'<div class="log-container">{log_text}</div>', unsafe_allow_html=True)
+        col_run, col_level, col_kw, col_text = st.columns(4)
+        with col_run:
+            run_filter = st.selectbox("실행 ID", ["전체"] + [run['run_id'] for run in reader.runs(log_index)])
+        with col_level:
+            level_filter = st.selectbox("레벨", ["전체", "ERROR", "WARNING", "INFO"])
+        with col_kw:
+            keyword_filter = st.selectbox("키워드", ["전체"] + reader.keywords(log_index))
+        with col_text:
+            text_filter = st.text_input("메시지 검색", placeholder="최근 로그에서 검색")
+        
+        col_limit, col_follow = st.columns([3, 1])
+        with col_limit:
+            line_limit = st.slider("표시할 줄 수", min_value=50, max_value=1000, value=100, step=50)
+        with col_follow:
+            follow = st.toggle("실시간 갱신 (2초)")
+        st.caption(f"파일 크기 {reader.size() / (1024 * 1024):.1f} MB · 색인된 줄 {log_index['lines']:,}개")
+        
+        filters = {
+            'run_id': None if run_filter == "전체" else run_filter,
+            'level': None if level_filter == "전체" else level_filter,
+            'keyword': None if keyword_filter == "전체" else keyword_filter,
+            'text': text_filter.strip() or None,
+        }
+        level_colors = {'ERROR': '#f48771', 'WARNING': '#cca700'}
+        
+        @st.fragment(run_every=2 if follow else None)
+        def log_view():
+            if any(filters.values()):
+                records = reader.search(limit=line_limit, **filters)
+            else:
+                # 마지막으로 읽은 위치 이후의 새 줄만 이어 붙임
+                tail_state = st.session_state.get('log_tail')
+                if tail_state is None or tail_state['limit'] != line_limit:
+                    records, offset = reader.tail(line_limit)
+                else:
+                    new_records, offset, reset = reader.read_since(tail_state['offset'])
+                    records = (new_records if reset else tail_state['records'] + new_records)[-line_limit:]
+                st.session_state.log_tail = {'records': records, 'offset': offset, 'limit': line_limit}
+            
+            if not records:
+                st.info("조건에 맞는 로그가 없습니다.")
+                return
+            lines = []
+            for record in records:
+                text = html.escape(format_record(record)).replace("\n", "<br>")
+                color = level_colors.get(record.get('level'))
+                lines.append(f'<span style="color:{color}">{text}</span>' if color else text)
+            st.markdown(f'<div class="log-container">{"<br>".join(lines)}</div>', unsafe_allow_html=True)
+        
+        log_view()
         
         if st.button("로그 비우기"):
-            with open(trend_sys.log_file, 'w', encoding='utf-8') as f:
-                f.write("")
+            # 기록기 큐에 남은 레코드를 먼저 쓴 뒤 비움
+            trend_sys._log_writer.clear()
+            st.session_state.pop('log_tail', None)
             st.rerun()
     else:
         st.write("로그 파일을 찾을 수 없습니다.")
 
+elif menu == "실행 트레이스":
+    import altair as alt
+    from tracing import recent_runs, stage_percentiles
+    
+    st.title("🧭 실행 트레이스")
+    st.write("실행별 단계/외부 호출 소요 시간 (`traces/*.jsonl`)")
+    
+    trace_dir = trend_sys.config.get('tracing', {}).get('directory', 'traces')
+    run_limit = st.slider("불러올 최근 실행 수", min_value=5, max_value=200, value=30, step=5)
+    runs = recent_runs(trace_dir, limit=run_limit)
+    
+    if not runs:
+        st.info("기록된 트레이스가 없습니다. 블로그 생성을 실행하면 여기에 표시됩니다.")
+    else:
+        # 1. 스팬 이름별 p50/p95
+        st.subheader("단계별 소요 시간")
+        stats = stage_percentiles(runs)
+        stats_df = pd.DataFrame([
+            {'스팬': name, '종류': entry['kind'], '횟수': entry['count'], '실패': entry['errors'],
+             'p50 (ms)': entry['p50_ms'], 'p95 (ms)': entry['p95_ms']}
+            for name, entry in stats.items()
+        ]).sort_values('p95 (ms)', ascending=False)
+        st.dataframe(stats_df, use_container_width=True, hide_index=True)
+        
+        # 2. 선택한 실행의 워터폴
+        st.subheader("실행 워터폴")
+        selected_run = st.selectbox(
+            "실행 선택:", runs,
+            format_func=lambda run: (
+                f"{datetime.fromtimestamp(run['start']).strftime('%m-%d %H:%M:%S')} · {run['name']} · "
+                f"{run['keyword'] or '-'} · "
+                f"{'%.1f초' % (run['duration_ms'] / 1000) if run['duration_ms'] is not None else '진행 중'} · {run['outcome']}"
+            )
+        )
+        
+        spans = [span for span in selected_run['spans'] if span.get('end')]
+        parents = {span['span_id']: span['parent_id'] for span in selected_run['spans']}
+        
+        def span_depth(span_id):
+            depth = 0
+            while parents.get(span_id):
+                span_id = parents[span_id]
+                depth += 1
+            return depth
+        
+        run_start = min(span['start'] for span in spans) if spans else 0
+        waterfall_df = pd.DataFrame([
+            {
+                # 같은 이름의 스팬이 여러 개일 수 있어 순번을 붙임
+                '스팬': f"{idx + 1:02d} {'· ' * span_depth(span['span_id'])}{span['name']}",
+                '종류': span['kind'],
+                '키워드': span.get('keyword') or '',
+                '시작 (ms)': round((span['start'] - run_start) * 1000, 1),
+                '종료 (ms)': round((span['end'] - run_start) * 1000, 1),
+                '소요 (ms)': span['duration_ms'],
+                '결과': span['outcome'],
+                '크기 (bytes)': span.get('bytes'),
+                '오류': span.get('error') or '',
+            }
+            for idx, span in enumerate(spans)
+        ])
+        
+        if waterfall_df.empty:
+            st.info("완료된 스팬이 없습니다.")
+        else:
+            chart = alt.Chart(waterfall_df).mark_bar().encode(
+                x=alt.X('시작 (ms)', title='실행 시작 후 경과 (ms)'),
+                x2='종료 (ms)',
+                y=alt.Y('스팬', sort=None, title=None),
+                color=alt.Color('종류'),
+                tooltip=['스팬', '종류', '키워드', '소요 (ms)', '결과', '크기 (bytes)', '오류'],
+            ).properties(height=max(200, 22 * len(waterfall_df)))
+            st.altair_chart(chart, use_container_width=True)
+            
+            failed_spans = waterfall_df[waterfall_df['결과'] != 'ok']
+            if not failed_spans.empty:
+                st.warning(f"실패한 스팬 {len(failed_spans)}개")
+                st.dataframe(failed_spans[['스팬', '결과', '오류']], use_container_width=True, hide_index=True)
+
+    # 3. 프로파일링 실행 (run_blog_creation 1회)
+    st.markdown("---")
+    st.subheader("🔬 프로파일링")
+    profiling_config = wp_sys.config.get('profiling', {})
+    profiles_dir = os.path.join(wp_sys.blog_posts_dir, profiling_config.get('directory', 'profiles'))
+
+    if st.toggle("프로파일링 모드", help="run_blog_creation 1회를 프로파일러로 실행하고 pstats/collapsed 스택/메모리 스냅샷을 저장합니다."):
+        col_mode, col_post = st.columns(2)
+        with col_mode:
+            modes = ['deterministic', 'sampling']
+            profile_mode = st.selectbox("방식", modes, index=modes.index(profiling_config.get('mode', 'deterministic')))
+        with col_post:
+            profile_do_post = st.checkbox("워드프레스에 포스팅", value=False, key="profile_do_post")
+
+        if st.button("🔬 프로파일링 실행"):
+            with st.spinner("프로파일링 중... (블로그 생성 1회)"):
+                _, artifacts = wp_sys.run_profiled(lambda: wp_sys.run_blog_creation(do_post=profile_do_post), mode=profile_mode)
+            st.success(f"프로파일 저장: {os.path.basename(artifacts['summary'])}")
+
+    from profiling import recent_profiles
+    profiles = recent_profiles(profiles_dir)
+    if profiles:
+        selected_profile = st.selectbox(
+            "프로파일 선택:", profiles,
+            format_func=lambda p: (
+                f"{p['run_id']} · {p['mode']} · {p['elapsed_seconds']}초"
+                + (f" · 메모리 최고 {p['memory']['peak_mb']} MB" if p.get('memory') else '')
+            )
+        )
+        if selected_profile.get('top_functions'):
+            st.dataframe(pd.DataFrame(selected_profile['top_functions']), use_container_width=True, hide_index=True)
+
+        download_cols = st.columns(len(selected_profile['artifacts']))
+        for col, (kind, filename) in zip(download_cols, selected_profile['artifacts'].items()):
+            with col:
+                with open(os.path.join(profiles_dir, filename), 'rb') as f:
+                    st.download_button(f"⬇️ {kind}", f.read(), file_name=filename, key=f"profile_{filename}")
+
 elif menu == "시스템 설정":
     st.title("⚙️ 시스템 설정")
     st.write("블로그 자동 발행 시간 등 시스템 설정을 관리합니다.")
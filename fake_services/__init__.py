@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 테스트/벤치마크용 외부 API 대체 서버
+Gemini(generateContent/streamGenerateContent), Imagen(predict), WordPress REST(posts/categories/tags),
+Telegram(sendMessage)과 스크래핑 대상 페이지(Google Trends/뉴스/이미지, YouTube 검색 결과의 녹화본)를
+하나의 로컬 포트에서 흉내 내며 지연 시간, 오류 비율, 응답 내용을 설정할 수 있다.
+
+실행: python -m fake_services [--port 8766] [--config fake_services.json]
+접속: GEMINI_API_BASE_URL / TELEGRAM_API_BASE_URL / WORDPRESS_URL 을 서버 주소로 설정,
+      스크래핑은 system_config.json의 source_urls 를 source_urls_for(서버 주소) 값으로 설정
+"""
+from fake_services.server import DEFAULT_CONFIG, FakeServiceServer, load_config, source_urls_for
+
+__all__ = ['DEFAULT_CONFIG', 'FakeServiceServer', 'load_config', 'source_urls_for']
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+대체 서버 실행
+
+예시:
+    python -m fake_services --port 8766 --latency-scale 0.5 --error-rate 0.05
+    python -m fake_services --config fake_services.json
+"""
+import argparse
+import json
+
+from fake_services.server import FakeServiceServer, source_urls_for
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline stand-in for Gemini, Imagen, WordPress, Telegram and scraped pages')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8766, help='Port (default: 8766)')
+    parser.add_argument('--config', help='JSON file with per-service overrides (latency_ms, jitter_ms, error_rate, ...)')
+    parser.add_argument('--latency-scale', type=float, default=None, help='Multiply every latency setting by this factor')
+    parser.add_argument('--error-rate', type=float, default=None, help='Error rate applied to every service')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for latency jitter and error injection')
+    parser.add_argument('--verbose', action='store_true', help='Print every request')
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+
+    server = FakeServiceServer(args.host, args.port, config=overrides, seed=args.seed, verbose=args.verbose)
+    for settings in server.state.config.values():
+        if args.latency_scale is not None:
+            for key in ('latency_ms', 'jitter_ms', 'chunk_delay_ms'):
+                if key in settings:
+                    settings[key] = settings[key] * args.latency_scale
+        if args.error_rate is not None:
+            settings['error_rate'] = args.error_rate
+
+    print(f"대체 서버 실행 중: {server.base_url}")
+    print(f"  GEMINI_API_BASE_URL={server.base_url}")
+    print(f"  TELEGRAM_API_BASE_URL={server.base_url}")
+    print(f"  WORDPRESS_URL={server.base_url}")
+    print(f"  system_config.json source_urls={json.dumps(source_urls_for(server.base_url))}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
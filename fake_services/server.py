@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 대체 서버 구현
+하나의 포트에서 경로로 서비스를 구분한다.
+
+- Gemini:   POST /v1beta/models/{model}:generateContent
+            POST /v1beta/models/{model}:streamGenerateContent  (?alt=sse 이면 SSE, 아니면 JSON 배열 스트림)
+- Imagen:   POST /v1beta/models/{model}:predict
+- WordPress GET/POST /wp-json/wp/v2/posts | categories | tags
+- Telegram: POST /bot{token}/sendMessage
+- 스크래핑: GET /trending (Google Trends), /search?tbm=nws|isch (Google 뉴스/이미지), /results (YouTube)
+            fixtures/ 의 녹화 페이지를 검색어로 채워 반환 (이미지는 /fixtures/image.png)
+"""
+import base64
+import copy
+import json
+import os
+import random
+import re
+import string
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 1x1 투명 PNG (Imagen 응답용)
+PLACEHOLDER_PNG = base64.b64encode(bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082'
+)).decode('ascii')
+
+DEFAULT_ARTICLE = """---
+title: '$keyword 핵심 정리'
+categories: [정보, 분석]
+tags: ['$keyword', '이슈', '정리']
+description: $keyword에 대한 주요 내용을 정리한 글입니다.
+---
+
+## $keyword, 무슨 일이 있었나요?
+
+대체 서버가 생성한 본문입니다. 실제 Gemini 응답과 비슷한 길이와 구조를 갖도록 작성되었습니다.
+
+## 핵심 포인트
+
+- 첫 번째 포인트: 배경과 경과를 정리합니다.
+- 두 번째 포인트: 주요 반응과 쟁점을 살펴봅니다.
+- 세 번째 포인트: 앞으로의 전망을 짚어 봅니다.
+
+## 정리
+
+$keyword 관련 소식은 앞으로도 계속 업데이트될 예정입니다.
+"""
+
+# 서비스별 기본 설정 (latency_ms: 평균 지연, jitter_ms: 무작위 추가 지연, error_rate: 오류 응답 비율)
+DEFAULT_CONFIG = {
+    'gemini': {
+        'latency_ms': 800, 'jitter_ms': 400, 'error_rate': 0.0, 'error_status': 429,
+        'chunk_count': 8, 'chunk_delay_ms': 150,
+        'article': DEFAULT_ARTICLE,
+        'category': 'OTHER',
+        'focus': '정보 전달 및 개요 설명',
+    },
+    'imagen': {'latency_ms': 1500, 'jitter_ms': 500, 'error_rate': 0.0, 'error_status': 429},
+    'wordpress': {'latency_ms': 200, 'jitter_ms': 100, 'error_rate': 0.0, 'error_status': 500},
+    'telegram': {'latency_ms': 100, 'jitter_ms': 50, 'error_rate': 0.0, 'error_status': 429},
+    # fixtures_dir: 녹화 페이지 디렉토리 (None이면 패키지의 fixtures/)
+    'scrape': {'latency_ms': 300, 'jitter_ms': 150, 'error_rate': 0.0, 'error_status': 503, 'fixtures_dir': None},
+}
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 스크래핑 경로별 녹화 페이지 파일
+_FIXTURE_PAGES = {
+    '/trending': 'trends.html',
+    '/results': 'youtube.html',
+}
+_SEARCH_PAGES = {'nws': 'news.html', 'isch': 'images.html'}
+
+_GEMINI_PATH = re.compile(r'^/v1(?:beta)?\d*/models/([^/:]+):(generateContent|streamGenerateContent|predict)$')
+_TELEGRAM_PATH = re.compile(r'^/bot([^/]+)/sendMessage$')
+_WP_PATH = re.compile(r'^/wp-json/wp/v2/(posts|categories|tags)$')
+_KEYWORD_LINE = re.compile(r'^\s*\[키워드\]\s*:\s*(.+)$', re.MULTILINE)
+_KEYWORD_LIST = re.compile(r'\[키워드 목록 \(JSON\)\]\s*(\[.*?\])', re.DOTALL)
+
+
+def load_config(overrides=None):
+    """기본 설정에 서비스별 덮어쓰기 설정 병합"""
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    for service, values in (overrides or {}).items():
+        config.setdefault(service, {}).update(values)
+    return config
+
+
+def source_urls_for(base_url):
+    """대체 서버의 녹화 페이지를 가리키는 source_urls 설정 (system_config.json 형식)"""
+    return {
+        'trends': f"{base_url}/trending?geo=KR&hours=24",
+        'news_search': f"{base_url}/search?q={{query}}&tbm=nws&hl=ko",
+        'image_search': f"{base_url}/search?q={{query}}&tbm=isch&hl=ko",
+        'youtube_search': f"{base_url}/results?search_query={{query}}",
+    }
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 2) if text else 0
+
+
+class FakeState:
+    """대체 서버의 설정, WordPress 데이터, 요청 통계 (모든 요청 스레드가 공유)"""
+
+    def __init__(self, config, seed=None):
+        self.config = config
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.wp = {'posts': [], 'categories': [], 'tags': []}
+        self.telegram_messages = []
+        self.requests = {}
+        self._fixtures = {}
+
+    def fixture(self, filename):
+        """녹화 페이지 템플릿 (처음 요청 시 한 번만 읽음)"""
+        with self.lock:
+            template = self._fixtures.get(filename)
+        if template is None:
+            directory = self.config.get('scrape', {}).get('fixtures_dir') or FIXTURES_DIR
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                template = string.Template(f.read())
+            with self.lock:
+                self._fixtures[filename] = template
+        return template
+
+    def count(self, service, status):
+        with self.lock:
+            counters = self.requests.setdefault(service, {})
+            counters[status] = counters.get(status, 0) + 1
+
+    def delay(self, service, key='latency_ms'):
+        settings = self.config.get(service, {})
+        with self.lock:
+            jitter = self.random.uniform(0, settings.get('jitter_ms', 0)) if key == 'latency_ms' else 0
+        return (settings.get(key, 0) + jitter) / 1000.0
+
+    def should_fail(self, service):
+        rate = self.config.get(service, {}).get('error_rate', 0)
+        with self.lock:
+            return rate > 0 and self.random.random() < rate
+
+
+class FakeServiceHandler(BaseHTTPRequestHandler):
+    """경로별로 Gemini/Imagen/WordPress/Telegram 응답을 흉내 내는 핸들러"""
+
+    server_version = 'FakeServices/1.0'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    # --- 라우팅 ---
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method):
+        parsed = urllib.parse.urlparse(self.path)
+        query = {k: v[0] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+        path = parsed.path
+
+        if path == '/_stats':
+            with self.state.lock:
+                return self._send_json(200, {'requests': self.state.requests, 'wp_posts': len(self.state.wp['posts'])})
+
+        match = _GEMINI_PATH.match(path)
+        if match and method == 'POST':
+            model, action = match.groups()
+            service = 'imagen' if action == 'predict' else 'gemini'
+            if self._inject_failure(service):
+                return
+            body = self._read_json()
+            if action == 'predict':
+                return self._imagen_predict(body)
+            if action == 'streamGenerateContent':
+                return self._gemini_stream(model, body, sse=query.get('alt') == 'sse')
+            return self._gemini_generate(model, body)
+
+        match = _WP_PATH.match(path)
+        if match:
+            if self._inject_failure('wordpress'):
+                return
+            return self._wordpress(method, match.group(1), query)
+
+        match = _TELEGRAM_PATH.match(path)
+        if match and method == 'POST':
+            if self._inject_failure('telegram'):
+                return
+            return self._telegram_send()
+
+        if method == 'GET' and path.startswith('/fixtures/'):
+            return self._send_bytes(200, base64.b64decode(PLACEHOLDER_PNG), 'image/png')
+
+        page = _SEARCH_PAGES.get(query.get('tbm')) if path == '/search' else _FIXTURE_PAGES.get(path)
+        if page and method == 'GET':
+            if self._inject_failure('scrape'):
+                return
+            return self._scrape_page(page, query.get('q') or query.get('search_query') or '')
+
+        self._send_json(404, {'error': {'code': 404, 'message': f"unknown path: {path}", 'status': 'NOT_FOUND'}})
+
+    def _inject_failure(self, service):
+        """지연 적용 후 설정된 비율로 오류 응답 (오류를 보냈으면 True)"""
+        time.sleep(self.state.delay(service))
+        if not self.state.should_fail(service):
+            return False
+        status = self.state.config.get(service, {}).get('error_status', 500)
+        self._read_body()
+        self.state.count(service, status)
+        headers = {'Retry-After': '1'} if status == 429 else {}
+        self._send_json(status, {'error': {
+            'code': status,
+            'message': 'Resource has been exhausted (fake). Please retry in 1s' if status == 429 else 'Internal error (fake)',
+            'status': 'RESOURCE_EXHAUSTED' if status == 429 else 'INTERNAL',
+        }}, headers=headers)
+        return True
+
+    # --- Gemini ---
+
+    def _prompt_text(self, body):
+        parts = []
+        for content in body.get('contents', []) or []:
+            for part in content.get('parts', []) or []:
+                if 'text' in part:
+                    parts.append(part['text'])
+        return '\n'.join(parts)
+
+    def _gemini_reply(self, prompt):
+        """프롬프트 종류(일괄 분류 / 카테고리 분석 / 본문)에 맞는 응답 텍스트"""
+        settings = self.state.config['gemini']
+        keyword_list = _KEYWORD_LIST.search(prompt)
+        if keyword_list:
+            try:
+                keywords = json.loads(keyword_list.group(1))
+            except ValueError:
+                keywords = []
+            return json.dumps([
+                {'keyword': kw, 'category': settings['category'], 'focus': settings['focus']} for kw in keywords
+            ], ensure_ascii=False)
+        if 'Category: [카테고리명]' in prompt:
+            return f"Category: {settings['category']}\nFocus: {settings['focus']}"
+
+        keyword = _KEYWORD_LINE.search(prompt)
+        keyword = keyword.group(1).strip() if keyword else '트렌드'
+        return settings['article'].replace('$keyword', keyword)
+
+    def _gemini_payload(self, text, prompt, final=True):
+        payload = {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'index': 0,
+            }],
+        }
+        if final:
+            payload['candidates'][0]['finishReason'] = 'STOP'
+            payload['usageMetadata'] = {
+                'promptTokenCount': estimate_tokens(prompt),
+                'candidatesTokenCount': estimate_tokens(text),
+                'totalTokenCount': estimate_tokens(prompt) + estimate_tokens(text),
+            }
+        return payload
+
+    def _gemini_generate(self, model, body):
+        prompt = self._prompt_text(body)
+        text = self._gemini_reply(prompt)
+        self.state.count('gemini', 200)
+        self._send_json(200, self._gemini_payload(text, prompt))
+
+    def _gemini_stream(self, model, body, sse=False):
+        prompt = self._prompt_text(body)
+        text = self._gemini_reply(prompt)
+        settings = self.state.config['gemini']
+        count = max(1, settings.get('chunk_count', 8))
+        size = max(1, -(-len(text) // count))
+        chunks = [text[i:i + size] for i in range(0, len(text), size)] or ['']
+
+        self.state.count('gemini', 200)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream' if sse else 'application/json')
+        self.end_headers()
+
+        chunk_delay = self.state.delay('gemini', 'chunk_delay_ms')
+        for idx, chunk in enumerate(chunks):
+            final = idx == len(chunks) - 1
+            data = json.dumps(self._gemini_payload(chunk, prompt, final=final), ensure_ascii=False)
+            if sse:
+                out = f"data: {data}\r\n\r\n"
+            else:
+                out = ('[' if idx == 0 else ',\r\n') + data + (']' if final else '')
+            self.wfile.write(out.encode('utf-8'))
+            self.wfile.flush()
+            if not final:
+                time.sleep(chunk_delay)
+
+    # --- Imagen ---
+
+    def _imagen_predict(self, body):
+        count = 1
+        try:
+            count = int(body.get('parameters', {}).get('sampleCount', 1))
+        except (TypeError, ValueError, AttributeError):
+            pass
+        self.state.count('imagen', 200)
+        self._send_json(200, {'predictions': [
+            {'bytesBase64Encoded': PLACEHOLDER_PNG, 'mimeType': 'image/png'} for _ in range(count)
+        ]})
+
+    # --- WordPress ---
+
+    def _wordpress(self, method, resource, query):
+        items = self.state.wp[resource]
+        base = f"http://{self.headers.get('Host', 'localhost')}"
+
+        if method == 'GET':
+            with self.state.lock:
+                result = list(items)
+            search = query.get('search')
+            if search:
+                result = [item for item in result if search.lower() in item.get('name', '').lower()]
+            if resource == 'posts':
+                result = sorted(result, key=lambda item: item['id'], reverse=True)
+            per_page = int(query.get('per_page', 10))
+            self.state.count('wordpress', 200)
+            return self._send_json(200, result[:per_page])
+
+        body = self._read_json()
+        with self.state.lock:
+            item_id = len(items) + 1
+            if resource == 'posts':
+                title = body.get('title', '')
+                item = {
+                    'id': item_id,
+                    'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'link': f"{base}/?p={item_id}",
+                    'title': {'rendered': title},
+                    'status': body.get('status', 'draft'),
+                    'categories': body.get('categories', []),
+                    'tags': body.get('tags', []),
+                    'content_length': len(body.get('content', '')),
+                }
+            else:
+                name = body.get('name', '')
+                item = {'id': item_id, 'name': name, 'slug': urllib.parse.quote(name), 'count': 0}
+            items.append(item)
+        self.state.count('wordpress', 201)
+        self._send_json(201, item)
+
+    # --- Telegram ---
+
+    def _telegram_send(self):
+        raw = self._read_body().decode('utf-8', errors='replace')
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            data = json.loads(raw or '{}')
+        else:
+            data = {k: v[0] for k, v in urllib.parse.parse_qs(raw).items()}
+        with self.state.lock:
+            self.state.telegram_messages.append(data)
+            message_id = len(self.state.telegram_messages)
+        self.state.count('telegram', 200)
+        self._send_json(200, {'ok': True, 'result': {
+            'message_id': message_id,
+            'chat': {'id': data.get('chat_id')},
+            'text': data.get('text', ''),
+        }})
+
+    # --- 스크래핑 ---
+
+    def _scrape_page(self, filename, keyword):
+        try:
+            template = self.state.fixture(filename)
+        except OSError as e:
+            self.state.count('scrape', 404)
+            return self._send_json(404, {'error': {'code': 404, 'message': str(e), 'status': 'NOT_FOUND'}})
+        html = template.safe_substitute(
+            keyword=keyword,
+            keyword_url=urllib.parse.quote(keyword),
+            base_url=f"http://{self.headers.get('Host', 'localhost')}",
+        )
+        self.state.count('scrape', 200)
+        self._send_bytes(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    # --- 공통 ---
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _read_json(self):
+        raw = self._read_body()
+        try:
+            return json.loads(raw.decode('utf-8')) if raw else {}
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send_bytes(status, body, 'application/json; charset=utf-8', headers=headers)
+
+    def _send_bytes(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FakeServiceServer(ThreadingHTTPServer):
+    """
+    대체 서버 (백그라운드 스레드 실행 지원)
+
+    Args:
+        host, port: 바인드 주소 (port=0이면 빈 포트 자동 선택)
+        config: 서비스별 설정 덮어쓰기 (load_config 형식)
+        seed: 지연/오류 주입용 난수 시드
+        verbose: 요청 로그 출력 여부
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=8766, config=None, seed=None, verbose=False):
+        super().__init__((host, port), FakeServiceHandler)
+        self.state = FakeState(load_config(config), seed=seed)
+        self.verbose = verbose
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 실행하고 base_url 반환"""
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-services', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -2,6 +2,7 @@
 """
 Streamlit에서 안전하게 키워드를 가져오는 헬퍼 스크립트
 stdout에는 순수 JSON만 출력 (로그 제거)
+--force: 트렌드 캐시를 무시하고 새로 가져옴
 """
 import sys
 import json
@@ -23,7 +24,7 @@ if __name__ == "__main__":
         from trend_blog_system import TrendBlogSystem
         
         system = TrendBlogSystem()
-        keywords = system.get_trending_keywords()
+        keywords = system.get_trending_keywords(force_refresh='--force' in sys.argv[1:])
         
         # stdout 복원
         sys.stdout = old_stdout
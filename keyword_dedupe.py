@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+유사 키워드 중복 검사
+"손흥민", "손흥민 골", "손흥민 경기"처럼 표기만 조금 다른 트렌드 키워드가 각각 전체 생성 과정
+(브라우저 수집, 이미지 생성, 본문 생성)을 거쳐 거의 같은 글을 만드는 것을 막는다.
+
+키워드는 소문자화 후 공백/기호를 없앤 문자열의 문자 2-gram 집합(shingle)으로 비교하고,
+유사도는 겹치는 shingle 수 / 작은 쪽 shingle 수 (작은 쪽이 min_shingles보다 작으면 min_shingles로 나눔)이다.
+짧은 키워드가 긴 키워드에 포함되는 변형("손흥민" ⊂ "손흥민 골")도 1.0이 되고,
+"날씨"처럼 아주 짧은 키워드가 다른 키워드의 일부로 들어간 경우는 걸러지지 않는다.
+
+후보는 shingle → 항목 역색인에서 찾는다. threshold를 넘으려면 공유해야 하는 최소 shingle 수가 정해져 있으므로
+질의의 가장 드문 shingle 몇 개의 목록만 훑어도 빠짐없이 찾을 수 있고, 기록이 수만 개여도
+조회는 짧은 목록 몇 개 + 후보 몇 개의 정확한 유사도 계산으로 끝난다.
+(짧은 문자열이 긴 문자열에 포함되는 경우는 Jaccard 유사도가 낮아 MinHash/LSH 버킷으로는 자주 놓치므로
+포함 관계를 그대로 셀 수 있는 역색인을 사용한다.)
+"""
+import math
+import re
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    """비교용 정규화: 소문자화, 공백/기호 제거"""
+    return _NON_WORD.sub('', text.lower())
+
+
+def shingles(text, size=2):
+    """
+    정규화한 문자열의 문자 size-gram 집합 (size보다 짧으면 문자열 자체)
+
+    Returns:
+        frozenset: shingle 집합
+    """
+    normalized = normalize(text)
+    if len(normalized) <= size:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[start:start + size] for start in range(len(normalized) - size + 1))
+
+
+def title_phrases(title, sizes=(2, 3)):
+    """
+    제목에서 연속한 2~3어절 구절 목록 (긴 제목 안에 들어 있는 키워드 변형을 찾기 위함)
+    """
+    words = [word for word in (_NON_WORD.sub('', part) for part in title.lower().split()) if word]
+    phrases = []
+    for size in sizes:
+        for start in range(len(words) - size + 1):
+            phrases.append(' '.join(words[start:start + size]))
+    return phrases
+
+
+class KeywordDedupeIndex:
+    """
+    Args:
+        threshold: 이 유사도 이상이면 중복으로 판단 (0~1)
+        shingle_size: 문자 n-gram 길이
+        min_shingles: 유사도 분모의 최솟값 (아주 짧은 키워드가 쉽게 중복 판정되지 않도록)
+    """
+
+    def __init__(self, threshold=0.7, shingle_size=2, min_shingles=2):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self._entries = []     # [(정규화 문자열, shingle 집합, 원래 문자열, 출처)]
+        self._exact = {}       # 정규화 문자열 -> 항목 번호
+        self._postings = {}    # shingle -> [항목 번호, ...]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def similarity(self, grams_a, grams_b):
+        """겹치는 shingle 수 / max(작은 쪽 shingle 수, min_shingles)"""
+        if not grams_a or not grams_b:
+            return 0.0
+        return len(grams_a & grams_b) / max(min(len(grams_a), len(grams_b)), self.min_shingles)
+
+    def add(self, text, source=None):
+        """
+        항목 추가 (정규화 결과가 같은 항목이 이미 있으면 무시)
+
+        Args:
+            text: 키워드 또는 제목 구절
+            source: 일치했을 때 함께 돌려줄 정보 (예: {'kind': 'keyword', 'post_path': ...})
+        """
+        normalized = normalize(text)
+        if not normalized or normalized in self._exact:
+            return False
+        grams = shingles(text, self.shingle_size)
+        idx = len(self._entries)
+        self._entries.append((normalized, grams, text, source))
+        self._exact[normalized] = idx
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(idx)
+        return True
+
+    def find(self, text, limit=1):
+        """
+        유사도 threshold 이상인 항목 (유사도 높은 순)
+
+        Returns:
+            list: [(유사도, 일치한 문자열, 출처), ...]
+        """
+        normalized = normalize(text)
+        if not normalized:
+            return []
+        exact = self._exact.get(normalized)
+        if exact is not None:
+            _, _, matched, source = self._entries[exact]
+            return [(1.0, matched, source)]
+
+        grams = shingles(text, self.shingle_size)
+        # 유사도의 분모는 min_shingles 이상이므로 threshold를 넘으려면 최소 needed개를 공유해야 함
+        needed = max(1, math.ceil(self.threshold * self.min_shingles - 1e-9))
+        if len(grams) < needed:
+            return []
+        # needed개 이상 공유하는 항목은 가장 드문 (len - needed + 1)개 shingle 중 하나를 반드시 가짐
+        # (흔한 shingle의 긴 목록은 훑지 않음)
+        rare_first = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates = set()
+        for gram in rare_first[:len(grams) - needed + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        matches = []
+        for idx in candidates:
+            _, entry_grams, matched, source = self._entries[idx]
+            score = self.similarity(grams, entry_grams)
+            if score >= self.threshold:
+                matches.append((score, matched, source))
+        matches.sort(key=lambda item: item[0], reverse=True)
+        return matches[:limit]
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 키워드 서비스
+브라우저 풀과 트렌드 캐시를 가진 TrendBlogSystem을 계속 띄워 두고
+키워드/뉴스/이미지 조회를 localhost HTTP(JSON)로 제공한다.
+대시보드와 스케줄러는 KeywordServiceClient로 접속하여 매 요청마다
+파이썬 인터프리터와 Chromium을 새로 띄우는 비용을 없앤다.
+
+실행: python keyword_service.py [--host 127.0.0.1] [--port 8765]
+"""
+import json
+import os
+import sys
+import urllib.parse
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+def default_service_url():
+    """환경변수 KEYWORD_SERVICE_URL 또는 기본 주소"""
+    return os.getenv('KEYWORD_SERVICE_URL', f"http://{DEFAULT_HOST}:{DEFAULT_PORT}").rstrip('/')
+
+
+class KeywordServiceError(Exception):
+    """서비스 접속 실패 또는 오류 응답"""
+
+
+class KeywordServiceClient:
+    """
+    키워드 서비스 HTTP 클라이언트 (표준 라이브러리만 사용하는 얇은 클라이언트)
+
+    Args:
+        base_url: 서비스 주소 (기본값: KEYWORD_SERVICE_URL 또는 http://127.0.0.1:8765)
+        timeout: 요청 타임아웃(초) - 캐시가 없으면 트렌드 스크래핑을 기다려야 하므로 넉넉하게 설정
+    """
+
+    def __init__(self, base_url=None, timeout=120):
+        self.base_url = (base_url or default_service_url()).rstrip('/')
+        self.timeout = timeout
+
+    def _get(self, path, timeout=None, **params):
+        import urllib.error
+        import urllib.request
+
+        query = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
+        url = f"{self.base_url}{path}" + (f"?{query}" if query else "")
+        try:
+            with urllib.request.urlopen(url, timeout=timeout or self.timeout) as response:
+                payload = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            try:
+                payload = json.loads(e.read().decode('utf-8'))
+            except ValueError:
+                raise KeywordServiceError(f"HTTP {e.code}")
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise KeywordServiceError(str(e))
+
+        if not payload.get('ok'):
+            raise KeywordServiceError(payload.get('error', '알 수 없는 오류'))
+        return payload.get('data')
+
+    def is_available(self):
+        """서비스 응답 여부 (짧은 타임아웃)"""
+        try:
+            self._get('/health', timeout=1)
+            return True
+        except KeywordServiceError:
+            return False
+
+    def get_trending_keywords(self, region='south_korea', force_refresh=False):
+        return self._get('/keywords', region=region, force=1 if force_refresh else None)
+
+    def fetch_google_news(self, keyword, max_news=3):
+        return self._get('/news', keyword=keyword, max=max_news)
+
+    def fetch_google_image(self, keyword):
+        return self._get('/image', keyword=keyword)
+
+    def stats(self):
+        return self._get('/stats', timeout=5)
+
+
+def start_service_process(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """서비스를 백그라운드 프로세스로 실행 (대시보드 자동 시작용)"""
+    import subprocess
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return subprocess.Popen(
+        [sys.executable, 'keyword_service.py', '--host', host, '--port', str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=script_dir
+    )
+
+
+def make_handler(system):
+    """
+    주어진 TrendBlogSystem에 요청을 연결하는 HTTP 핸들러 클래스 생성
+    (http.server는 서비스 실행 시에만 import하여 클라이언트 import 비용을 줄임)
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class KeywordServiceHandler(BaseHTTPRequestHandler):
+        """GET 요청을 TrendBlogSystem 메서드로 연결"""
+
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            params = {k: v[0] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+
+            routes = {
+                '/health': self._health,
+                '/keywords': self._keywords,
+                '/news': self._news,
+                '/image': self._image,
+                '/stats': self._stats,
+            }
+            handler = routes.get(parsed.path)
+            if handler is None:
+                return self._send(404, {'ok': False, 'error': f"알 수 없는 경로: {parsed.path}"})
+
+            try:
+                self._send(200, {'ok': True, 'data': handler(params)})
+            except ValueError as e:
+                self._send(400, {'ok': False, 'error': str(e)})
+            except Exception as e:
+                system._log(f"키워드 서비스 요청 처리 오류 ({parsed.path}): {e}")
+                self._send(500, {'ok': False, 'error': str(e)})
+
+        def _health(self, params):
+            return {'pid': os.getpid()}
+
+        def _keywords(self, params):
+            region = params.get('region', 'south_korea')
+            return system.get_trending_keywords(region, force_refresh=params.get('force') == '1')
+
+        def _news(self, params):
+            keyword = self._require_keyword(params)
+            return system.fetch_google_news(keyword, max_news=int(params.get('max', 3)))
+
+        def _image(self, params):
+            return system.fetch_google_image(self._require_keyword(params))
+
+        def _stats(self, params):
+            return {'browser_pool': system.browser_pool.stats()}
+
+        def _require_keyword(self, params):
+            keyword = params.get('keyword', '').strip()
+            if not keyword:
+                raise ValueError("keyword 파라미터가 필요합니다.")
+            return keyword
+
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 요청마다 stderr에 출력하지 않음 (시스템 로그로 충분)
+            pass
+
+    return KeywordServiceHandler
+
+
+def main():
+    """
+    키워드 서비스 실행
+    """
+    import argparse
+    from http.server import ThreadingHTTPServer
+    from dotenv import load_dotenv
+    from trend_blog_system import TrendBlogSystem
+
+    parser = argparse.ArgumentParser(description='Local keyword service')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port (default: 8765)')
+    args = parser.parse_args()
+
+    load_dotenv()
+    system = TrendBlogSystem()
+    # 서비스 자신은 클라이언트로 동작하지 않음 (자기 자신 호출 방지)
+    system.keyword_service = None
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(system))
+    server.daemon_threads = True
+
+    system._log(f"키워드 서비스 시작: http://{args.host}:{args.port}")
+    system.browser_pool.prewarm()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        system.browser_pool.close()
+        system._log("키워드 서비스 종료")
+
+
+if __name__ == "__main__":
+    main()
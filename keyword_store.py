@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+사용된 키워드 저장소
+키워드를 기본 키로 하는 SQLite 테이블에 사용 시각, 저장된 포스트 파일, WordPress 링크, 실행 ID를 기록한다.
+조회는 후보 키워드만 색인으로 확인하므로 기록이 쌓여도 전체를 읽지 않으며,
+스케줄러와 대시보드가 같은 파일을 공유할 수 있도록 WAL 모드를 사용한다.
+
+expire_days를 지정하면 사용한 지 N일이 지난 키워드는 다시 사용할 수 있다.
+처음 열 때 기존 used_keywords.json이 있으면 한 번 가져오고 파일 이름을 .migrated로 바꾼다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# IN (...) 조회 한 번에 넣는 최대 키워드 수 (SQLite 변수 개수 제한)
+_QUERY_CHUNK = 500
+
+
+class KeywordStore:
+    """
+    Args:
+        path: SQLite 파일 경로
+        expire_days: 사용 후 다시 사용할 수 있게 되기까지의 일수 (None이면 만료 없음)
+        legacy_json: 처음 열 때 가져올 기존 JSON 목록 파일
+        log: 로그 함수 (이전 작업 결과 기록용)
+    """
+
+    def __init__(self, path='keywords.db', expire_days=None, legacy_json=None, log=None):
+        self.path = path
+        self.expire_days = expire_days
+        self.legacy_json = legacy_json
+        self._log = log or (lambda message: None)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # 첫 사용 시 연결 (생성자는 파일 I/O 없이 가볍게 유지)
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS used_keywords (
+                    keyword TEXT PRIMARY KEY,
+                    used_at REAL NOT NULL,
+                    post_path TEXT,
+                    post_url TEXT,
+                    run_id TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_used_keywords_used_at ON used_keywords(used_at)")
+            conn.commit()
+            self._migrate_json(conn)
+            self._conn = conn
+        return self._conn
+
+    def _migrate_json(self, conn):
+        """기존 used_keywords.json 목록을 한 번 가져옴 (사용 시각은 파일 수정 시각, 목록 순서 유지)"""
+        if not self.legacy_json or not os.path.exists(self.legacy_json):
+            return
+        try:
+            with open(self.legacy_json, 'r', encoding='utf-8') as f:
+                keywords = json.load(f)
+            used_at = os.path.getmtime(self.legacy_json)
+        except FileNotFoundError:
+            # 다른 프로세스(대시보드/스케줄러)가 먼저 가져감
+            return
+        except (OSError, ValueError) as e:
+            self._log(f"기존 키워드 파일 가져오기 오류: {e}")
+            return
+
+        # 목록 뒤쪽이 최근 항목이므로 순서대로 1ms씩 늘려 정렬 순서 보존
+        rows = [(keyword, used_at - (len(keywords) - idx) * 0.001)
+                for idx, keyword in enumerate(keywords) if isinstance(keyword, str) and keyword]
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO used_keywords (keyword, used_at) VALUES (?, ?)", rows)
+        try:
+            os.replace(self.legacy_json, self.legacy_json + '.migrated')
+        except FileNotFoundError:
+            # 동시에 연 다른 프로세스가 이미 이름을 바꿈 (INSERT OR IGNORE라 중복 없음)
+            return
+        except OSError as e:
+            self._log(f"기존 키워드 파일 이름 변경 오류: {e}")
+            return
+        self._log(f"used_keywords.json에서 키워드 {len(rows)}개를 가져왔습니다 ({self.path})")
+
+    def _active_since(self):
+        """이 시각 이후에 사용된 키워드만 '사용됨'으로 취급 (만료 없음이면 0)"""
+        if not self.expire_days:
+            return 0
+        return time.time() - self.expire_days * 86400
+
+    def is_used(self, keyword):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM used_keywords WHERE keyword = ? AND used_at >= ?",
+                (keyword, self._active_since())
+            ).fetchone()
+        return row is not None
+
+    def used_among(self, keywords):
+        """
+        후보 키워드 중 이미 사용된(만료되지 않은) 것
+
+        Returns:
+            set: 사용된 키워드
+        """
+        candidates = list(dict.fromkeys(keywords))
+        used = set()
+        since = self._active_since()
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(candidates), _QUERY_CHUNK):
+                chunk = candidates[start:start + _QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT keyword FROM used_keywords WHERE keyword IN ({placeholders}) AND used_at >= ?",
+                    (*chunk, since)
+                ).fetchall()
+                used.update(row[0] for row in rows)
+        return used
+
+    def unused(self, keywords):
+        """사용되지 않은 키워드만 순서대로 반환"""
+        used = self.used_among(keywords)
+        return [keyword for keyword in keywords if keyword not in used]
+
+    def mark_used(self, keyword, post_path=None, run_id=None):
+        """
+        키워드 사용 기록 (이미 있으면 사용 시각을 갱신하고 포스트 정보는 새 값이 있을 때만 덮어씀)
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("""
+                    INSERT INTO used_keywords (keyword, used_at, post_path, run_id) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(keyword) DO UPDATE SET
+                        used_at = excluded.used_at,
+                        post_path = COALESCE(excluded.post_path, post_path),
+                        run_id = COALESCE(excluded.run_id, run_id)
+                """, (keyword, time.time(), post_path, run_id))
+
+    def link_post(self, keyword, post_url):
+        """WordPress 게시 링크 기록"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("UPDATE used_keywords SET post_url = ? WHERE keyword = ?", (post_url, keyword))
+
+    def remove(self, keywords):
+        """키워드 기록 삭제 (다시 사용 가능)"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("DELETE FROM used_keywords WHERE keyword = ?", [(keyword,) for keyword in keywords])
+
+    def entries(self, limit=None, include_expired=True):
+        """
+        기록 목록 (최근 사용순)
+
+        Returns:
+            list: [{'keyword', 'used_at', 'post_path', 'post_url', 'run_id', 'expired'}, ...]
+        """
+        since = self._active_since()
+        query = "SELECT keyword, used_at, post_path, post_url, run_id FROM used_keywords"
+        params = []
+        if not include_expired:
+            query += " WHERE used_at >= ?"
+            params.append(since)
+        query += " ORDER BY used_at DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+        return [
+            {'keyword': keyword, 'used_at': used_at, 'post_path': post_path, 'post_url': post_url,
+             'run_id': run_id, 'expired': used_at < since}
+            for keyword, used_at, post_path, post_url, run_id in rows
+        ]
+
+    def count(self):
+        """사용 중(만료되지 않은) 키워드 수"""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM used_keywords WHERE used_at >= ?", (self._active_since(),)
+            ).fetchone()[0]
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+로그 파일 tail 및 색인 검색
+파일 전체를 읽지 않고 끝에서부터 블록 단위로 거슬러 읽어 최근 줄을 보여주고,
+마지막으로 읽은 바이트 위치 이후의 새 줄만 이어서 읽는다.
+
+실행 ID/레벨/키워드 필터는 작은 보조 색인 파일(system_log.txt.idx)을 사용한다.
+색인에는 실행 ID와 키워드별 첫/마지막 줄 위치, WARNING/ERROR 줄 위치가 들어 있고,
+마지막으로 색인한 위치 이후에 추가된 부분만 갱신한다 (파일이 교체/비워지면 다시 만든다).
+"""
+import bisect
+import json
+import os
+import re
+
+from log_writer import parse_line
+
+INDEX_VERSION = 1
+
+# 위치를 모두 기록하는 레벨 (INFO는 너무 많아 tail 범위에서만 필터링)
+INDEXED_LEVELS = ('WARNING', 'ERROR')
+
+# 레벨별로 보관하는 최대 위치 수 (오래된 것부터 버림)
+MAX_LEVEL_OFFSETS = 20000
+
+# 색인할 필드 ("run_id": "...", "level": "...", "keyword": "..."; 메시지 안의 따옴표는 \"로 이스케이프되어 있음)
+_FIELDS = re.compile(rb'"(run_id|level|keyword)": "((?:[^"\\]|\\.)*)"')
+
+
+class LogReader:
+    """
+    Args:
+        path: 로그 파일 경로
+        index_path: 색인 파일 경로 (기본값: path + '.idx')
+        block_size: 거슬러 읽을 때 한 번에 읽는 바이트 수
+        max_scan_mb: 색인 없이 필터링할 때(본문 검색, INFO) 끝에서부터 훑는 최대 크기
+    """
+
+    def __init__(self, path, index_path=None, block_size=64 * 1024, max_scan_mb=32):
+        self.path = path
+        self.index_path = index_path or path + '.idx'
+        self.block_size = block_size
+        self.max_scan_bytes = int(max_scan_mb * 1024 * 1024)
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def tail(self, limit=100):
+        """
+        마지막 limit줄 (오래된 줄부터)
+
+        Returns:
+            tuple: (레코드 목록, 다음에 read_since()에 넘길 위치)
+        """
+        if not os.path.exists(self.path):
+            return [], 0
+        with open(self.path, 'rb') as f:
+            end = self._complete_end(f)
+            records = []
+            for line in self._iter_backward(f, end):
+                records.append(parse_line(line.decode('utf-8', errors='replace')))
+                if len(records) >= limit:
+                    break
+        records.reverse()
+        return records, end
+
+    def read_since(self, offset, limit=1000):
+        """
+        offset 이후에 추가된 줄 (파일이 교체되었거나 비워졌으면 처음부터)
+
+        Returns:
+            tuple: (레코드 목록(최대 limit개, 최신 쪽 유지), 새 위치, 교체 여부)
+        """
+        if not os.path.exists(self.path):
+            return [], 0, offset > 0
+        with open(self.path, 'rb') as f:
+            end = self._complete_end(f)
+            reset = end < offset
+            if reset:
+                offset = 0
+            # 한꺼번에 너무 많이 쌓였으면 최근 부분만 읽음
+            start = max(offset, end - self.max_scan_bytes)
+            f.seek(start)
+            data = f.read(end - start)
+        lines = data.split(b'\n')
+        if start > offset:
+            # 중간부터 읽었으므로 잘린 첫 줄은 버림
+            lines = lines[1:]
+        records = [parse_line(line.decode('utf-8', errors='replace')) for line in lines if line]
+        return records[-limit:], end, reset
+
+    def _complete_end(self, f):
+        """마지막 줄바꿈 바로 뒤 위치 (기록 중인 마지막 줄은 제외)"""
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        pos = end
+        while pos > 0:
+            read = min(self.block_size, pos)
+            f.seek(pos - read)
+            block = f.read(read)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                return pos - read + newline + 1
+            pos -= read
+        return 0
+
+    def _iter_backward(self, f, end, start=0):
+        """end부터 start까지 거슬러 올라가며 줄 단위로 반환 (최신 줄부터)"""
+        pos = end
+        remainder = b''
+        while pos > start:
+            read = min(self.block_size, pos - start)
+            pos -= read
+            f.seek(pos)
+            lines = (f.read(read) + remainder).split(b'\n')
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
+
+    # 색인
+
+    def _file_id(self):
+        """파일 교체 감지용 식별값 (inode + 첫 줄 앞부분)"""
+        try:
+            stat = os.stat(self.path)
+            with open(self.path, 'rb') as f:
+                head = f.read(128)
+        except OSError:
+            return None
+        first_line = head.split(b'\n', 1)[0]
+        return f"{stat.st_ino}:{first_line.hex()[:64]}"
+
+    def _empty_index(self):
+        return {'version': INDEX_VERSION, 'file_id': None, 'offset': 0, 'lines': 0,
+                'runs': {}, 'keywords': {}, 'levels': {level: [] for level in INDEXED_LEVELS}}
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        return self._empty_index()
+
+    def update_index(self):
+        """
+        마지막 색인 위치 이후 추가된 줄을 색인에 반영하고 저장
+
+        Returns:
+            dict: 색인 {'offset', 'lines', 'runs': {run_id: [첫 위치, 마지막 위치, 줄 수]},
+                   'keywords': {키워드: [...]}, 'levels': {'ERROR': [위치, ...], ...}}
+        """
+        index = self.load_index()
+        if not os.path.exists(self.path):
+            return index
+
+        file_id = self._file_id()
+        if index['file_id'] != file_id or self.size() < index['offset']:
+            index = self._empty_index()
+            index['file_id'] = file_id
+
+        with open(self.path, 'rb') as f:
+            end = self._complete_end(f)
+            if end <= index['offset']:
+                return index
+            f.seek(index['offset'])
+            offset = index['offset']
+            while offset < end:
+                chunk = f.read(min(4 * 1024 * 1024, end - offset))
+                # 블록 끝의 잘린 줄은 다음 블록에서 처리
+                cut = chunk.rfind(b'\n') + 1
+                if cut == 0:
+                    chunk = chunk + f.readline()
+                    cut = len(chunk)
+                f.seek(offset + cut)
+                self._index_chunk(index, chunk[:cut], offset)
+                offset += cut
+
+        index['offset'] = end
+        for level in INDEXED_LEVELS:
+            index['levels'][level] = index['levels'][level][-MAX_LEVEL_OFFSETS:]
+        self._save_index(index)
+        return index
+
+    def _index_chunk(self, index, chunk, base):
+        runs = index['runs']
+        keywords = index['keywords']
+        levels = index['levels']
+        position = base
+        for line in chunk.split(b'\n'):
+            if line:
+                index['lines'] += 1
+                for name, value in _FIELDS.findall(line):
+                    if name == b'level':
+                        level = value.decode('ascii', errors='replace')
+                        if level in levels:
+                            levels[level].append(position)
+                        continue
+                    try:
+                        value = json.loads(b'"' + value + b'"') if b'\\' in value else value.decode('utf-8')
+                    except ValueError:
+                        continue
+                    if not value:
+                        continue
+                    _extend_range(runs if name == b'run_id' else keywords, value, position)
+            position += len(line) + 1
+
+    def _save_index(self, index):
+        temp_path = self.index_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # 색인을 저장하지 못해도 다음 번에 다시 만들면 됨
+            pass
+
+    def runs(self, index=None, limit=50):
+        """색인된 실행 ID 목록 (최신순): [{'run_id', 'lines', 'offset'}, ...]"""
+        index = index or self.update_index()
+        entries = sorted(index['runs'].items(), key=lambda item: item[1][1], reverse=True)
+        return [{'run_id': run_id, 'lines': entry[2], 'offset': entry[1]} for run_id, entry in entries[:limit]]
+
+    def keywords(self, index=None, limit=200):
+        """색인된 키워드 목록 (최근 등장순)"""
+        index = index or self.update_index()
+        entries = sorted(index['keywords'].items(), key=lambda item: item[1][1], reverse=True)
+        return [keyword for keyword, _ in entries[:limit]]
+
+    def search(self, run_id=None, level=None, keyword=None, text=None, limit=200, index=None):
+        """
+        조건에 맞는 줄 (오래된 줄부터 최대 limit개, 최신 쪽 유지)
+
+        레벨이 WARNING/ERROR면 색인된 위치만 읽고, 실행 ID/키워드는 색인의 첫~마지막 위치 범위만 거슬러 읽는다.
+        본문 검색(text)이나 INFO만 지정하면 파일 끝에서 max_scan_mb까지만 훑는다.
+        """
+        if not os.path.exists(self.path):
+            return []
+        index = index or self.update_index()
+
+        def matches(record):
+            if run_id and record.get('run_id') != run_id:
+                return False
+            if level and record.get('level', 'INFO') != level:
+                return False
+            if keyword and record.get('keyword') != keyword:
+                return False
+            if text and text.lower() not in record.get('message', '').lower():
+                return False
+            return True
+
+        if (run_id and run_id not in index['runs']) or (keyword and keyword not in index['keywords']):
+            return []
+
+        results = []
+        with open(self.path, 'rb') as f:
+            start, end = 0, index['offset']
+            for entry in (index['runs'].get(run_id), index['keywords'].get(keyword)):
+                if entry is not None:
+                    start, end = max(start, entry[0]), min(end, _line_end(f, entry[1]))
+            if end <= start:
+                return []
+
+            if level in INDEXED_LEVELS:
+                # 색인된 위치 중 범위 안의 줄만 읽음
+                positions = index['levels'][level]
+                lo, hi = bisect.bisect_left(positions, start), bisect.bisect_left(positions, end)
+                for position in reversed(positions[lo:hi]):
+                    f.seek(position)
+                    record = parse_line(f.readline().decode('utf-8', errors='replace'))
+                    if matches(record):
+                        results.append(record)
+                        if len(results) >= limit:
+                            break
+            else:
+                if end - start > self.max_scan_bytes:
+                    # 범위가 너무 크면 최근 부분만 (잘린 첫 줄은 건너뜀)
+                    start = _line_end(f, end - self.max_scan_bytes)
+                for line in self._iter_backward(f, end, start):
+                    record = parse_line(line.decode('utf-8', errors='replace'))
+                    if matches(record):
+                        results.append(record)
+                        if len(results) >= limit:
+                            break
+        results.reverse()
+        return results
+
+
+def _extend_range(ranges, key, position):
+    entry = ranges.get(key)
+    if entry is None:
+        ranges[key] = [position, position, 1]
+    else:
+        entry[1] = position
+        entry[2] += 1
+
+
+def _line_end(f, position):
+    """position에서 시작하는 줄의 끝(줄바꿈 다음) 위치"""
+    f.seek(position)
+    f.readline()
+    return f.tell()
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 구조화 로그 기록
+_log() 호출은 레코드를 제한된 크기의 큐에 넣고 바로 반환하며, 백그라운드 스레드가 모아서
+한 번에 파일에 쓰고(JSON 한 줄씩) 콘솔에도 출력한다. 파일은 크기/날짜 기준으로 교체(rotation)된다.
+여러 프로세스가 같은 파일에 쓰는 경우에도 교체 여부는 경로의 파일(inode) 기준으로 판단하므로,
+다른 프로세스가 먼저 교체했으면 두 번 교체하지 않고 새 파일을 다시 열어 이어서 기록한다.
+
+레코드 형식 (system_log.txt 한 줄):
+    {"ts": "2025-01-01T08:00:00.123", "level": "INFO", "message": "...",
+     "run_id": "20250101_080000_ab12cd", "stage": "create_post", "keyword": "...", "thread": "batch_0", ...}
+
+run_id/stage/keyword는 현재 트레이스 스팬(tracing.current_span)에서 채운다.
+같은 파일에 쓰는 시스템 인스턴스(대시보드의 trend_sys/wp_sys 등)는 get_writer()로 하나의 기록기를 공유한다.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from tracing import current_span
+
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+
+_CLEAR = object()
+_STOP = object()
+
+# 파일 교체에 실패한 뒤 다시 시도하기까지의 시간 (초)
+_ROTATE_RETRY_SECONDS = 60
+
+
+class LogWriter:
+    """
+    백그라운드 스레드 로그 기록기
+
+    Args:
+        path: 로그 파일 경로
+        max_mb: 이 크기를 넘으면 파일 교체 (None이면 크기 기준 교체 안 함)
+        backup_count: 보관할 이전 파일 수 (path.1 ~ path.N)
+        rotate_daily: True면 날짜가 바뀐 뒤 첫 기록 시 파일 교체
+        flush_interval_ms: 기록할 레코드가 없을 때 대기하는 최대 시간
+        batch_size: 한 번에 모아 쓰는 최대 레코드 수
+        queue_size: 큐 최대 크기 (가득 차면 block_timeout만큼 기다린 뒤 버림)
+        echo: True면 콘솔에도 출력
+    """
+
+    def __init__(self, path, max_mb=20, backup_count=5, rotate_daily=True, flush_interval_ms=200,
+                 batch_size=500, queue_size=10000, block_timeout=0.5, echo=True):
+        self.path = path
+        self.max_mb = max_mb
+        self.backup_count = backup_count
+        self.rotate_daily = rotate_daily
+        self.flush_interval_ms = flush_interval_ms
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.echo = echo
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._stats = {'records': 0, 'batches': 0, 'rotations': 0}
+        self._file = None
+        self._file_day = None
+        self._rotate_retry_at = 0.0
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def configure(self, max_mb=None, backup_count=None, rotate_daily=None, flush_interval_ms=None,
+                  batch_size=None, echo=None, **ignored):
+        """설정값 변경 (None인 항목은 유지, 큐 크기는 생성 시에만 정함)"""
+        for name, value in (('max_mb', max_mb), ('backup_count', backup_count), ('rotate_daily', rotate_daily),
+                            ('flush_interval_ms', flush_interval_ms), ('batch_size', batch_size), ('echo', echo)):
+            if value is not None:
+                setattr(self, name, value)
+
+    def log(self, message, level='INFO', **fields):
+        """레코드를 큐에 넣음 (현재 스팬의 run_id/stage/keyword를 함께 기록)"""
+        now = datetime.now()
+        record = {
+            'ts': now.isoformat(timespec='milliseconds'),
+            'level': level,
+            'message': str(message),
+        }
+        span = current_span()
+        if span is not None:
+            record['run_id'] = span.run_id
+            record['stage'] = span.name
+            if span.keyword:
+                record['keyword'] = span.keyword
+        record['thread'] = threading.current_thread().name
+        record.update(fields)
+
+        try:
+            self._queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def flush(self):
+        """지금까지 넣은 레코드가 모두 기록될 때까지 대기"""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def clear(self):
+        """로그 파일 비우기 (앞서 넣은 레코드를 기록한 뒤 처리)"""
+        self._queue.put(_CLEAR)
+        self.flush()
+
+    def close(self):
+        """남은 레코드를 기록하고 스레드 종료"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+
+    def stats(self):
+        with self._dropped_lock:
+            dropped = self._dropped
+        return {**self._stats, 'dropped': dropped, 'queued': self._queue.qsize()}
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval_ms / 1000.0)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            records = []
+            try:
+                for item in batch:
+                    if item is _STOP:
+                        stop = True
+                    elif item is _CLEAR:
+                        self._write(records)
+                        records = []
+                        self._truncate()
+                    else:
+                        records.append(item)
+                self._write(records)
+            except Exception as e:
+                # 기록기 스레드가 죽으면 flush()가 끝나지 않으므로 계속 진행
+                print(f"로그 기록기 오류: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                self._close_file()
+                return
+
+    def _dropped_record(self):
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        if not dropped:
+            return None
+        return {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'level': 'WARNING',
+            'message': f"로그 큐가 가득 차 {dropped}건을 기록하지 못했습니다.",
+            'thread': 'log-writer',
+        }
+
+    def _write(self, records):
+        dropped = self._dropped_record()
+        if dropped:
+            records = records + [dropped]
+        if not records:
+            return
+
+        lines = ''.join(json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in records)
+        try:
+            self._maybe_rotate()
+            self._open_file().write(lines)
+            self._file.flush()
+        except OSError as e:
+            # 기록 실패가 파이프라인을 멈추게 하지 않음
+            print(f"로그 파일 기록 오류: {e}")
+            self._close_file()
+
+        if self.echo:
+            print('\n'.join(format_record(record) for record in records), flush=True)
+        self._stats['records'] += len(records)
+        self._stats['batches'] += 1
+
+    def _open_file(self):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            try:
+                started = os.path.getmtime(self.path) if os.path.getsize(self.path) else time.time()
+            except OSError:
+                started = time.time()
+            self._file_day = datetime.fromtimestamp(started).date()
+        return self._file
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _maybe_rotate(self):
+        self._open_file()
+        # 같은 파일에 쓰는 다른 프로세스가 이미 교체했을 수 있으므로 열어 둔 파일이 아니라 경로 기준으로 확인
+        current = self._path_stat()
+        if current is None or not os.path.samestat(current, os.fstat(self._file.fileno())):
+            # 교체된(또는 삭제된) 파일에 계속 쓰지 않도록 경로의 새 파일을 다시 엶
+            self._close_file()
+            self._open_file()
+            return
+        if time.monotonic() < self._rotate_retry_at:
+            return
+
+        too_big = self.max_mb and current.st_size >= self.max_mb * 1024 * 1024
+        new_day = self.rotate_daily and current.st_size > 0 and self._file_day != datetime.now().date()
+        if not (too_big or new_day):
+            return
+
+        self._close_file()
+        try:
+            self._rotate(current)
+        except OSError as e:
+            # Windows에서는 다른 프로세스가 열어 둔 파일을 옮길 수 없음 → 이번 배치는 기존 파일에 기록하고 잠시 뒤 재시도
+            print(f"로그 파일 교체 오류: {e}")
+            self._rotate_retry_at = time.monotonic() + _ROTATE_RETRY_SECONDS
+
+    def _path_stat(self):
+        try:
+            return os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+    def _rotate(self, expected):
+        # 판단한 뒤 다른 프로세스가 먼저 교체했으면 그 결과를 그대로 사용
+        current = self._path_stat()
+        if current is None or not os.path.samestat(current, expected):
+            return
+        if self.backup_count > 0:
+            for idx in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{idx}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{idx + 1}")
+            try:
+                os.replace(self.path, f"{self.path}.1")
+            except FileNotFoundError:
+                return
+        else:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                return
+        self._stats['rotations'] += 1
+
+    def _truncate(self):
+        self._close_file()
+        try:
+            with open(self.path, 'w', encoding='utf-8'):
+                pass
+        except OSError as e:
+            print(f"로그 파일 비우기 오류: {e}")
+
+
+def format_record(record):
+    """콘솔/화면 표시용 한 줄 ("[2025-01-01 08:00:00] 메시지")"""
+    ts = record.get('ts', '')[:19].replace('T', ' ')
+    level = record.get('level', 'INFO')
+    prefix = f"[{ts}]" if level == 'INFO' else f"[{ts}] {level}"
+    return f"{prefix} {record.get('message', '')}"
+
+
+def parse_line(line):
+    """
+    로그 파일 한 줄을 레코드로 변환
+    (JSON 형식 이전의 "[시각] 메시지" 줄은 message만 채운 레코드로 반환)
+    """
+    line = line.rstrip('\n')
+    if line.startswith('{'):
+        try:
+            return json.loads(line)
+        except ValueError:
+            pass
+    ts = ''
+    message = line
+    if line.startswith('[') and '] ' in line:
+        ts, message = line[1:].split('] ', 1)
+    return {'ts': ts.replace(' ', 'T'), 'level': 'INFO', 'message': message}
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path, **options):
+    """경로별 공유 기록기 (이미 있으면 options로 설정만 변경)"""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = LogWriter(key, **options)
+            atexit.register(writer.close)
+        elif options:
+            writer.configure(**options)
+        return writer
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Prometheus 텍스트 형식 메트릭
+스케줄러 데몬이 생성/실패 포스트 수, 단계별 지연 시간, LLM 토큰, 외부 API 호출 수, 브라우저 실행 수,
+캐시 적중률, 마지막 성공 시각 등을 localhost HTTP(/metrics)로 노출한다.
+
+단계/외부 호출 지표는 트레이스 스팬이 끝날 때(observe_span) 갱신되고,
+브라우저 풀/응답 캐시/속도 제한 통계는 스크랩 시점에 수집 함수(collector)로 읽는다.
+
+실행: python trend_blog_system.py --metrics-port 9108
+"""
+import threading
+import time
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9108
+
+# 초 단위 히스토그램 구간 (브라우저 작업/Gemini 생성은 수십 초까지 걸림)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+PREFIX = 'trend_blog_'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """레이블 조합별 값을 가진 지표 (모든 스레드에서 갱신)"""
+
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        missing = set(self.labels) - set(labels)
+        if missing:
+            raise ValueError(f"{self.name}: 레이블 누락 {sorted(missing)}")
+        return tuple((name, labels[name]) for name in self.labels)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry['counts'][idx] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {key: {'counts': list(e['counts']), 'sum': e['sum'], 'count': e['count']}
+                      for key, e in self._values.items()}
+        samples = []
+        for key, entry in sorted(values.items()):
+            for bound, count in zip(self.buckets, entry['counts']):
+                samples.append((f"{self.name}_bucket", key + (('le', _format_value(float(bound))),), count))
+            samples.append((f"{self.name}_sum", key, round(entry['sum'], 6)))
+            samples.append((f"{self.name}_count", key, entry['count']))
+        return samples
+
+
+class MetricsRegistry:
+    """지표 모음 및 텍스트 출력"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+
+    def _register(self, cls, name, help, labels=(), **kwargs):
+        name = PREFIX + name
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labels, **kwargs)
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter, name, help, labels)
+
+    def gauge(self, name, help, labels=()):
+        return self._register(Gauge, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, help, labels, buckets=buckets)
+
+    def add_collector(self, collector):
+        """
+        스크랩 시 호출되는 수집 함수 등록
+
+        collector()는 [(이름, 종류, 설명, [(레이블 dict, 값), ...]), ...]를 반환한다 (이름에는 접두사가 붙음).
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """Prometheus 텍스트 형식(0.0.4) 출력"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        # 같은 이름을 여러 수집 함수(시스템 인스턴스)가 내면 한 번만 선언
+        collected = {}
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception:
+                continue
+            for name, metric_type, help, samples in families:
+                family = collected.setdefault(PREFIX + name, (metric_type, help, []))
+                family[2].extend(samples)
+        for name, (metric_type, help, samples) in collected.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                lines.append(f"{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+POSTS = REGISTRY.counter('posts_total', 'Posts processed, by outcome (success/failed)', ('outcome',))
+RUNS = REGISTRY.counter('runs_total', 'run_blog_creation runs, by outcome', ('outcome',))
+LAST_RUN = REGISTRY.gauge('last_run_timestamp_seconds', 'Unix time when the last run finished')
+LAST_SUCCESS = REGISTRY.gauge('last_success_timestamp_seconds', 'Unix time of the last run that produced at least one post')
+STAGE_SECONDS = REGISTRY.histogram('stage_duration_seconds', 'Pipeline stage latency', ('stage',))
+CALL_SECONDS = REGISTRY.histogram('external_call_duration_seconds', 'Outbound call latency (http, browser, llm)', ('kind', 'call'))
+CALLS = REGISTRY.counter('external_calls_total', 'Outbound calls (Imagen, WordPress API, Telegram, browser jobs, Gemini), by outcome', ('kind', 'call', 'outcome'))
+LLM_TOKENS = REGISTRY.counter('llm_tokens_total', 'Gemini tokens, by call purpose and token type (prompt/response/cached)', ('purpose', 'type'))
+TRENDS_CACHE = REGISTRY.counter('trends_cache_lookups_total', 'Trend snapshot cache lookups, by state (fresh/stale/miss)', ('state',))
+
+
+def observe_span(span):
+    """끝난 트레이스 스팬(dict)을 지표에 반영 (Tracer 리스너)"""
+    seconds = (span.get('duration_ms') or 0) / 1000.0
+    name = span['name']
+    kind = span['kind']
+    outcome = span['outcome']
+
+    if kind == 'stage':
+        STAGE_SECONDS.observe(seconds, stage=name)
+    else:
+        CALL_SECONDS.observe(seconds, kind=kind, call=name)
+        CALLS.inc(kind=kind, call=name, outcome=outcome)
+
+    if name == 'create_post':
+        POSTS.inc(outcome='success' if outcome == 'ok' else 'failed')
+    elif name == 'run_blog_creation':
+        RUNS.inc(outcome=outcome)
+        finished = span.get('end') or time.time()
+        LAST_RUN.set(finished)
+        if outcome == 'ok' and span.get('attrs', {}).get('succeeded'):
+            LAST_SUCCESS.set(finished)
+
+
+def observe_llm_tokens(purpose, prompt_tokens=None, response_tokens=None, cached_tokens=None):
+    for token_type, value in (('prompt', prompt_tokens), ('response', response_tokens), ('cached', cached_tokens)):
+        if value:
+            LLM_TOKENS.inc(value, purpose=purpose, type=token_type)
+
+
+def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT, registry=None):
+    """
+    백그라운드 스레드에서 GET /metrics 제공 (http.server는 이때 import하여 시작 시간에 영향 없음)
+
+    Returns:
+        ThreadingHTTPServer: 종료 시 shutdown() 호출
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 스크랩 요청은 로그에 남기지 않음
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+블로그 포스트 카탈로그
+blog_posts/*.md 파일마다 경로, 작성 시각, 키워드, frontmatter의 제목/태그/카테고리, 크기, 내용 해시,
+WordPress 게시 ID/링크를 SQLite에 기록한다. save_blog_post가 저장할 때마다 한 줄씩 갱신하므로
+목록/개수/조회는 디렉토리를 훑거나 파일을 다시 읽지 않고 카탈로그에서 가져온다.
+
+파일을 직접 추가/수정/삭제했다면 reconcile()로 디렉토리와 맞춘다 (크기나 수정 시각이 바뀐 파일만 다시 읽음).
+
+실행: python post_catalog.py --reconcile
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# frontmatter 구분자: ---, –, — 또는 그 조합 (3개 이상)
+_FRONTMATTER = re.compile(r'^([-–—]{3,})\s*\n(.*?)\n\1', re.DOTALL)
+
+# 파일명 형식: 20250101_080000_키워드.md
+_FILENAME = re.compile(r'^(\d{8}_\d{6})_(.+)\.md$')
+
+_COLUMNS = ('filename', 'path', 'created_at', 'keyword', 'title', 'tags', 'categories', 'description',
+            'category', 'size', 'content_hash', 'mtime', 'wp_post_id', 'wp_url')
+
+
+def _strip_quotes(value):
+    return value.strip().strip('"').strip("'").strip()
+
+
+def _parse_list(value):
+    value = value.strip()
+    if value.startswith('[') and value.endswith(']'):
+        value = value[1:-1]
+    return [item for item in (_strip_quotes(part) for part in value.split(',')) if item]
+
+
+def parse_frontmatter(content):
+    """
+    frontmatter의 title, tags, categories, description 추출
+
+    Returns:
+        dict: {'title', 'tags', 'categories', 'description'} (없으면 title은 첫 # 헤더, 목록은 [])
+    """
+    meta = {'title': None, 'tags': [], 'categories': [], 'description': None}
+    match = _FRONTMATTER.match(content.strip())
+    if match:
+        current_list = None
+        for raw_line in match.group(2).split('\n'):
+            line = raw_line.strip()
+            if current_list is not None and line.startswith('-'):
+                item = _strip_quotes(line[1:])
+                if item:
+                    meta[current_list].append(item)
+                continue
+            current_list = None
+            if ':' not in line:
+                continue
+            key, value = line.split(':', 1)
+            key = key.strip()
+            if key in ('tags', 'categories'):
+                if value.strip():
+                    meta[key] = _parse_list(value)
+                else:
+                    # "tags:" 다음 줄부터 "- 항목" 형식
+                    current_list = key
+            elif key in ('title', 'description'):
+                meta[key] = _strip_quotes(value)
+
+    if not meta['title']:
+        for line in content.split('\n'):
+            if line.startswith('# '):
+                meta['title'] = line[2:].strip()
+                break
+    return meta
+
+
+def parse_filename(filename):
+    """
+    파일명에서 작성 시각과 키워드 추출
+
+    Returns:
+        tuple: (작성 시각(epoch) 또는 None, 키워드)
+    """
+    match = _FILENAME.match(filename)
+    if not match:
+        return None, filename[:-3] if filename.endswith('.md') else filename
+    try:
+        created_at = datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').timestamp()
+    except ValueError:
+        created_at = None
+    return created_at, match.group(2)
+
+
+class PostCatalog:
+    """
+    Args:
+        path: SQLite 파일 경로
+        posts_dir: 포스트 디렉토리
+        log: 로그 함수
+    """
+
+    def __init__(self, path='post_catalog.db', posts_dir='blog_posts', log=None):
+        self.path = path
+        self.posts_dir = posts_dir
+        self._log = log or (lambda message: None)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # 첫 사용 시 연결 (생성자는 파일 I/O 없이 가볍게 유지)
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            created = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts'"
+            ).fetchone() is None
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    filename TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    keyword TEXT,
+                    title TEXT,
+                    tags TEXT,
+                    categories TEXT,
+                    description TEXT,
+                    category TEXT,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    mtime REAL NOT NULL,
+                    wp_post_id INTEGER,
+                    wp_url TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_keyword ON posts(keyword)")
+            conn.commit()
+            self._conn = conn
+            if created:
+                # 카탈로그가 처음 만들어지면 기존 파일을 한 번 가져옴
+                result = self._reconcile(conn)
+                if result['added']:
+                    self._log(f"포스트 카탈로그 생성: 기존 포스트 {result['added']}개 등록 ({self.path})")
+        return self._conn
+
+    def _row_for(self, filepath, content, keyword=None, category=None, stat=None):
+        filename = os.path.basename(filepath)
+        stat = stat or os.stat(filepath)
+        created_at, parsed_keyword = parse_filename(filename)
+        meta = parse_frontmatter(content)
+        return {
+            'filename': filename,
+            'path': filepath,
+            'created_at': created_at or stat.st_mtime,
+            'keyword': keyword or parsed_keyword,
+            'title': meta['title'],
+            'tags': json.dumps(meta['tags'], ensure_ascii=False),
+            'categories': json.dumps(meta['categories'], ensure_ascii=False),
+            'description': meta['description'],
+            'category': category,
+            'size': stat.st_size,
+            'content_hash': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            'mtime': stat.st_mtime,
+        }
+
+    def _upsert(self, conn, row):
+        # WordPress 게시 정보와 분류 카테고리는 새 값이 없으면 유지
+        conn.execute("""
+            INSERT INTO posts (filename, path, created_at, keyword, title, tags, categories, description,
+                               category, size, content_hash, mtime)
+            VALUES (:filename, :path, :created_at, :keyword, :title, :tags, :categories, :description,
+                    :category, :size, :content_hash, :mtime)
+            ON CONFLICT(filename) DO UPDATE SET
+                path = excluded.path, created_at = excluded.created_at, keyword = excluded.keyword,
+                title = excluded.title, tags = excluded.tags, categories = excluded.categories,
+                description = excluded.description, category = COALESCE(excluded.category, category),
+                size = excluded.size, content_hash = excluded.content_hash, mtime = excluded.mtime
+        """, row)
+
+    def add(self, filepath, content, keyword=None, category=None):
+        """
+        저장한 포스트 등록 (save_blog_post에서 호출)
+
+        Returns:
+            dict: 등록된 항목
+        """
+        row = self._row_for(filepath, content, keyword=keyword, category=category)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._upsert(conn, row)
+        return self._decode(row)
+
+    def set_wp_post(self, filepath, post_id, url):
+        """WordPress 게시 ID/링크 기록"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("UPDATE posts SET wp_post_id = ?, wp_url = ? WHERE filename = ?",
+                             (post_id, url, os.path.basename(filepath)))
+
+    def remove(self, filepath):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM posts WHERE filename = ?", (os.path.basename(filepath),))
+
+    def get(self, filename):
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM posts WHERE filename = ?", (filename,)).fetchone()
+        return self._decode(row) if row else None
+
+    def list(self, limit=None, offset=0, keyword=None):
+        """
+        포스트 목록 (최신순)
+
+        Args:
+            keyword: 지정 시 해당 키워드의 포스트만
+        """
+        query = "SELECT * FROM posts"
+        params = []
+        if keyword is not None:
+            query += " WHERE keyword = ?"
+            params.append(keyword)
+        query += " ORDER BY created_at DESC, filename DESC"
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def reconcile(self):
+        """
+        디렉토리와 카탈로그 맞추기 (새 파일 등록, 크기/수정 시각이 바뀐 파일 갱신, 없어진 파일 삭제)
+
+        Returns:
+            dict: {'added', 'updated', 'removed', 'unchanged'}
+        """
+        with self._lock:
+            conn = self._connect()
+            return self._reconcile(conn)
+
+    def _reconcile(self, conn):
+        result = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        known = {row['filename']: (row['size'], row['mtime'])
+                 for row in conn.execute("SELECT filename, size, mtime FROM posts")}
+        on_disk = set()
+
+        if os.path.isdir(self.posts_dir):
+            with os.scandir(self.posts_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not entry.name.endswith('.md'):
+                        continue
+                    on_disk.add(entry.name)
+                    stat = entry.stat()
+                    previous = known.get(entry.name)
+                    if previous == (stat.st_size, stat.st_mtime):
+                        result['unchanged'] += 1
+                        continue
+                    try:
+                        with open(entry.path, 'r', encoding='utf-8') as f:
+                            content = f.read()
+                    except (OSError, UnicodeDecodeError) as e:
+                        self._log(f"포스트 카탈로그: {entry.name} 읽기 오류: {e}")
+                        continue
+                    path = os.path.join(self.posts_dir, entry.name)
+                    with conn:
+                        self._upsert(conn, self._row_for(path, content, stat=stat))
+                    result['updated' if previous else 'added'] += 1
+
+        missing = [filename for filename in known if filename not in on_disk]
+        if missing:
+            with conn:
+                conn.executemany("DELETE FROM posts WHERE filename = ?", [(filename,) for filename in missing])
+        result['removed'] = len(missing)
+        return result
+
+    @staticmethod
+    def _decode(row):
+        entry = {key: row[key] for key in _COLUMNS if key in row.keys()} if isinstance(row, sqlite3.Row) else dict(row)
+        for key in ('tags', 'categories'):
+            try:
+                entry[key] = json.loads(entry.get(key) or '[]')
+            except ValueError:
+                entry[key] = []
+        entry.setdefault('wp_post_id', None)
+        entry.setdefault('wp_url', None)
+        return entry
+
+
+def main():
+    """카탈로그 재구성/조회 CLI (system_config.json의 post_catalog 설정 사용)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Blog post catalog')
+    parser.add_argument('--reconcile', action='store_true', help='Sync the catalog with the files in blog_posts/')
+    parser.add_argument('--rebuild', action='store_true', help='Drop the catalog and rebuild it from disk (WordPress links are lost)')
+    parser.add_argument('--list', type=int, default=0, metavar='N', help='Print the N most recent posts')
+    args = parser.parse_args()
+
+    config = {}
+    if os.path.exists('system_config.json'):
+        with open('system_config.json', 'r', encoding='utf-8') as f:
+            config = json.load(f).get('post_catalog', {})
+    path = config.get('path', 'post_catalog.db')
+
+    if args.rebuild and os.path.exists(path):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    catalog = PostCatalog(path=path, log=print)
+    started = time.perf_counter()
+    if args.reconcile or args.rebuild:
+        result = catalog.reconcile()
+        print(f"추가 {result['added']}개, 갱신 {result['updated']}개, 삭제 {result['removed']}개, "
+              f"변경 없음 {result['unchanged']}개 ({time.perf_counter() - started:.2f}초)")
+    print(f"카탈로그 포스트 수: {catalog.count()}")
+    for post in catalog.list(limit=args.list) if args.list else []:
+        created = datetime.fromtimestamp(post['created_at']).strftime('%Y-%m-%d %H:%M')
+        print(f"{created}  {post['keyword']}  {post['title'] or '-'}  {post['wp_url'] or ''}")
+
+
+if __name__ == '__main__':
+    main()
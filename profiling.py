@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+파이프라인 1회 실행 프로파일링
+run_blog_creation 한 번을 프로파일러 아래에서 실행하고 실행 ID(트레이스 run_id) 이름으로 산출물을 저장한다.
+
+    {run_id}.pstats      cProfile 통계 (python -m pstats, snakeviz 등으로 열기)
+    {run_id}.collapsed   샘플링한 호출 스택 ("스레드;함수;함수 횟수", flamegraph.pl / speedscope 입력)
+    {run_id}.memory.txt  tracemalloc 최고점 부근 스냅샷의 상위 할당 위치
+    {run_id}.json        요약 (모드, 소요 시간, 샘플 수, 메모리 최고점, 상위 함수, 생성된 포스트)
+
+cProfile은 스레드별로 동작하므로 프로파일링 중 시작된 research/batch 작업 스레드에는
+threading.setprofile로 스레드 전용 프로파일러를 붙이고, 끝나면 모두 합쳐 하나의 pstats로 저장한다.
+브라우저 풀 등 실행 후에도 남는 스레드는 프로파일러를 해제할 수 없어 제외하며, 샘플링 스택에는 포함된다.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+MODES = ('deterministic', 'sampling')
+
+# 스레드 전용 cProfile을 붙일 스레드 이름 접두사 (실행이 끝나면 종료되는 작업 스레드)
+PROFILED_THREAD_PREFIXES = ('research', 'batch', 'ThreadPoolExecutor')
+
+
+class Profiler:
+    """
+    cProfile + 스택 샘플러 + tracemalloc 최고점 스냅샷
+
+    Args:
+        mode: 'deterministic'(cProfile + 샘플링) 또는 'sampling'(샘플링만, pstats 없음, 오버헤드 적음)
+        interval: 스택 샘플링 간격 (초)
+        memory: True면 tracemalloc으로 메모리 최고점 스냅샷 기록
+        max_depth: 샘플링 스택 최대 깊이
+    """
+
+    def __init__(self, mode='deterministic', interval=0.005, memory=True, max_depth=80):
+        if mode not in MODES:
+            raise ValueError(f"알 수 없는 프로파일링 모드: {mode} (가능: {', '.join(MODES)})")
+        self.mode = mode
+        self.interval = interval
+        self.memory = memory
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._profile = None
+        self._thread_profiles = []
+        self._stacks = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._sampler = None
+        self._snapshot = None
+        self._snapshot_size = 0
+        self._snapshot_at = 0.0
+        self._started_tracemalloc = False
+        self.peak_bytes = 0
+        self.started = None
+        self.elapsed = None
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            # 할당 위치(파일:줄)만 필요하므로 프레임 1개만 기록 (스냅샷 비용 최소화)
+            tracemalloc.start(1)
+            self._started_tracemalloc = True
+        if self.memory:
+            tracemalloc.reset_peak()
+
+        self._sampler = threading.Thread(target=self._sample_loop, name='profiler-sampler', daemon=True)
+        self._sampler.start()
+
+        if self.mode == 'deterministic':
+            threading.setprofile(self._attach_thread_profile)
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.started
+        if self._profile is not None:
+            self._profile.disable()
+            threading.setprofile(None)
+
+        self._stop.set()
+        self._sampler.join()
+
+        if self.memory:
+            self._take_snapshot(tracemalloc.get_traced_memory()[0])
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    def _attach_thread_profile(self, frame, event, arg):
+        """새 스레드의 첫 프로파일 이벤트에서 호출됨 (작업 스레드면 전용 cProfile 시작)"""
+        sys.setprofile(None)
+        if not threading.current_thread().name.startswith(PROFILED_THREAD_PREFIXES):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: 다른 프로파일러가 이미 활성화됨 (메인 프로파일러가 모든 스레드를 기록)
+            return
+        with self._lock:
+            self._thread_profiles.append(profile)
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self._stacks[';'.join(reversed(stack))] += 1
+            self._samples += 1
+
+            if self.memory:
+                current = tracemalloc.get_traced_memory()[0]
+                # 직전 스냅샷보다 10% 이상 늘었을 때만, 최대 초당 1회 다시 찍음 (스냅샷 비용이 큼)
+                if current > self._snapshot_size * 1.1 and time.perf_counter() - self._snapshot_at >= 1.0:
+                    self._take_snapshot(current)
+
+    def _take_snapshot(self, size):
+        if size < self._snapshot_size:
+            return
+        self._snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        self._snapshot_size = size
+        self._snapshot_at = time.perf_counter()
+
+    def stats(self):
+        """합쳐진 pstats.Stats (sampling 모드면 None)"""
+        if self._profile is None:
+            return None
+        stats = pstats.Stats(self._profile)
+        with self._lock:
+            for profile in self._thread_profiles:
+                try:
+                    stats.add(profile)
+                except TypeError:
+                    # 기록된 호출이 없는 스레드
+                    continue
+        return stats
+
+    def top_functions(self, stats, limit=20):
+        """누적 시간 상위 함수 목록"""
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                'function': f"{name} ({os.path.basename(filename)}:{line})",
+                'calls': calls,
+                'tottime_s': round(tottime, 4),
+                'cumtime_s': round(cumtime, 4),
+            })
+        rows.sort(key=lambda row: row['cumtime_s'], reverse=True)
+        return rows[:limit]
+
+    def write(self, directory, run_id, extra=None, top=40):
+        """
+        산출물 저장
+
+        Returns:
+            dict: {'pstats', 'collapsed', 'memory', 'summary'} 경로 (만들지 않은 항목은 None)
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, run_id)
+        paths = {'pstats': None, 'collapsed': None, 'memory': None, 'summary': base + '.json'}
+        summary = {
+            'run_id': run_id,
+            'mode': self.mode,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'interval_ms': round(self.interval * 1000, 2),
+            'samples': self._samples,
+            'profiled_threads': len(self._thread_profiles) + (1 if self._profile else 0),
+        }
+
+        stats = self.stats()
+        if stats is not None:
+            paths['pstats'] = base + '.pstats'
+            stats.dump_stats(paths['pstats'])
+            summary['top_functions'] = self.top_functions(stats, limit=top)
+
+        paths['collapsed'] = base + '.collapsed'
+        with open(paths['collapsed'], 'w', encoding='utf-8') as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        if self.memory and self._snapshot is not None:
+            paths['memory'] = base + '.memory.txt'
+            top_stats = self._snapshot.statistics('lineno')
+            summary['memory'] = {
+                'peak_mb': round(self.peak_bytes / (1024 * 1024), 2),
+                'snapshot_mb': round(self._snapshot_size / (1024 * 1024), 2),
+            }
+            buffer = io.StringIO()
+            buffer.write(f"# tracemalloc 최고점 {summary['memory']['peak_mb']} MB, "
+                         f"스냅샷 시점 {summary['memory']['snapshot_mb']} MB\n")
+            for stat in top_stats[:top]:
+                buffer.write(f"{stat}\n")
+            with open(paths['memory'], 'w', encoding='utf-8') as f:
+                f.write(buffer.getvalue())
+
+        summary.update(extra or {})
+        summary['artifacts'] = {key: os.path.basename(path) for key, path in paths.items() if path}
+        with open(paths['summary'], 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+        return paths
+
+
+def load_summary(path):
+    """요약 JSON 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def recent_profiles(directory, limit=20):
+    """최근 프로파일 요약 목록 (최신순)"""
+    if not os.path.isdir(directory):
+        return []
+    files = [os.path.join(directory, name) for name in os.listdir(directory)
+             if name.endswith('.json')]
+    files.sort(key=os.path.getmtime, reverse=True)
+    summaries = []
+    for path in files[:limit]:
+        try:
+            summaries.append(load_summary(path))
+        except (OSError, ValueError):
+            continue
+    return summaries
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+프롬프트 크기 예산 및 Gemini 호출 계측
+프롬프트 구간별 토큰 수를 추정하고, 참고 뉴스를 예산에 맞게 줄인다.
+호출별 프롬프트/응답 토큰 수와 지연 시간은 JSONL 파일에 기록하여 max_news 등의 조정 근거로 사용한다.
+"""
+import json
+import math
+import threading
+import time
+
+
+def count_tokens(text):
+    """
+    토큰 수 추정 (API 호출 없이 문자 종류로 근사)
+    ASCII는 약 4자당 1토큰, 한글 등 그 외 문자는 약 1.5자당 1토큰으로 계산한다.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return max(1, math.ceil(ascii_chars / 4 + other_chars / 1.5))
+
+
+def _trim_text(text, max_chars):
+    """문장 경계를 우선하여 max_chars 이내로 자르기"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    for mark in ('. ', '! ', '? ', '。'):
+        idx = cut.rfind(mark)
+        if idx >= max_chars // 2:
+            return cut[:idx + 1].rstrip() + ' …'
+    return cut.rstrip() + ' …'
+
+
+def format_news_line(idx, item, max_summary_chars=None):
+    summary = item.get('summary', '')
+    if max_summary_chars is not None:
+        summary = _trim_text(summary, max_summary_chars)
+    return f"{idx}. {item['title']} ({item.get('source', '')}): {summary}\n"
+
+
+def fit_news_items(news_items, budget_tokens, max_summary_chars=300, min_summary_chars=60):
+    """
+    참고 뉴스 요약 텍스트를 토큰 예산에 맞게 구성
+
+    1) 각 요약을 max_summary_chars 이내로 자르고
+    2) 예산을 넘으면 요약 길이를 min_summary_chars까지 단계적으로 줄이고
+    3) 그래도 넘으면 순위가 낮은 뉴스부터 제외한다 (최소 1개는 유지)
+
+    Args:
+        news_items: [{'title', 'summary', 'source', ...}, ...] (관련도 순)
+        budget_tokens: 뉴스 구간에 허용할 토큰 수
+        max_summary_chars: 요약 최대 길이
+        min_summary_chars: 줄일 수 있는 요약 최소 길이
+
+    Returns:
+        tuple: (뉴스 요약 텍스트, 프롬프트에 포함된 뉴스 수, 통계 dict)
+    """
+    original = ''.join(format_news_line(idx, item) for idx, item in enumerate(news_items, 1))
+    stats = {
+        'news_available': len(news_items),
+        'news_tokens_original': count_tokens(original),
+        'budget_tokens': budget_tokens,
+    }
+
+    items = list(news_items)
+    summary_chars = max_summary_chars
+    while True:
+        text = ''.join(format_news_line(idx, item, summary_chars) for idx, item in enumerate(items, 1))
+        tokens = count_tokens(text)
+        if tokens <= budget_tokens:
+            break
+        if summary_chars > min_summary_chars:
+            summary_chars = max(min_summary_chars, int(summary_chars * 0.7))
+        elif len(items) > 1:
+            items.pop()
+        else:
+            break
+
+    stats.update({
+        'news_used': len(items),
+        'news_tokens': tokens,
+        'summary_chars': summary_chars,
+        'trimmed': text != original,
+    })
+    return text.rstrip('\n'), len(items), stats
+
+
+class MetricsLog:
+    """
+    Gemini 호출 계측 기록 (JSONL, 스레드 안전)
+
+    Args:
+        path: 기록 파일 경로 (None이면 기록하지 않음)
+    """
+
+    def __init__(self, path='llm_metrics.jsonl'):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, event, **fields):
+        if not self.path:
+            return
+        entry = {'ts': round(time.time(), 3), 'event': event, **fields}
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+            except OSError:
+                pass
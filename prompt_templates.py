@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+"""
+프롬프트 템플릿 레지스트리
+Gemini 프롬프트를 string.Template으로 한 번만 로드하고, 고정 지침은 (페르소나, 카테고리)별로
+미리 조립해 둔 뒤 요청마다 바뀌는 값만 치환한다.
+로드 시 모든 템플릿의 자리표시자를 검사하며, 템플릿 원문 전체의 해시를 버전으로 사용한다.
+"""
+import hashlib
+import json
+from string import Template
+
+
+class PromptTemplateError(ValueError):
+    """템플릿의 자리표시자 누락/오타 또는 페르소나/카테고리 누락"""
+
+
+class RenderedPrompt(str):
+    """렌더링된 프롬프트 (문자열과 동일하게 사용하며 템플릿 버전 해시를 함께 가짐)"""
+
+    def __new__(cls, text, version):
+        prompt = super().__new__(cls, text)
+        prompt.version = version
+        return prompt
+
+
+# 키워드 세부 카테고리 (분류 프롬프트 및 결과 검증에 공통 사용)
+CATEGORY_DESCRIPTIONS = [
+    ('SPORTS_MATCH', '경기 일정, 결과, 중계 정보'),
+    ('SPORTS_GENERAL', '선수 이적, 부상, 팀 이슈, 일반 스포츠 뉴스'),
+    ('STOCK', '개별 주식 종목, 기업 실적, 공시'),
+    ('ECONOMY', '거시 경제, 부동산, 정책, 환율, 금리'),
+    ('SOCIAL_ISSUE', '사회적 논란, 쟁점, 찬반 토론'),
+    ('SOCIAL_INCIDENT', '사건, 사고, 재해, 팩트 중심'),
+    ('POLITICS', '정치, 선거, 정당, 법안'),
+    ('ENTERTAINMENT_NEWS', '연예인 가십, 열애, 사건, 근황'),
+    ('ENTERTAINMENT_CONTENT', '드라마, 영화, 웹툰, 방송 프로그램 리뷰/정보'),
+    ('TECH_DEVICE', '스마트폰, 가전, 하드웨어 스펙/비교'),
+    ('TECH_TREND', 'IT 서비스, AI, 플랫폼, 소프트웨어 트렌드'),
+    ('HEALTH', '건강 정보, 질병, 운동, 의학'),
+    ('LIVING_INFO', '생활 꿀팁, 날씨, 여행, 요리, 쇼핑 정보'),
+    ('OTHER', '그 외 분류하기 어려운 일반 정보'),
+]
+VALID_CATEGORIES = [name for name, _ in CATEGORY_DESCRIPTIONS]
+
+DEFAULT_PERSONA = 'friendly'
+DEFAULT_CATEGORY = 'OTHER'
+
+# 페르소나별 글쓰기 지침
+PERSONA_INSTRUCTIONS = {
+    'friendly': """\
+[Persona: Friendly (친근한 이웃형)]
+- 말투: 다정하고 친근한 '해요체'를 사용하세요. 가끔 이모지(😊, ✨ 등)를 적절히 섞어주세요.
+- 어조: 친구에게 이야기하듯 편안하면서도 유익한 정보를 전달하는 따뜻한 목소리입니다.
+- 특징: 독자의 공감을 이끌어내는 문구(예: "여러분도 궁금하셨죠?", "정말 놀랍지 않나요?")를 포함합니다.
+""",
+    'professional': """\
+[Persona: Professional (전문가형)]
+- 말투: 신뢰감 있고 깔끔한 '하십시오체' 또는 단정한 '해요체'를 사용하십시오.
+- 어조: 객관적이고 권위 있는 정보를 전달하는 전문가의 목소리를 유지하십시오.
+- 특징: 불필요한 수식어를 줄이고, 정확한 용어와 논리적인 구조로 독자의 이해를 돕습니다.
+""",
+    'analytical': """\
+[Persona: Analytical (분석가형)]
+- 말투: 논리적이고 객관적인 어조를 사용하십시오. (~입니다, ~함)
+- 어조: 현상의 이면을 분석하고 데이터나 근거를 바탕으로 다각도의 시각을 제공하십시오.
+- 특징: 단순 정보 전달을 넘어 '왜' 이런 일이 일어났는지, 앞으로 어떤 영향을 미칠지에 집중합니다.
+""",
+}
+
+# 카테고리별 작성 지침 ([키워드]/[작성 기준일]은 요청 끝의 가변 부분에서 주어짐)
+CATEGORY_INSTRUCTIONS = {
+    'SPORTS_MATCH': """\
+[키워드]에 대한 스포츠 경기 프리뷰 또는 리뷰를 작성해줘.
+
+[상황 판단 (현재: [작성 기준일])]
+뉴스 데이터를 바탕으로 경기가 '예정'인지 '종료'인지 파악하여 작성.
+
+A. 예정된 경기:
+   - 일정(한국 시간), 장소
+   - **중계 채널 및 시청 방법** (가장 중요하게 다룸)
+   - 양팀 전력/상대 전적/관전 포인트
+
+B. 종료된 경기:
+   - **스코어 및 경기 결과**
+   - 주요 하이라이트 장면 설명
+   - 승패 요인 분석 및 선수 활약상
+   - 다음 일정
+""",
+    'SPORTS_GENERAL': """\
+[키워드]에 대한 스포츠 이슈/선수 정보를 작성해줘.
+
+[필수 포함 내용]
+- 이슈의 핵심 내용 (이적, 부상, 기록 달성 등)
+- 해당 선수의 최근 활약상 또는 팀 분위기
+- 팬들의 반응 및 전문가 의견
+- 향후 예상되는 시나리오
+""",
+    'STOCK': """\
+[키워드] 주가 흐름 및 기업 이슈 분석 글을 작성해줘.
+
+[필수 포함 내용]
+- 현재 주가 동향 및 최근 흐름
+- **상승/하락의 구체적 원인** (호재/악재, 실적, 공시)
+- 증권가 목표가 리포트 및 투자 의견 요약
+- 향후 주가 전망 및 체크포인트
+
+* 주의: "무조건 사라/팔라"는 식의 조언 금지. 객관적 정보 위주.
+""",
+    'ECONOMY': """\
+[키워드] 관련 경제/정책 이슈 해설 글을 작성해줘.
+
+[필수 포함 내용]
+- 이슈 개요 및 배경 설명 (초보자도 이해하기 쉽게)
+- 이것이 우리 삶/경제에 미치는 영향
+- 찬반 의견이나 다양한 시각
+- 요약 및 시사점
+""",
+    'SOCIAL_ISSUE': """\
+[키워드] 관련 사회적 이슈/논란 정리 글을 작성해줘.
+
+[필수 포함 내용]
+- 논란의 발단 및 핵심 쟁점
+- 각계의 입장 (찬성 vs 반대, 혹은 A측 vs B측)
+- 대중의 반응 (커뮤니티, 댓글 분위기 등)
+- 시사하는 바 및 향후 전개 예상
+""",
+    'SOCIAL_INCIDENT': """\
+[키워드] 사건/사고 종합 정리 글을 작성해줘.
+
+[필수 포함 내용]
+- 사건 발생 일시, 장소, 경위 (육하원칙)
+- 현재까지의 수사/진행 상황
+- 피해 규모 또는 사회적 파장
+- 관련 주의사항 (유사 피해 방지 등)
+""",
+    'POLITICS': """\
+[키워드] 관련 정치 이슈 브리핑을 작성해줘.
+
+[필수 포함 내용]
+- 이슈의 핵심 내용 및 팩트
+- 여/야 혹은 관련 정치인들의 발언 및 입장 차이
+- 이번 사안이 갖는 정치적 의미
+- 향후 일정 및 예상 시나리오
+
+* 최대한 중립적이고 객관적인 톤 유지.
+""",
+    'ENTERTAINMENT_NEWS': """\
+[키워드] 관련 연예계 소식을 정리해줘.
+
+[필수 포함 내용]
+- 무슨 일이 있었는지 상세 내용 (기사 내용 기반)
+- 소속사 공식 입장 혹은 본인 해명
+- 네티즌/팬들의 반응
+- 과거 유사 사례 혹은 배경 지식
+""",
+    'ENTERTAINMENT_CONTENT': """\
+[키워드] (드라마/영화/방송) 프리뷰 또는 리뷰를 작성해줘.
+
+[필수 포함 내용]
+- 기본 정보 (출연진, 줄거리, 방영시간/개봉일)
+- 관전 포인트 혹은 감상 포인트 (재미 요소)
+- 시청률/관객수 추이 및 반응
+- (종영/결말인 경우) 결말 요약 및 해석
+""",
+    'TECH_DEVICE': """\
+[키워드] 제품에 대한 스펙/정보 리뷰를 작성해줘.
+
+[필수 포함 내용]
+- 주요 스펙 및 디자인 특징
+- 전작 대비 달라진 점 (Upgrades)
+- 장점 및 단점 (비판적 시각 포함)
+- 출시일, 가격, 구매 정보
+""",
+    'TECH_TREND': """\
+[키워드] 관련 IT/테크 트렌드 분석 글을 작성해줘.
+
+[필수 포함 내용]
+- 기술/서비스의 개념 정의
+- 최근 화제가 된 이유 (새로운 기능, 업데이트 등)
+- 업계 동향 및 경쟁사 상황
+- 향후 전망 및 사용자에게 미치는 영향
+""",
+    'HEALTH': """\
+[키워드] 관련 건강/의학 정보를 작성해줘.
+
+[필수 포함 내용]
+- 증상 및 원인 설명
+- 치료 방법 및 예방 수칙
+- 좋은 음식/나쁜 음식 혹은 생활 습관
+- 전문가 조언 (뉴스 기반)
+""",
+    'LIVING_INFO': """\
+[키워드] 관련 생활 꿀팁/정보를 작성해줘.
+
+[필수 포함 내용]
+- 이게 왜 필요한지/무엇인지 (관심 유발)
+- 구체적인 정보 (날씨라면 예보, 축제라면 일정/장소, 요리라면 레시피)
+- 이용 꿀팁 및 주의사항
+- 요약
+""",
+    'OTHER': """\
+[키워드]에 대해 정보를 찾는 사용자를 위한 친절한 설명 글을 작성해줘.
+
+[작성 포인트]
+- [키워드]의 정의 및 핵심 개요
+- 최근 이슈가 된 이유 (있다면)
+- 사람들이 궁금해할 만한 3가지 포인트
+- 결론 및 요약
+""",
+}
+
+FACT_CHECK_INSTRUCTION = """\
+[Fact-Check 및 정보 통합 지침]
+- 제공된 여러 뉴스 항목(요청 끝 [참고 뉴스]에 개수 표시)을 면밀히 비교하여 공통된 핵심 사실을 추출하십시오.
+- 뉴스 간에 내용이 상충되는 경우, 가장 최신의 정보이거나 더 구체적인 보도를 우선시하되, 불확실한 부분은 '~라고 전해졌습니다'와 같은 신중한 표현을 사용하십시오.
+- 단순히 기사를 나열하지 말고, 전체적인 맥락을 파악하여 하나의 완성된 스토리로 재구성하십시오.
+"""
+
+# 본문 고정 지침 ((페르소나, 카테고리)별로 미리 조립되어 컨텍스트 캐시에 등록됨)
+ARTICLE_PREFIX = """\
+$category_instruction
+
+이 글은 반드시 'front-matter + 본문'을 함께 생성해야 하며,
+front-matter의 성격은 본문 내용과 정확히 일치해야 한다.
+
+$persona_instruction
+
+$fact_check_instruction
+
+[Front-matter 작성 규칙]
+**중요: 반드시 아래 형식을 정확히 따라야 합니다!**
+
+예시:
+---
+title: '제목은 여기에'
+categories: [정보, 분석]
+tags: ['태그1', '태그2', '태그3']
+description: 메타 설명은 여기에
+---
+
+**주의사항:**
+- 시작과 끝 모두 정확히 `---` (하이픈 3개)를 사용해야 합니다
+- `--` (하이픈 2개)는 절대 사용하지 마세요
+- frontmatter를 ```markdown 코드 블록으로 감싸지 마세요
+- frontmatter 다음에는 반드시 빈 줄을 하나 넣으세요
+- title: '[키워드]' + (카테고리별 특성에 맞는 매력적인 제목)
+- categories: 반드시 [정보, 분석, 후기] 등 적절한 것 선택 (트렌드 사용 금지)
+- tags: ['[키워드]', 관련태그1, 관련태그2]
+- description: 글의 핵심 내용을 요약한 메타 설명
+
+[공통 작성 원칙]
+- 지침의 [키워드]와 [작성 기준일]은 요청 끝에 주어진 실제 값으로 바꿔 쓰십시오
+- 가독성을 위해 적절한 소헤더와 불렛 포인트 사용
+- '최신', '트렌드' 같은 단어 남발 금지
+- Markdown 형식 준수
+"""
+
+# 본문 가변 부분 (요청마다 치환)
+ARTICLE_TAIL = """\
+[키워드] : $keyword
+[작성 기준일] : $date
+
+[참고 뉴스] ($news_count개)
+$news_summary
+"""
+
+# 기존 글과 본문이 거의 같아 다시 생성할 때 가변 부분 뒤에 덧붙이는 지침
+ARTICLE_REWRITE = """\
+[중복 회피]
+이전에 작성된 글 '$title' (키워드: $matched_keyword)과 본문이 거의 같습니다 (유사도 $similarity).
+같은 참고 뉴스를 쓰더라도 위 글이 다루지 않은 관점(배경, 영향, 전망, 실용 정보 등)을 중심으로
+제목, 소제목 구성, 문장을 새로 작성하고 위 글의 표현을 그대로 반복하지 마십시오.
+"""
+
+# 키워드 하나의 카테고리 분석
+CATEGORY_ANALYSIS = """\
+다음 키워드를 분석하여 아래 세부 카테고리 중 하나로 분류하고, 글의 핵심 포커스를 한 문장으로 요약해줘.
+
+[키워드] : $keyword
+
+[세부 카테고리]
+$category_list
+
+[응답 형식]
+Category: [카테고리명]
+Focus: [핵심 포커스]
+"""
+
+# 키워드 목록 일괄 분류 (JSON 응답)
+KEYWORD_CLASSIFICATION = """\
+다음 키워드 각각을 아래 세부 카테고리 중 하나로 분류하고, 글의 핵심 포커스를 한 문장으로 요약해줘.
+
+[키워드 목록 (JSON)]
+$keywords_json
+
+[세부 카테고리]
+$category_list
+
+[응답 형식]
+키워드 목록의 모든 키워드에 대해 아래 형식의 JSON 배열만 출력하십시오.
+[{"keyword": "키워드", "category": "카테고리명", "focus": "핵심 포커스"}]
+"""
+
+# 템플릿 이름별 (원문, 필요한 자리표시자)
+TEMPLATE_SOURCES = {
+    'article_prefix': (ARTICLE_PREFIX, {'category_instruction', 'persona_instruction', 'fact_check_instruction'}),
+    'article_tail': (ARTICLE_TAIL, {'keyword', 'date', 'news_count', 'news_summary'}),
+    'article_rewrite': (ARTICLE_REWRITE, {'title', 'matched_keyword', 'similarity'}),
+    'category_analysis': (CATEGORY_ANALYSIS, {'keyword', 'category_list'}),
+    'keyword_classification': (KEYWORD_CLASSIFICATION, {'keywords_json', 'category_list'}),
+}
+
+
+def _placeholders(template):
+    """Template 원문의 자리표시자 이름 집합 (잘못된 '$' 사용은 오류)"""
+    names = set()
+    for match in template.pattern.finditer(template.template):
+        if match.group('invalid') is not None:
+            line = template.template[:match.start()].count('\n') + 1
+            raise PromptTemplateError(f"잘못된 '$' 사용 ({line}번째 줄)")
+        name = match.group('named') or match.group('braced')
+        if name:
+            names.add(name)
+    return names
+
+
+class PromptRegistry:
+    """
+    컴파일된 프롬프트 템플릿 모음
+
+    생성 시 모든 템플릿을 검사하고, (페르소나, 카테고리)별 고정 지침을 미리 조립한다.
+    렌더링 결과는 RenderedPrompt로 반환되며 version 속성에 템플릿 버전 해시를 가진다.
+    """
+
+    def __init__(self, personas=None, categories=None, sources=None):
+        self.personas = dict(personas or PERSONA_INSTRUCTIONS)
+        self.categories = dict(categories or CATEGORY_INSTRUCTIONS)
+        sources = dict(sources or TEMPLATE_SOURCES)
+
+        self._templates = {}
+        for name, (text, required) in sources.items():
+            template = Template(text)
+            found = _placeholders(template)
+            missing = required - found
+            unknown = found - required
+            if missing or unknown:
+                raise PromptTemplateError(
+                    f"템플릿 '{name}' 자리표시자 오류 - 누락: {sorted(missing)}, 알 수 없음: {sorted(unknown)}"
+                )
+            self._templates[name] = template
+
+        missing_categories = set(VALID_CATEGORIES) - set(self.categories)
+        if missing_categories:
+            raise PromptTemplateError(f"카테고리 지침 누락: {sorted(missing_categories)}")
+        if DEFAULT_PERSONA not in self.personas:
+            raise PromptTemplateError(f"기본 페르소나 지침 누락: {DEFAULT_PERSONA}")
+
+        # 템플릿 원문 전체의 해시 (응답 캐시 키 등에 사용)
+        digest = hashlib.sha256()
+        for part in (self.personas, self.categories, {k: v[0] for k, v in sources.items()}, FACT_CHECK_INSTRUCTION):
+            digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        self.version = digest.hexdigest()[:12]
+
+        self.category_list = "\n".join(
+            f"{idx}. {name} ({description})" for idx, (name, description) in enumerate(CATEGORY_DESCRIPTIONS, 1)
+        )
+
+        # 고정 지침 미리 조립 (요청 시에는 dict 조회만 수행)
+        prefix_template = self._templates['article_prefix']
+        self._prefixes = {
+            (persona, category): RenderedPrompt(prefix_template.substitute(
+                category_instruction=category_text,
+                persona_instruction=persona_text,
+                fact_check_instruction=FACT_CHECK_INSTRUCTION
+            ), self.version)
+            for persona, persona_text in self.personas.items()
+            for category, category_text in self.categories.items()
+        }
+
+    def article_prefix(self, persona, category):
+        """(페르소나, 카테고리)별 고정 지침 (알 수 없는 값은 기본 페르소나/OTHER로 대체)"""
+        persona = persona if persona in self.personas else DEFAULT_PERSONA
+        category = category if category in self.categories else DEFAULT_CATEGORY
+        return self._prefixes[(persona, category)]
+
+    def render(self, name, **fields):
+        """이름으로 템플릿 렌더링 (자리표시자가 빠지면 KeyError)"""
+        return RenderedPrompt(self._templates[name].substitute(**fields), self.version)
+
+    def article_tail(self, keyword, date, news_count, news_summary):
+        return self.render('article_tail', keyword=keyword, date=date, news_count=news_count, news_summary=news_summary)
+
+    def article_rewrite(self, title, matched_keyword, similarity):
+        return self.render('article_rewrite', title=title, matched_keyword=matched_keyword, similarity=similarity)
+
+    def category_analysis(self, keyword):
+        return self.render('category_analysis', keyword=keyword, category_list=self.category_list)
+
+    def keyword_classification(self, keywords):
+        return self.render(
+            'keyword_classification',
+            keywords_json=json.dumps(list(keywords), ensure_ascii=False),
+            category_list=self.category_list
+        )
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Gemini/Imagen 호출용 클라이언트 측 속도 제한
+모델별 토큰 버킷(분당 요청 수, 분당 토큰 수)과 동시 호출 수 제한을 프로세스 전체에서 공유하고,
+429/5xx 오류는 서버가 알려준 재시도 시간(Retry-After, retry_delay)을 우선하여
+지터가 섞인 지수 백오프로 재시도한다.
+"""
+import random
+import re
+import threading
+import time
+
+# 재시도할 HTTP 상태 코드 (할당량 초과 및 일시적 서버 오류)
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 오류 메시지의 재시도 힌트 ("retry_delay { seconds: 27 }", "Please retry in 27.3s")
+_RETRY_HINT_PATTERNS = [
+    re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)'),
+    re.compile(r'retry in\s+([\d.]+)\s*s', re.IGNORECASE),
+]
+
+
+class RetryableError(Exception):
+    """재시도 가능한 오류 (HTTP 응답 상태 코드 기반 호출에서 사용)"""
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    분당 용량을 일정한 속도로 채우는 토큰 버킷
+
+    Args:
+        per_minute: 분당 허용량 (버킷 용량)
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """
+        amount만큼 차감 (부족하면 채워질 때까지 대기)
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        # 용량보다 큰 요청은 용량만큼만 기다린 뒤 부채로 남김
+        amount = float(amount)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    return waited
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def adjust(self, amount):
+        """실제 사용량 반영 (양수면 추가 차감, 음수면 환급)"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """
+    모델 하나에 대한 요청/토큰 속도 및 동시 호출 수 제한
+
+    Args:
+        name: 모델 이름
+        rpm: 분당 최대 요청 수 (None이면 제한 없음)
+        tpm: 분당 최대 토큰 수 (None이면 제한 없음)
+        max_concurrent: 동시 호출 최대 수 (None이면 제한 없음)
+    """
+
+    def __init__(self, name, rpm=None, tpm=None, max_concurrent=None):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._stats_lock = threading.Lock()
+        self._stats = {'calls': 0, 'retries': 0, 'failures': 0, 'wait_time': 0.0}
+
+    def acquire(self, estimated_tokens=0):
+        """호출 전 속도 제한 통과 대기 (동시 호출 슬롯 포함)"""
+        waited = 0.0
+        if self.requests:
+            waited += self.requests.acquire(1)
+        if self.tokens and estimated_tokens:
+            waited += self.tokens.acquire(estimated_tokens)
+        if self._slots:
+            started = time.monotonic()
+            self._slots.acquire()
+            waited += time.monotonic() - started
+        if waited:
+            self._bump('wait_time', waited)
+        return waited
+
+    def release(self):
+        if self._slots:
+            self._slots.release()
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """호출 후 실제 토큰 사용량으로 분당 토큰 버킷 보정"""
+        if self.tokens and actual_tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['wait_time'] = round(stats['wait_time'], 3)
+        return stats
+
+    def _bump(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name, rpm=None, tpm=None, max_concurrent=None):
+    """
+    모델 이름별 공유 RateLimiter 반환 (같은 프로세스의 모든 시스템 인스턴스가 공유)
+    처음 생성될 때의 설정이 사용된다.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(name, rpm=rpm, tpm=tpm, max_concurrent=max_concurrent)
+            _limiters[name] = limiter
+        return limiter
+
+
+def limiter_stats():
+    """모델별 호출/재시도/대기 시간 통계"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+def status_code_of(error):
+    """예외의 HTTP 상태 코드 (google.api_core 예외의 code 또는 RetryableError.status_code)"""
+    code = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+    if callable(code):
+        # grpc 예외는 code()가 메서드
+        return None
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    if isinstance(error, RetryableError):
+        return True
+    return status_code_of(error) in RETRYABLE_STATUS_CODES
+
+
+def retry_hint(error):
+    """서버가 알려준 재시도 대기 시간(초) 또는 None"""
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is not None:
+        return retry_after
+    message = str(error)
+    for pattern in _RETRY_HINT_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더 값(초) 파싱 (날짜 형식은 무시)"""
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base_delay=2.0, max_delay=60.0, hint=None):
+    """
+    재시도 대기 시간 (서버 힌트가 있으면 우선, 없으면 full jitter 지수 백오프)
+    """
+    if hint is not None:
+        return min(max_delay, hint + random.uniform(0, base_delay))
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class _SlotStream:
+    """
+    스트리밍 응답을 끝까지 읽거나 닫을 때 동시 호출 슬롯을 반납하는 래퍼
+    (순회 외의 속성은 원래 응답으로 전달)
+    """
+
+    def __init__(self, limiter, stream):
+        self._limiter = limiter
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._released = False
+
+    def __iter__(self):
+        try:
+            yield from self._stream
+        finally:
+            self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def close(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._limiter.release()
+
+    def __del__(self):
+        # 한 번도 순회하지 않고 버려진 경우
+        self.close()
+
+
+def call_with_retry(limiter, func, estimated_tokens=0, max_retries=4, base_delay=2.0, max_delay=60.0,
+                    usage_of=None, log=None, stream=False):
+    """
+    속도 제한을 통과한 뒤 func()를 호출하고, 재시도 가능한 오류는 백오프 후 재시도
+
+    Args:
+        limiter: RateLimiter
+        func: 인자 없는 호출 함수
+        estimated_tokens: 분당 토큰 버킷에서 미리 차감할 예상 토큰 수
+        max_retries: 최대 재시도 횟수
+        usage_of: 결과에서 실제 토큰 수를 꺼내는 함수 (선택)
+        log: 로그 함수
+        stream: True면 func가 스트리밍 응답을 반환하는 것으로 보고, 응답을 끝까지 읽거나
+            close()할 때까지 동시 호출 슬롯을 유지 (스트림 시작 요청만 재시도)
+
+    Returns:
+        func의 반환값 (stream이면 슬롯을 반납하는 래퍼로 감싼 응답)
+    """
+    log = log or (lambda message: None)
+    attempt = 0
+    while True:
+        limiter.acquire(estimated_tokens)
+        delay = None
+        held = False
+        try:
+            result = func()
+            held = stream
+        except Exception as e:
+            if not is_retryable(e) or attempt >= max_retries:
+                limiter._bump('failures')
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay, retry_hint(e))
+            attempt += 1
+            limiter._bump('retries')
+            log(f"{limiter.name} 호출 재시도 {attempt}/{max_retries} ({delay:.1f}초 후): {str(e)[:100]}")
+        finally:
+            # 대기 중에는 동시 호출 슬롯을 반납 (스트림은 다 읽을 때까지 유지)
+            if not held:
+                limiter.release()
+
+        if delay is not None:
+            time.sleep(delay)
+            continue
+
+        limiter._bump('calls')
+        if usage_of is not None:
+            try:
+                limiter.record_usage(estimated_tokens, usage_of(result))
+            except Exception:
+                pass
+        if stream:
+            return _SlotStream(limiter, result)
+        return result
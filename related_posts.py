@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+관련 게시물 선정
+포스트 카탈로그의 글마다 문자 n-gram(기본 2~3글자) TF-IDF 벡터를 만들어 메모리 역색인에 두고,
+키워드와 리서치 내용(뉴스 제목 등)으로 만든 질의 벡터와의 코사인 유사도로 상위 k개를 고른다.
+띄어쓰기/조사가 제각각인 한국어 제목에서도 "손흥민 골", "손흥민골" 같은 변형이 같은 n-gram을 공유한다.
+
+- 제목/키워드/태그 n-gram에는 본문보다 큰 가중치를 준다 (title_boost, tag_boost)
+- 분류 카테고리가 같은 글은 점수에 category_bonus 비율만큼 가산한다
+- 색인은 warm() 호출 시 백그라운드 스레드에서 카탈로그와 맞추고(처음에는 전체 생성, 이후에는 바뀐 글만),
+  save_blog_post가 저장할 때마다 add()로 한 글씩 갱신한다
+- 문서 벡터의 길이(norm)는 문서 수가 10% 넘게 바뀔 때만 다시 계산하므로 질의는 질의 n-gram의 역색인 목록만 훑는다
+"""
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+# 본문에서 제외할 Markdown 요소: frontmatter, 이미지, 링크 주소, HTML 태그, URL
+_FRONTMATTER = re.compile(r'^([-–—]{3,})\s*\n.*?\n\1', re.DOTALL)
+_IMAGE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+_HTML = re.compile(r'<[^>]+>')
+_URL = re.compile(r'https?://\S+')
+_NON_WORD = re.compile(r'[^\w]+')
+
+# 문서 수가 이 비율 이상 바뀌면 문서 norm을 현재 IDF로 다시 계산
+_NORM_REFRESH_RATIO = 0.1
+
+
+def normalize(text):
+    """소문자화하고 글자/숫자 외의 문자를 공백 하나로 바꿈"""
+    return _NON_WORD.sub(' ', text.lower()).replace('_', ' ').strip()
+
+
+def char_ngrams(text, sizes=(2, 3)):
+    """
+    정규화한 문자열의 문자 n-gram 빈도 (단어 경계를 알 수 있게 앞뒤에 공백 포함)
+
+    Returns:
+        Counter: {n-gram: 빈도}
+    """
+    text = f" {normalize(text)} "
+    grams = Counter()
+    for size in sizes:
+        for start in range(len(text) - size + 1):
+            gram = text[start:start + size]
+            if gram.strip():
+                grams[gram] += 1
+    return grams
+
+
+def strip_markdown(content):
+    """본문 텍스트만 남김 (frontmatter, 이미지, 링크 주소, HTML 태그, URL 제거)"""
+    text = _FRONTMATTER.sub('', content.strip(), count=1)
+    text = _IMAGE.sub(' ', text)
+    text = _LINK.sub(r'\1', text)
+    text = _HTML.sub(' ', text)
+    return _URL.sub(' ', text)
+
+
+class RelatedPostIndex:
+    """
+    Args:
+        catalog: PostCatalog
+        ngram_sizes: 문자 n-gram 길이
+        title_boost: 제목/키워드 n-gram 가중치 (본문 = 1)
+        tag_boost: 태그 n-gram 가중치
+        category_bonus: 분류 카테고리가 같을 때 점수에 더하는 비율
+        body_chars: 본문에서 색인할 최대 글자 수 (앞부분)
+        max_terms: 문서당 보관할 최대 n-gram 수 (가중치 높은 순)
+        min_score: 이 점수 미만은 관련 글로 보지 않음
+        log: 로그 함수
+    """
+
+    def __init__(self, catalog, ngram_sizes=(2, 3), title_boost=3.0, tag_boost=2.0, category_bonus=0.2,
+                 body_chars=3000, max_terms=300, min_score=0.05, log=None):
+        self.catalog = catalog
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.title_boost = title_boost
+        self.tag_boost = tag_boost
+        self.category_bonus = category_bonus
+        self.body_chars = body_chars
+        self.max_terms = max_terms
+        self.min_score = min_score
+        self._log = log or (lambda message: None)
+
+        self._docs = {}       # filename -> {'entry', 'weights', 'norm'}
+        self._postings = {}   # n-gram -> {filename: 가중치}
+        self._norm_docs = 0   # norm을 계산했을 때의 문서 수
+        self._lock = threading.RLock()
+        self._built = threading.Event()
+        self._sync_thread = None
+
+    # 색인 구성
+
+    def warm(self):
+        """백그라운드에서 카탈로그와 색인 맞추기 (이미 진행 중이면 그대로 둠)"""
+        with self._lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return self._sync_thread
+            self._sync_thread = threading.Thread(target=self._sync, name='related-index', daemon=True)
+            self._sync_thread.start()
+            return self._sync_thread
+
+    def wait(self, timeout=None):
+        """첫 색인 생성이 끝날 때까지 대기 (아직 시작 전이면 시작)"""
+        if not self._built.is_set():
+            self.warm()
+        return self._built.wait(timeout)
+
+    def _sync(self):
+        started = time.perf_counter()
+        added = removed = 0
+        try:
+            entries = {entry['filename']: entry for entry in self.catalog.list()}
+            with self._lock:
+                stale = [filename for filename, doc in self._docs.items()
+                         if entries.get(filename, {}).get('content_hash') != doc['entry']['content_hash']]
+                for filename in stale:
+                    self._remove(filename)
+                # 본문이 같은 글도 WordPress 링크 등 카탈로그 정보는 최신으로 교체
+                for filename, doc in self._docs.items():
+                    doc['entry'] = entries[filename]
+                known = set(self._docs)
+            removed = len([filename for filename in stale if filename not in entries])
+
+            for filename, entry in entries.items():
+                if filename in known:
+                    continue
+                try:
+                    with open(entry['path'], 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                self.add(entry, content, refresh=False)
+                added += 1
+
+            with self._lock:
+                self._refresh_norms(force=True)
+            if added or removed:
+                self._log(f"관련 글 색인 갱신: 추가 {added}개, 삭제 {removed}개, 전체 {len(self._docs)}개 "
+                          f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+        except Exception as e:
+            self._log(f"관련 글 색인 생성 오류: {e}")
+        finally:
+            self._built.set()
+
+    def _doc_weights(self, entry, content):
+        """필드별 가중치를 합친 문서 n-gram 가중치 (1 + log tf), 상위 max_terms개만"""
+        weights = Counter()
+        fields = (
+            (f"{entry.get('title') or ''} {entry.get('keyword') or ''}", self.title_boost),
+            (' '.join(entry.get('tags') or []), self.tag_boost),
+            (strip_markdown(content)[:self.body_chars], 1.0),
+        )
+        for text, boost in fields:
+            for gram, count in char_ngrams(text, self.ngram_sizes).items():
+                weights[gram] += boost * (1.0 + math.log(count))
+        return dict(weights.most_common(self.max_terms))
+
+    def add(self, entry, content, refresh=True):
+        """
+        글 추가/교체 (save_blog_post에서 카탈로그 등록 뒤 호출)
+
+        Args:
+            entry: PostCatalog 항목
+            content: 포스트 Markdown
+            refresh: False면 문서 norm 일괄 재계산을 미룸 (색인 생성 중 사용)
+        """
+        weights = self._doc_weights(entry, content)
+        with self._lock:
+            self._remove(entry['filename'])
+            for gram, weight in weights.items():
+                self._postings.setdefault(gram, {})[entry['filename']] = weight
+            self._docs[entry['filename']] = {'entry': entry, 'weights': weights, 'norm': self._norm(weights)}
+            if refresh:
+                self._refresh_norms()
+
+    def update_entry(self, filename, **fields):
+        """색인된 글의 카탈로그 정보 갱신 (예: 게시 후 wp_post_id/wp_url)"""
+        with self._lock:
+            doc = self._docs.get(filename)
+            if doc is not None:
+                doc['entry'] = {**doc['entry'], **fields}
+
+    def remove(self, filename):
+        with self._lock:
+            self._remove(filename)
+
+    def _remove(self, filename):
+        doc = self._docs.pop(filename, None)
+        if doc is None:
+            return
+        for gram in doc['weights']:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.pop(filename, None)
+                if not postings:
+                    del self._postings[gram]
+
+    def _idf(self, gram):
+        return math.log((1 + len(self._docs)) / (1 + len(self._postings.get(gram, ())))) + 1.0
+
+    def _norm(self, weights):
+        return math.sqrt(sum((weight * self._idf(gram)) ** 2 for gram, weight in weights.items())) or 1.0
+
+    def _refresh_norms(self, force=False):
+        count = len(self._docs)
+        if not force and abs(count - self._norm_docs) <= max(1, self._norm_docs * _NORM_REFRESH_RATIO):
+            return
+        for doc in self._docs.values():
+            doc['norm'] = self._norm(doc['weights'])
+        self._norm_docs = count
+
+    # 조회
+
+    def top_k(self, keyword, context=None, category=None, k=2, exclude_keyword=None, where=None, timeout=5.0):
+        """
+        유사도 상위 k개
+
+        Args:
+            keyword: 키워드 (제목 가중치 적용)
+            context: 추가 질의 텍스트 (뉴스 제목/요약 등, 본문 가중치)
+            category: 분류 카테고리 (같은 카테고리 글에 가산점)
+            exclude_keyword: 이 키워드의 글은 제외 (기본값: keyword)
+            where: 항목을 받아 후보 여부를 반환하는 함수 (예: WordPress 링크가 있는 글만)
+            timeout: 첫 색인 생성을 기다리는 최대 시간
+
+        Returns:
+            list: [(점수, 카탈로그 항목), ...] (점수 높은 순)
+        """
+        self.wait(timeout)
+        exclude_keyword = keyword if exclude_keyword is None else exclude_keyword
+
+        query = Counter()
+        for text, boost in ((keyword, self.title_boost), (context or '', 1.0)):
+            for gram, count in char_ngrams(text, self.ngram_sizes).items():
+                query[gram] += boost * (1.0 + math.log(count))
+
+        with self._lock:
+            query_vector = {gram: weight * self._idf(gram) for gram, weight in query.items() if gram in self._postings}
+            if not query_vector:
+                return []
+            query_norm = math.sqrt(sum(value * value for value in query_vector.values()))
+            dots = Counter()
+            for gram, query_weight in query_vector.items():
+                idf = self._idf(gram)
+                for filename, weight in self._postings[gram].items():
+                    dots[filename] += query_weight * weight * idf
+
+            scored = []
+            for filename, dot in dots.items():
+                doc = self._docs[filename]
+                entry = doc['entry']
+                if exclude_keyword and (entry.get('keyword') == exclude_keyword or exclude_keyword in filename):
+                    continue
+                if where is not None and not where(entry):
+                    continue
+                score = dot / (query_norm * (doc['norm'] or 1.0))
+                if category and entry.get('category') == category:
+                    score *= 1.0 + self.category_bonus
+                if score >= self.min_score:
+                    scored.append((score, entry))
+
+        scored.sort(key=lambda item: (item[0], item[1]['created_at']), reverse=True)
+        results = []
+        for score, entry in scored:
+            # 색인한 뒤 삭제된 파일은 제외
+            if os.path.exists(entry['path']):
+                results.append((score, entry))
+                if len(results) >= k:
+                    break
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {'documents': len(self._docs), 'terms': len(self._postings), 'built': self._built.is_set()}
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Gemini 응답 캐시
+프롬프트 해시를 키로 응답 텍스트를 SQLite에 저장한다.
+항목마다 TTL을 가지며, 개수/용량 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제(LRU)한다.
+스케줄러와 대시보드가 같은 파일을 공유할 수 있도록 WAL 모드를 사용한다.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    프롬프트 해시 기반 응답 캐시
+
+    Args:
+        path: SQLite 파일 경로
+        max_entries: 최대 항목 수
+        max_bytes: 최대 저장 용량 (바이트, None이면 제한 없음)
+    """
+
+    # 이 횟수만큼 저장할 때마다 상한 검사 및 만료 항목 정리
+    EVICT_CHECK_INTERVAL = 20
+
+    def __init__(self, path='llm_cache.db', max_entries=5000, max_bytes=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._counters = {}
+
+    def _connect(self):
+        # 첫 사용 시 연결 (생성자는 파일 I/O 없이 가볍게 유지)
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(*parts):
+        """키 구성 요소(모델명, 프롬프트 등)를 하나의 SHA-256 해시로 변환"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def _count(self, namespace, field):
+        counters = self._counters.setdefault(namespace, {'hits': 0, 'misses': 0})
+        counters[field] += 1
+
+    def get(self, key, namespace='default'):
+        """
+        캐시된 응답 반환 (없거나 만료되었으면 None)
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or (row[1] is not None and row[1] < now):
+                    self._count(namespace, 'misses')
+                    return None
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+            except sqlite3.Error:
+                self._count(namespace, 'misses')
+                return None
+            self._count(namespace, 'hits')
+            return row[0]
+
+    def set(self, key, value, ttl=None, namespace='default'):
+        """
+        응답 저장
+
+        Args:
+            ttl: 유효 시간(초), None이면 만료 없음
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, namespace, value, size, created_at, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, namespace, value, len(value.encode('utf-8')), now, expires_at, now)
+                )
+                conn.commit()
+                self._writes += 1
+                if self._writes % self.EVICT_CHECK_INTERVAL == 0:
+                    self._evict(conn, now)
+            except sqlite3.Error:
+                pass
+
+    def delete(self, key):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self, conn, now):
+        """만료 항목 삭제 후 개수/용량 상한을 넘으면 LRU 순으로 삭제"""
+        conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+
+        count, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if self.max_entries and count > self.max_entries:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,)
+            )
+        if self.max_bytes and total_bytes > self.max_bytes:
+            # 오래된 항목부터 누적 용량을 계산하여 초과분만큼 삭제
+            excess = total_bytes - self.max_bytes
+            freed = 0
+            stale_keys = []
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                stale_keys.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+        conn.commit()
+
+    def stats(self):
+        """
+        네임스페이스별 적중/미스 횟수 및 저장 현황
+
+        Returns:
+            dict: {'namespaces': {ns: {'hits', 'misses', 'hit_rate'}}, 'entries': int, 'bytes': int}
+        """
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._counters.items():
+                total = counters['hits'] + counters['misses']
+                namespaces[namespace] = {
+                    **counters,
+                    'hit_rate': round(counters['hits'] / total, 3) if total else 0.0
+                }
+            try:
+                entries, total_bytes = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+            except sqlite3.Error:
+                entries, total_bytes = 0, 0
+        return {'namespaces': namespaces, 'entries': entries, 'bytes': total_bytes}
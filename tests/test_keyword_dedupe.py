@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""keyword_dedupe 유사 키워드 검사 (요청에 나온 변형 예시)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_dedupe import KeywordDedupeIndex, title_phrases
+
+
+def _index(*texts):
+    index = KeywordDedupeIndex(threshold=0.7)
+    for text in texts:
+        index.add(text, {'kind': 'keyword', 'keyword': text})
+    return index
+
+
+def test_contained_variants_are_found():
+    index = _index('손흥민', '아이폰')
+    for variant in ('손흥민 골', '손흥민 경기', '손흥민골', '토트넘 손흥민 골', '손흥민 경기 하이라이트'):
+        matches = index.find(variant)
+        assert matches and matches[0][1] == '손흥민', variant
+        assert matches[0][0] == 1.0
+    assert index.find('애플 아이폰 17 출시')[0][1] == '아이폰'
+
+
+def test_longer_used_keyword_matches_shorter_candidate():
+    index = _index('토트넘 손흥민 골', '애플 아이폰 17 출시')
+    assert index.find('손흥민')[0][1] == '토트넘 손흥민 골'
+    assert index.find('아이폰17')[0][1] == '애플 아이폰 17 출시'
+
+
+def test_unrelated_and_short_keywords_are_not_matched():
+    index = _index('삼성전자 주가', '날씨', '손흥민')
+    assert index.find('LG전자 주가') == []
+    assert index.find('미세먼지 날씨') == []
+    assert index.find('손준호') == []
+
+
+def test_recall_over_many_entries():
+    # 다른 항목이 많아도 포함 관계는 항상 찾음 (후보를 확률적으로 고르지 않음)
+    index = KeywordDedupeIndex(threshold=0.7)
+    for idx in range(5000):
+        index.add(f"키워드{idx} 뉴스", {'kind': 'keyword'})
+    index.add('손흥민', {'kind': 'keyword'})
+    for variant in ('토트넘 손흥민 골', '손흥민 경기 하이라이트'):
+        assert index.find(variant)[0][1] == '손흥민'
+
+
+def test_title_phrases_match_keyword_variants():
+    index = KeywordDedupeIndex(threshold=0.7)
+    for phrase in title_phrases('토트넘 3연승, 케인 해트트릭의 비밀'):
+        index.add(phrase, {'kind': 'title'})
+    assert index.find('케인 해트트릭')[0][2] == {'kind': 'title'}
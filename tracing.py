@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+파이프라인 단계별 트레이스 스팬
+실행(run) 하나를 루트 스팬으로 하여 단계, 외부 HTTP 호출, 브라우저 작업, Gemini 호출을 스팬으로 기록하고
+끝난 스팬을 traces/{run_id}.jsonl 파일에 한 줄씩 추가한다.
+
+현재 스팬은 contextvars로 전달되므로 같은 스레드 안에서는 자동으로 부모-자식 관계가 맺어지고,
+ThreadPoolExecutor 등 다른 스레드로 넘기는 함수는 Tracer.wrap()으로 감싸 현재 컨텍스트를 함께 넘긴다.
+"""
+import contextlib
+import contextvars
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+_current_span = contextvars.ContextVar('trace_span', default=None)
+
+
+class Span:
+    """진행 중인 스팬 (종료 시 to_dict() 결과가 파일에 기록됨)"""
+
+    def __init__(self, name, kind, run_id, parent=None, keyword=None, attrs=None):
+        self.name = name
+        self.kind = kind
+        self.run_id = run_id
+        self.span_id = uuid.uuid4().hex[:12]
+        self.parent_id = parent.span_id if parent else None
+        # 키워드는 부모 스팬에서 물려받음
+        self.keyword = keyword or (parent.keyword if parent else None)
+        self.start = time.time()
+        self.end = None
+        self.duration_ms = None
+        self.outcome = 'ok'
+        self.error = None
+        self.bytes = None
+        self.attrs = dict(attrs or {})
+        self._started = time.perf_counter()
+
+    def set(self, **fields):
+        """결과/크기/추가 속성 기록 (outcome, error, bytes, keyword는 고정 필드)"""
+        for key in ('outcome', 'error', 'bytes', 'keyword'):
+            if key in fields:
+                setattr(self, key, fields.pop(key))
+        self.attrs.update(fields)
+
+    def fail(self, error):
+        self.outcome = 'error'
+        self.error = f"{type(error).__name__}: {str(error)[:300]}"
+
+    def finish(self):
+        self.end = time.time()
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 2)
+
+    def to_dict(self):
+        return {
+            'run_id': self.run_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'keyword': self.keyword,
+            'start': round(self.start, 6),
+            'end': round(self.end, 6) if self.end else None,
+            'duration_ms': self.duration_ms,
+            'outcome': self.outcome,
+            'error': self.error,
+            'bytes': self.bytes,
+            'thread': threading.current_thread().name,
+            'attrs': self.attrs,
+        }
+
+
+class _NullSpan:
+    """트레이싱 비활성화 시 사용하는 빈 스팬"""
+
+    run_id = None
+    keyword = None
+
+    def set(self, **fields):
+        pass
+
+    def fail(self, error):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+def current_span():
+    """현재 컨텍스트의 스팬 (없으면 None)"""
+    return _current_span.get()
+
+
+class Tracer:
+    """
+    스팬 생성 및 JSONL 기록
+
+    Args:
+        directory: 실행별 트레이스 파일 디렉토리
+        enabled: False면 파일에 기록하지 않음 (리스너가 없으면 스팬도 만들지 않음)
+        max_runs: 보관할 최대 실행 수 (새 실행 시작 시 오래된 파일부터 삭제)
+    """
+
+    def __init__(self, directory='traces', enabled=True, max_runs=200):
+        self.directory = directory
+        self.enabled = enabled
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """스팬이 끝날 때마다 listener(span_dict) 호출 (메트릭 집계 등)"""
+        self._listeners.append(listener)
+
+    @contextlib.contextmanager
+    def span(self, name, kind='stage', keyword=None, **attrs):
+        """
+        스팬 열기 (현재 스팬이 없으면 새 실행의 루트 스팬이 됨)
+
+        예외가 전파되면 outcome='error'로 기록하고 그대로 다시 발생시킨다.
+        """
+        if not self.enabled and not self._listeners:
+            yield NULL_SPAN
+            return
+
+        parent = _current_span.get()
+        run_id = parent.run_id if parent else self._start_run()
+        span = Span(name, kind, run_id, parent=parent, keyword=keyword, attrs=attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.fail(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            self._emit(span)
+
+    def wrap(self, func, name=None, kind='stage', **attrs):
+        """
+        다른 스레드에서 실행할 함수에 현재 컨텍스트를 담아 반환 (name 지정 시 스팬으로 감쌈)
+        반환된 함수는 한 번에 하나의 스레드에서만 호출해야 한다 (제출할 때마다 새로 감쌀 것).
+        """
+        context = contextvars.copy_context()
+
+        def call(*args, **kwargs):
+            if name is None:
+                return func(*args, **kwargs)
+            with self.span(name, kind=kind, **attrs):
+                return func(*args, **kwargs)
+
+        return lambda *args, **kwargs: context.run(call, *args, **kwargs)
+
+    def _start_run(self):
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        if not self.enabled:
+            return run_id
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._prune()
+        except OSError:
+            pass
+        return run_id
+
+    def _prune(self):
+        files = sorted(glob.glob(os.path.join(self.directory, '*.jsonl')), key=os.path.getmtime)
+        for path in files[:max(0, len(files) - self.max_runs + 1)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _emit(self, span):
+        record = span.to_dict()
+        for listener in self._listeners:
+            try:
+                listener(record)
+            except Exception:
+                pass
+        if self.enabled:
+            self._write(record)
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        path = os.path.join(self.directory, f"{record['run_id']}.jsonl")
+        try:
+            with self._lock:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+        except OSError:
+            # 트레이스 기록 실패가 파이프라인을 멈추게 하지 않음
+            pass
+
+
+def load_run(path):
+    """트레이스 파일 하나의 스팬 목록 (시작 시각 순)"""
+    spans = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                # 기록 중인 마지막 줄
+                continue
+    return sorted(spans, key=lambda span: span['start'])
+
+
+def recent_runs(directory='traces', limit=20):
+    """
+    최근 실행 목록 (최신순)
+
+    Returns:
+        list: [{'run_id', 'name', 'keyword', 'start', 'duration_ms', 'outcome', 'spans'}, ...]
+        (루트 스팬이 아직 기록되지 않은 진행 중 실행은 outcome='running')
+    """
+    files = sorted(glob.glob(os.path.join(directory, '*.jsonl')), key=os.path.getmtime, reverse=True)
+    runs = []
+    for path in files[:limit]:
+        try:
+            spans = load_run(path)
+        except OSError:
+            continue
+        if not spans:
+            continue
+        root = next((span for span in spans if span['parent_id'] is None), None)
+        runs.append({
+            'run_id': spans[0]['run_id'],
+            'name': root['name'] if root else spans[0]['name'],
+            'keyword': root['keyword'] if root else spans[0]['keyword'],
+            'start': spans[0]['start'],
+            'duration_ms': root['duration_ms'] if root else None,
+            'outcome': root['outcome'] if root else 'running',
+            'spans': spans,
+        })
+    return runs
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def stage_percentiles(runs):
+    """
+    스팬 이름별 지연 시간 통계
+
+    Returns:
+        dict: {name: {'kind', 'count', 'errors', 'p50_ms', 'p95_ms'}}
+    """
+    durations = {}
+    for run in runs:
+        for span in run['spans']:
+            if span.get('duration_ms') is None:
+                continue
+            entry = durations.setdefault(span['name'], {'kind': span['kind'], 'values': [], 'errors': 0})
+            entry['values'].append(span['duration_ms'])
+            if span['outcome'] != 'ok':
+                entry['errors'] += 1
+    return {
+        name: {
+            'kind': entry['kind'],
+            'count': len(entry['values']),
+            'errors': entry['errors'],
+            'p50_ms': round(_percentile(entry['values'], 50), 1),
+            'p95_ms': round(_percentile(entry['values'], 95), 1),
+        }
+        for name, entry in sorted(durations.items())
+    }
@@ -1,21 +1,81 @@
+import atexit
+import contextlib
 import json
 import os
+import threading
 from datetime import datetime
-import schedule
 import time
-from pytrends.request import TrendReq
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
+from browser_pool import BrowserPool
+from trends_cache import TrendsCache
+from response_cache import ResponseCache
+from keyword_store import KeywordStore
+from post_catalog import PostCatalog
+from related_posts import RelatedPostIndex
+from keyword_dedupe import KeywordDedupeIndex, title_phrases
+from content_dedupe import ContentSignatureIndex
+import rate_limiter
+import log_writer
+import metrics
+from prompt_templates import PromptRegistry, RenderedPrompt, VALID_CATEGORIES
+from prompt_budget import MetricsLog, count_tokens, fit_news_items
+from keyword_service import KeywordServiceClient, KeywordServiceError
+from tracing import Tracer, current_span
+
+# 호출 지점별 Gemini 응답 캐시 기본 정책 (system_config.json의 llm_cache.policies로 덮어씀)
+DEFAULT_LLM_CACHE_POLICIES = {
+    'category': {'enabled': True, 'ttl_hours': 72},
+    'article': {'enabled': False, 'ttl_hours': 6},
+}
+
+# 유사 키워드 중복 검사 기본값 (system_config.json의 keyword_dedupe로 덮어씀)
+DEFAULT_KEYWORD_DEDUPE = {
+    'enabled': True,
+    'threshold': 0.7,
+    'action': 'skip',
+    'title_days': 3,
+    'recent_posts': 200,
+    'rebuild_hours': 24,
+}
+
+# 생성된 본문 중복 검사 기본값 (system_config.json의 content_dedupe로 덮어씀)
+DEFAULT_CONTENT_DEDUPE = {
+    'enabled': True,
+    'path': 'content_signatures.db',
+    'threshold': 0.5,
+    'action': 'hold',
+    'max_regenerations': 1,
+    'top': 3,
+    'held_dir': 'held',
+}
+
+# 스크래핑 대상 주소 ({query}는 URL 인코딩된 검색어, system_config.json의 source_urls로 덮어씀)
+DEFAULT_SOURCE_URLS = {
+    'trends': 'https://trends.google.co.kr/trending?geo=KR&hours=24',
+    'news_search': 'https://www.google.com/search?q={query}&tbm=nws&hl=ko',
+    'image_search': 'https://www.google.com/search?q={query}&tbm=isch&hl=ko',
+    'youtube_search': 'https://www.youtube.com/results?search_query={query}',
+}
+
+
+class GenerationAborted(Exception):
+    """스트리밍 생성 중 on_chunk 콜백이 중단을 요청함"""
 
 class TrendBlogSystem:
     def __init__(self):
         """
         구글 트렌드 기반 블로그 자동 작성 시스템 초기화
+        
+        네트워크 요청이나 무거운 import 없이 생성되며,
+        Gemini 모델/pytrends/Playwright는 첫 사용 시 생성된다.
         """
-        self.pytrends = TrendReq(hl='ko', tz=540)  # 한국어, 한국 시간대
+        init_started = time.perf_counter()
         self.used_keywords_file = 'used_keywords.json'
         self.config_file = 'system_config.json'
         self.blog_posts_dir = 'blog_posts'
         self.log_file = 'system_log.txt'
+        self._log_writer = None
+        self.batch_history_file = 'batch_history.jsonl'
         
         # Gemini API 설정 (환경변수에서 API 키 가져오기)
         api_key = os.getenv('GEMINI_API_KEY')
@@ -23,10 +83,23 @@ class TrendBlogSystem:
             # 혹시 GOOGLE_API_KEY로 설정했을 수도 있으니 확인
             api_key = os.getenv('GOOGLE_API_KEY')
 
+        self._api_key = api_key
+        # API 주소 (로컬 대체 서버(fake_services) 사용 시 환경변수로 변경)
+        self.gemini_api_base = os.getenv('GEMINI_API_BASE_URL', '').strip().rstrip('/')
+        self.telegram_api_base = os.getenv('TELEGRAM_API_BASE_URL', 'https://api.telegram.org').strip().rstrip('/')
+        # gemini-1.5-flash가 안될 경우 gemini-pro 사용
+        self.model_name = 'gemini-flash-latest'
+        self._model = None
+        self._pytrends = None
+        self._client_lock = threading.Lock()
+        self.last_generation_stats = None
+        # 프롬프트 템플릿 (로드 시 자리표시자 검사, 고정 지침 미리 조립)
+        self.prompts = PromptRegistry()
+        self._prefix_models = {}
+        self._prefix_models_lock = threading.Lock()
+        self._context_cache_stats = {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0}
+        
         if api_key:
-            genai.configure(api_key=api_key)
-            # gemini-1.5-flash가 안될 경우 gemini-pro 사용
-            self.model = genai.GenerativeModel('gemini-flash-latest')
             self.client_ready = True
         else:
             self.client_ready = False
@@ -46,20 +119,539 @@ class TrendBlogSystem:
         if not os.path.exists(self.blog_posts_dir):
             os.makedirs(self.blog_posts_dir)
             
-        if not os.path.exists(self.used_keywords_file):
-            self._save_used_keywords([])
-            
         # 설정 로드
         self.config = self._load_config()
+        # 로그 교체/출력 설정 (기록기는 같은 파일을 쓰는 인스턴스끼리 공유)
+        self._log_writer = log_writer.get_writer(self.log_file, **self.config.get('logging', {}))
+        
+        # 스크래핑 메서드가 공유하는 브라우저 풀 (첫 사용 시 Chromium 실행)
+        pool_config = self.config.get('browser_pool', {})
+        self.browser_pool = BrowserPool(
+            size=pool_config.get('size', 1),
+            max_pages_per_browser=pool_config.get('max_pages_per_browser', 50),
+            max_memory_mb=pool_config.get('max_memory_mb'),
+            log=self._log
+        )
+        atexit.register(self.browser_pool.close)
+        
+        # 대시보드/스케줄러가 공유하는 트렌드 스냅샷 캐시
+        cache_config = self.config.get('trends_cache', {})
+        self.trends_cache = TrendsCache(
+            path=cache_config.get('path', 'trends_cache.json'),
+            ttl=cache_config.get('ttl_seconds', 600),
+            stale_ttl=cache_config.get('stale_ttl_seconds', 3600)
+        )
+        
+        # Gemini 응답 캐시 (프롬프트 해시 기반, 첫 사용 시 SQLite 파일 생성)
+        llm_cache_config = self.config.get('llm_cache', {})
+        max_mb = llm_cache_config.get('max_mb')
+        self.response_cache = ResponseCache(
+            path=llm_cache_config.get('path', 'llm_cache.db'),
+            max_entries=llm_cache_config.get('max_entries', 5000),
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb else None
+        )
+        self.llm_cache_policies = {
+            purpose: {**policy, **llm_cache_config.get('policies', {}).get(purpose, {})}
+            for purpose, policy in DEFAULT_LLM_CACHE_POLICIES.items()
+        }
+        
+        # 사용된 키워드 기록 (첫 사용 시 used_keywords.json에서 한 번 가져옴)
+        keyword_store_config = self.config.get('keyword_store', {})
+        self.keyword_store = KeywordStore(
+            path=keyword_store_config.get('path', 'keywords.db'),
+            expire_days=keyword_store_config.get('expire_days'),
+            legacy_json=self.used_keywords_file,
+            log=self._log
+        )
+        
+        # 포스트 카탈로그 (목록/조회용, 처음 만들 때 blog_posts/에서 한 번 가져옴)
+        self.post_catalog = PostCatalog(
+            path=self.config.get('post_catalog', {}).get('path', 'post_catalog.db'),
+            posts_dir=self.blog_posts_dir,
+            log=self._log
+        )
+        
+        # 관련 게시물 색인 (문자 n-gram TF-IDF, 첫 생성 시 백그라운드에서 구성)
+        related_config = self.config.get('related_posts', {})
+        self.related_top_k = related_config.get('top_k', 2)
+        self.related_index = RelatedPostIndex(
+            self.post_catalog,
+            title_boost=related_config.get('title_boost', 3.0),
+            tag_boost=related_config.get('tag_boost', 2.0),
+            category_bonus=related_config.get('category_bonus', 0.2),
+            body_chars=related_config.get('body_chars', 3000),
+            min_score=related_config.get('min_score', 0.05),
+            log=self._log
+        )
+        
+        # 유사 키워드 중복 검사 (사용된 키워드/최근 포스트 제목 기준, 첫 키워드 선택 시 구성)
+        self.keyword_dedupe_config = {**DEFAULT_KEYWORD_DEDUPE, **self.config.get('keyword_dedupe', {})}
+        self._keyword_dedupe = None
+        self._keyword_dedupe_built = 0
+        self._keyword_dedupe_lock = threading.Lock()
+        
+        # 생성된 본문 중복 검사 (blog_posts/ 글의 본문 서명, 첫 생성 시 백그라운드에서 구성)
+        self.content_dedupe_config = {**DEFAULT_CONTENT_DEDUPE, **self.config.get('content_dedupe', {})}
+        self.content_index = ContentSignatureIndex(
+            self.post_catalog,
+            path=self.content_dedupe_config['path'],
+            log=self._log
+        )
+        # 다시 생성할 때 현재 스레드에서만 건너뛸 응답 캐시 용도
+        self._cache_bypass = threading.local()
+        # 스레드별 마지막 리서치 결과 (유사 본문을 다시 생성할 때 본문만 새로 쓰기 위함)
+        self._research = threading.local()
+        
+        # 프롬프트 크기 예산 및 호출 계측 파일
+        self.prompt_budget = self.config.get('prompt_budget', {})
+        self.metrics = MetricsLog(self.prompt_budget.get('metrics_file', 'llm_metrics.jsonl'))
+        
+        # 단계별 트레이스 스팬 (실행별 traces/{run_id}.jsonl)
+        tracing_config = self.config.get('tracing', {})
+        self.tracer = Tracer(
+            directory=tracing_config.get('directory', 'traces'),
+            enabled=tracing_config.get('enabled', True),
+            max_runs=tracing_config.get('max_runs', 200)
+        )
+        # 끝난 스팬은 메트릭(단계 지연 시간, 외부 호출 수, 포스트 수)에도 반영
+        self.tracer.add_listener(metrics.observe_span)
+        
+        # 스크래핑 대상 주소 (벤치마크에서는 녹화된 페이지를 제공하는 대체 서버로 변경)
+        self.source_urls = {**DEFAULT_SOURCE_URLS, **(self.config.get('source_urls') or {})}
+        
+        # 로컬 키워드 서비스 (KEYWORD_SERVICE_URL 설정 시 키워드/뉴스/이미지 조회를 서비스에 위임)
+        service_url = os.getenv('KEYWORD_SERVICE_URL', '').strip()
+        self.keyword_service = KeywordServiceClient(service_url) if service_url else None
+        
+        self.init_ms = (time.perf_counter() - init_started) * 1000
+
+    @property
+    def model(self):
+        """Gemini 모델 (google.generativeai는 import 비용이 커서 첫 사용 시 로드)"""
+        if self._model is None:
+            with self._client_lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    if self.gemini_api_base:
+                        # 대체 서버는 REST로만 접속 가능
+                        genai.configure(
+                            api_key=self._api_key,
+                            transport='rest',
+                            client_options={'api_endpoint': self.gemini_api_base}
+                        )
+                    else:
+                        genai.configure(api_key=self._api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
 
-    def _log(self, message):
-        """로그 메시지 기록"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_message = f"[{timestamp}] {message}"
-        print(log_message)
-        
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_message + '\n')
+    @model.setter
+    def model(self, value):
+        self._model = value
+
+    @property
+    def pytrends(self):
+        """pytrends 클라이언트 (생성 시 쿠키 요청이 발생하므로 첫 사용 시에만 생성)"""
+        if self._pytrends is None:
+            with self._client_lock:
+                if self._pytrends is None:
+                    from pytrends.request import TrendReq
+                    self._pytrends = TrendReq(hl='ko', tz=540)  # 한국어, 한국 시간대
+        return self._pytrends
+
+    def _log(self, message, level='INFO', **fields):
+        """
+        로그 메시지 기록 (백그라운드 기록기 큐에 넣고 바로 반환)
+        
+        Args:
+            level: 'DEBUG', 'INFO', 'WARNING', 'ERROR'
+            **fields: 레코드에 함께 남길 구조화 필드
+        """
+        if self._log_writer is None:
+            self._log_writer = log_writer.get_writer(self.log_file)
+        self._log_writer.log(message, level, **fields)
+            
+    def _log_browser_pool_stats(self):
+        """브라우저 풀 재사용률 및 실행 시간 통계 기록"""
+        stats = self.browser_pool.stats()
+        self._log(
+            f"브라우저 풀 통계: 실행 {stats['launches']}회 (평균 {stats['avg_launch_time']}초), "
+            f"재사용 {stats['warm_hits']}회 (적중률 {stats['hit_rate']:.0%}), "
+            f"페이지 {stats['pages']}개, 재시작 {stats['recycles']}회"
+        )
+        self._log_response_cache_stats()
+        self._log_rate_limiter_stats()
+        self._log_context_cache_stats()
+        
+    def _log_response_cache_stats(self):
+        """Gemini 응답 캐시 호출 지점별 적중/미스 통계 기록"""
+        stats = self.response_cache.stats()
+        for purpose, counters in stats['namespaces'].items():
+            self._log(
+                f"Gemini 응답 캐시 ({purpose}): 적중 {counters['hits']}회, 미스 {counters['misses']}회 "
+                f"(적중률 {counters['hit_rate']:.0%})"
+            )
+            
+    def _generate_text(self, prompt, purpose, generation_config=None, prefix=None):
+        """
+        Gemini 텍스트 생성 (호출 지점별 응답 캐시 정책 적용)
+        
+        Args:
+            prompt: 프롬프트
+            purpose: 호출 지점 이름 ('category', 'article' 등 - llm_cache.policies의 키)
+            generation_config: Gemini 생성 옵션 (예: JSON 응답 강제)
+            prefix: 고정 지침 (지정 시 컨텍스트 캐시 모델에 등록하고 prompt만 전송)
+            
+        Returns:
+            str: 응답 텍스트
+        """
+        cache_key, cached = self._lookup_response_cache(purpose, prompt, generation_config, prefix)
+        if cached is not None:
+            return cached
+        
+        model = self._get_prefix_model(prefix) if prefix else self.model
+        if generation_config:
+            response = self._call_gemini(
+                lambda: model.generate_content(prompt, generation_config=generation_config), prompt, purpose
+            )
+        else:
+            response = self._call_gemini(lambda: model.generate_content(prompt), prompt, purpose)
+        self._record_context_cache_usage(getattr(response, 'usage_metadata', None))
+        text = response.text
+        
+        self._store_response_cache(purpose, cache_key, text)
+        return text
+    
+    def _call_with_rate_limit(self, model_name, func, estimated_tokens=0, usage_of=None, stream=False):
+        """
+        모델별 공유 속도 제한(rate_limits)을 통과한 뒤 func()를 호출하고, 
+        429/5xx 오류는 retry 설정에 따라 백오프 후 재시도
+        (stream이면 응답을 다 읽거나 닫을 때까지 동시 호출 슬롯 유지)
+        """
+        limits = self.config.get('rate_limits', {}).get(model_name, {})
+        limiter = rate_limiter.get_limiter(
+            model_name,
+            rpm=limits.get('rpm'),
+            tpm=limits.get('tpm'),
+            max_concurrent=limits.get('max_concurrent')
+        )
+        retry_config = self.config.get('retry', {})
+        return rate_limiter.call_with_retry(
+            limiter, func,
+            estimated_tokens=estimated_tokens,
+            max_retries=retry_config.get('max_retries', 4),
+            base_delay=retry_config.get('base_delay', 2.0),
+            max_delay=retry_config.get('max_delay', 60.0),
+            usage_of=usage_of,
+            log=self._log,
+            stream=stream
+        )
+    
+    def _call_gemini(self, func, prompt, purpose, stream=False):
+        """
+        Gemini 텍스트 모델 호출 (프롬프트 길이로 토큰 수를 추정하고 응답의 실제 사용량으로 보정)
+        스트리밍이 아니면 호출별 토큰 수/지연 시간을 계측 파일에 기록한다.
+        """
+        def usage_of(response):
+            metadata = getattr(response, 'usage_metadata', None)
+            return getattr(metadata, 'total_token_count', None) if metadata is not None else None
+        
+        estimated_tokens = count_tokens(prompt)
+        started = time.perf_counter()
+        with self.tracer.span(f"gemini.{purpose}", kind='llm', model=self.model_name, stream=stream) as span:
+            response = self._call_with_rate_limit(
+                self.model_name, func,
+                estimated_tokens=estimated_tokens,
+                usage_of=None if stream else usage_of,
+                stream=stream
+            )
+            if not stream:
+                usage_metadata = getattr(response, 'usage_metadata', None)
+                self._record_llm_call(
+                    purpose, estimated_tokens, usage_metadata,
+                    latency=time.perf_counter() - started
+                )
+                span.set(
+                    prompt_tokens=getattr(usage_metadata, 'prompt_token_count', None),
+                    response_tokens=getattr(usage_metadata, 'candidates_token_count', None)
+                )
+        return response
+    
+    def _record_llm_call(self, purpose, estimated_tokens, usage_metadata, latency, **fields):
+        """호출별 프롬프트/응답 토큰 수 및 지연 시간 기록 (사용량 정보가 없으면 추정치만 기록)"""
+        def usage(name):
+            return getattr(usage_metadata, name, None) if usage_metadata is not None else None
+        
+        metrics.observe_llm_tokens(
+            purpose,
+            prompt_tokens=usage('prompt_token_count') or estimated_tokens,
+            response_tokens=usage('candidates_token_count'),
+            cached_tokens=usage('cached_content_token_count')
+        )
+        self.metrics.record(
+            'llm_call',
+            purpose=purpose,
+            model=self.model_name,
+            prompt_tokens_estimated=estimated_tokens,
+            prompt_tokens=usage('prompt_token_count'),
+            response_tokens=usage('candidates_token_count'),
+            cached_tokens=usage('cached_content_token_count'),
+            latency_ms=round(latency * 1000, 1),
+            **fields
+        )
+    
+    def _log_rate_limiter_stats(self):
+        """모델별 호출/재시도/대기 시간 기록"""
+        for name, stats in rate_limiter.limiter_stats().items():
+            self._log(
+                f"API 호출 통계 ({name}): 성공 {stats['calls']}회, 재시도 {stats['retries']}회, "
+                f"실패 {stats['failures']}회, 속도 제한 대기 {stats['wait_time']}초"
+            )
+    
+    def _get_prefix_model(self, prefix):
+        """
+        고정 지침(prefix)을 미리 등록한 Gemini 모델 반환 (prefix 해시별로 재사용)
+        
+        context_cache.enabled이고 prefix가 최소 토큰 수 이상이면 Gemini 컨텍스트 캐시(CachedContent)에
+        한 번 등록하여 이후 요청은 가변 부분만 전송한다. 컨텍스트 캐시를 쓸 수 없으면
+        prefix를 system_instruction으로 가진 모델을 해시별로 재사용한다 (서버 측 암묵적 캐시 대상).
+        """
+        import hashlib
+        
+        cache_config = self.config.get('context_cache', {})
+        prefix_hash = hashlib.sha256(f"{self.model_name}\x00{prefix}".encode('utf-8')).hexdigest()[:16]
+        
+        with self._prefix_models_lock:
+            entry = self._prefix_models.get(prefix_hash)
+            # 컨텍스트 캐시 만료 1분 전부터는 새로 등록
+            if entry is not None and (entry['expires_at'] is None or entry['expires_at'] - time.time() > 60):
+                return entry['model']
+            
+            import google.generativeai as genai
+            self.model  # genai.configure 보장
+            
+            model = None
+            expires_at = None
+            min_tokens = cache_config.get('min_tokens', 1024)
+            if cache_config.get('enabled', True) and count_tokens(prefix) >= min_tokens:
+                try:
+                    from datetime import timedelta
+                    from google.generativeai import caching
+                    
+                    ttl_minutes = cache_config.get('ttl_minutes', 60)
+                    cached_content = self._call_with_rate_limit(
+                        self.model_name,
+                        lambda: caching.CachedContent.create(
+                            model=cache_config.get('model', self.model_name),
+                            display_name=f"trend-blog-{prefix_hash}",
+                            system_instruction=prefix,
+                            ttl=timedelta(minutes=ttl_minutes)
+                        )
+                    )
+                    model = genai.GenerativeModel.from_cached_content(cached_content=cached_content)
+                    expires_at = time.time() + ttl_minutes * 60
+                    self._log(f"컨텍스트 캐시 등록: {prefix_hash} ({ttl_minutes}분)")
+                except Exception as e:
+                    self._log(f"컨텍스트 캐시 사용 불가, 로컬 prefix 모델로 대체: {str(e)[:100]}")
+            
+            if model is None:
+                model = genai.GenerativeModel(self.model_name, system_instruction=prefix)
+            
+            self._prefix_models[prefix_hash] = {'model': model, 'expires_at': expires_at}
+            return model
+    
+    def _record_context_cache_usage(self, usage_metadata):
+        """응답의 사용량 정보에서 캐시로 절약된 입력 토큰 수를 기록"""
+        if usage_metadata is None:
+            return
+        prompt_tokens = getattr(usage_metadata, 'prompt_token_count', 0) or 0
+        cached_tokens = getattr(usage_metadata, 'cached_content_token_count', 0) or 0
+        with self._prefix_models_lock:
+            self._context_cache_stats['calls'] += 1
+            self._context_cache_stats['prompt_tokens'] += prompt_tokens
+            self._context_cache_stats['cached_tokens'] += cached_tokens
+        if cached_tokens:
+            self._log(f"컨텍스트 캐시 적용: 입력 {prompt_tokens}토큰 중 {cached_tokens}토큰 절약")
+    
+    def _log_context_cache_stats(self):
+        with self._prefix_models_lock:
+            stats = dict(self._context_cache_stats)
+        if stats['calls']:
+            self._log(
+                f"컨텍스트 캐시 통계: {stats['calls']}회 호출, 입력 {stats['prompt_tokens']}토큰 중 "
+                f"{stats['cached_tokens']}토큰 캐시 적용"
+            )
+    
+    def _collect_metrics(self):
+        """스크랩 시점의 브라우저 풀/응답 캐시/속도 제한/컨텍스트 캐시 통계 (metrics 수집 함수)"""
+        pool = self.browser_pool.stats()
+        cache = self.response_cache.stats()
+        limiters = rate_limiter.limiter_stats()
+        with self._prefix_models_lock:
+            context = dict(self._context_cache_stats)
+        
+        cache_requests = []
+        cache_hit_ratio = []
+        for namespace, counters in cache['namespaces'].items():
+            cache_requests.append(({'namespace': namespace, 'result': 'hit'}, counters['hits']))
+            cache_requests.append(({'namespace': namespace, 'result': 'miss'}, counters['misses']))
+            cache_hit_ratio.append(({'namespace': namespace}, counters['hit_rate']))
+        
+        return [
+            ('browser_launches_total', 'counter', 'Chromium launches by the browser pool', [({}, pool['launches'])]),
+            ('browser_warm_hits_total', 'counter', 'Browser pool jobs served by an already running browser', [({}, pool['warm_hits'])]),
+            ('browser_recycles_total', 'counter', 'Browser restarts after the page or memory limit', [({}, pool['recycles'])]),
+            ('browser_alive', 'gauge', 'Running browsers in the pool', [({}, pool['alive'])]),
+            ('llm_cache_requests_total', 'counter', 'Gemini response cache lookups, by namespace and result', cache_requests),
+            ('llm_cache_hit_ratio', 'gauge', 'Gemini response cache hit ratio, by namespace', cache_hit_ratio),
+            ('llm_cache_entries', 'gauge', 'Entries in the Gemini response cache', [({}, cache['entries'])]),
+            ('rate_limit_calls_total', 'counter', 'Successful rate-limited API calls, by model',
+             [({'model': name}, stats['calls']) for name, stats in limiters.items()]),
+            ('rate_limit_retries_total', 'counter', 'Retried API calls (429/5xx), by model',
+             [({'model': name}, stats['retries']) for name, stats in limiters.items()]),
+            ('rate_limit_failures_total', 'counter', 'API calls that failed after retries, by model',
+             [({'model': name}, stats['failures']) for name, stats in limiters.items()]),
+            ('rate_limit_wait_seconds_total', 'counter', 'Time spent waiting for the client-side rate limiter, by model',
+             [({'model': name}, stats['wait_time']) for name, stats in limiters.items()]),
+            ('context_cache_tokens_total', 'counter', 'Prompt tokens sent with a cached prefix, by type (prompt/cached)',
+             [({'type': 'prompt'}, context['prompt_tokens']), ({'type': 'cached'}, context['cached_tokens'])]),
+        ]
+    
+    def start_metrics_server(self, port=None, host=None):
+        """
+        /metrics HTTP 엔드포인트 시작 (인자가 없으면 config의 metrics.port/host)
+        
+        Returns:
+            서버 객체 또는 None (포트 미설정)
+        """
+        metrics_config = self.config.get('metrics', {})
+        if port is None:
+            port = metrics_config.get('port')
+        if port is None:
+            return None
+        host = host or metrics_config.get('host', metrics.DEFAULT_HOST)
+        
+        metrics.REGISTRY.add_collector(self._collect_metrics)
+        server = metrics.start_server(host, int(port))
+        self._log(f"메트릭 엔드포인트 시작: http://{host}:{server.server_address[1]}/metrics")
+        return server
+    
+    def _lookup_response_cache(self, purpose, prompt, generation_config=None, prefix=None):
+        """
+        호출 지점 정책에 따라 응답 캐시 조회
+        
+        Returns:
+            tuple: (캐시 키 또는 None(캐시 비활성), 캐시된 응답 또는 None)
+        """
+        policy = self.llm_cache_policies.get(purpose, {})
+        if not policy.get('enabled') or purpose in getattr(self._cache_bypass, 'purposes', ()):
+            return None, None
+        cache_key = self.response_cache.make_key(
+            self.model_name, purpose, self.prompts.version,
+            json.dumps(generation_config, sort_keys=True), prefix or '', prompt
+        )
+        cached = self.response_cache.get(cache_key, namespace=purpose)
+        if cached is not None:
+            self._log(f"Gemini 응답 캐시 적중 ({purpose})")
+        return cache_key, cached
+    
+    def _store_response_cache(self, purpose, cache_key, text):
+        # 빈 응답은 저장하지 않음 (다음 호출에서 다시 생성)
+        if cache_key and text and text.strip():
+            ttl = self.llm_cache_policies.get(purpose, {}).get('ttl_hours')
+            self.response_cache.set(cache_key, text, ttl=ttl * 3600 if ttl else None, namespace=purpose)
+    
+    def _stream_article(self, prompt, keyword, on_chunk=None, prefix=None):
+        """
+        Gemini 스트리밍 응답으로 본문 생성
+        
+        도착한 청크는 blog_posts의 임시 파일(*.md.partial)에 바로 기록되며,
+        on_chunk(delta, text)가 False를 반환하면 생성을 중단한다.
+        완료 시 임시 파일은 삭제되고, 실패/중단 시에는 확인용으로 남겨 둔다.
+        
+        Args:
+            prompt: 본문 프롬프트
+            keyword: 키워드 (임시 파일 이름용)
+            on_chunk: 청크마다 호출되는 콜백 (delta, 지금까지의 전체 텍스트)
+            prefix: 고정 지침 (지정 시 컨텍스트 캐시 모델에 등록하고 prompt만 전송)
+            
+        Returns:
+            str: 전체 본문 텍스트
+        """
+        cache_key, cached = self._lookup_response_cache('article', prompt, prefix=prefix)
+        if cached is not None:
+            if on_chunk is not None:
+                on_chunk(cached, cached)
+            return cached
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        partial_path = os.path.join(self.blog_posts_dir, f"{timestamp}_{keyword}.md.partial")
+        
+        started = time.perf_counter()
+        first_token_at = None
+        output_tokens = None
+        usage_metadata = None
+        parts = []
+        model = self._get_prefix_model(prefix) if prefix else self.model
+        
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            # 스트림 시작 요청만 재시도 (청크 수신 후에는 중복 출력이 생기므로 재시도하지 않음)
+            response = self._call_gemini(lambda: model.generate_content(prompt, stream=True), prompt, 'article', stream=True)
+            # 중단/오류로 끝까지 읽지 않아도 동시 호출 슬롯을 반납하도록 닫음
+            with contextlib.closing(response):
+                for chunk in response:
+                    try:
+                        delta = chunk.text
+                    except ValueError:
+                        # 텍스트 없는 청크 (안전 필터 정보 등)
+                        delta = ''
+                    
+                    usage = getattr(chunk, 'usage_metadata', None)
+                    if usage is not None and getattr(usage, 'candidates_token_count', None):
+                        output_tokens = usage.candidates_token_count
+                        usage_metadata = usage
+                    
+                    if not delta:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    
+                    parts.append(delta)
+                    f.write(delta)
+                    f.flush()
+                    
+                    if on_chunk is not None and on_chunk(delta, ''.join(parts)) is False:
+                        self._log(f"스트리밍 생성 중단 요청 (부분 결과: {partial_path})")
+                        raise GenerationAborted(keyword)
+        
+        text = ''.join(parts)
+        self._record_context_cache_usage(usage_metadata)
+        elapsed = time.perf_counter() - started
+        ttft = (first_token_at - started) if first_token_at is not None else elapsed
+        generation_time = elapsed - ttft
+        
+        self.last_generation_stats = {
+            'ttft': round(ttft, 3),
+            'elapsed': round(elapsed, 3),
+            'chars': len(text),
+            'output_tokens': output_tokens,
+            'tokens_per_sec': round(output_tokens / generation_time, 1) if output_tokens and generation_time > 0 else None,
+        }
+        tokens_text = (
+            f"{output_tokens}토큰, {self.last_generation_stats['tokens_per_sec']}토큰/초"
+            if self.last_generation_stats['tokens_per_sec'] else f"{len(text)}자"
+        )
+        self._log(f"스트리밍 생성 완료: 첫 토큰 {ttft:.2f}초, 전체 {elapsed:.2f}초 ({tokens_text})")
+        self._record_llm_call(
+            'article', count_tokens(prompt), usage_metadata, latency=elapsed,
+            stream=True, ttft_ms=round(ttft * 1000, 1)
+        )
+        
+        self._store_response_cache('article', cache_key, text)
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+        return text
             
     def _send_telegram_notification(self, message):
         """텔레그램 알림 전송"""
@@ -67,38 +659,35 @@ class TrendBlogSystem:
             return
             
         try:
-            import requests
-            url = f"https://api.telegram.org/bot{self.tg_token}/sendMessage"
+            url = f"{self.telegram_api_base}/bot{self.tg_token}/sendMessage"
             data = {
                 "chat_id": self.tg_chat_id,
                 "text": message,
                 "parse_mode": "Markdown"
             }
-            response = requests.post(url, data=data, timeout=10)
+            response = self._http('POST', url, 'telegram.send_message', data=data, timeout=10)
             response.raise_for_status()
         except Exception as e:
             error_details = f"{e}"
             if 'response' in locals():
                 error_details += f" (응답: {response.text})"
-            self._log(f"텔레그램 알림 전송 실패: {error_details}")
+            self._log(f"텔레그램 알림 전송 실패: {error_details}", level='ERROR')
     
-    def _load_used_keywords(self):
-        """이미 사용된 키워드 목록 불러오기"""
-        try:
-            with open(self.used_keywords_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            self._log(f"키워드 파일 로드 오류: {e}")
-            return []
+    def _http(self, method, url, span_name, **kwargs):
+        """
+        외부 HTTP 요청 (requests) - 상태 코드와 응답 크기를 트레이스 스팬에 기록
+        URL에 API 키/토큰이 포함될 수 있어 스팬에는 호스트만 남긴다.
+        """
+        import requests
+        import urllib.parse
+        
+        with self.tracer.span(span_name, kind='http', method=method, host=urllib.parse.urlparse(url).netloc) as span:
+            response = requests.request(method, url, **kwargs)
+            span.set(status_code=response.status_code, bytes=len(response.content))
+            if response.status_code >= 400:
+                span.set(outcome='http_error')
+            return response
     
-    def _save_used_keywords(self, keywords):
-        """사용된 키워드 목록 저장"""
-        try:
-            with open(self.used_keywords_file, 'w', encoding='utf-8') as f:
-                json.dump(keywords, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            self._log(f"키워드 파일 저장 오류: {e}")
-
     def _load_config(self):
         """시스템 설정 불러오기"""
         default_config = {
@@ -112,7 +701,7 @@ class TrendBlogSystem:
                 self._save_config(default_config)
                 return default_config
         except Exception as e:
-            self._log(f"설정 파일 로드 오류: {e}")
+            self._log(f"설정 파일 로드 오류: {e}", level='ERROR')
             return default_config
 
     def _save_config(self, config):
@@ -121,9 +710,60 @@ class TrendBlogSystem:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, ensure_ascii=False, indent=2)
         except Exception as e:
-            self._log(f"설정 파일 저장 오류: {e}")
+            self._log(f"설정 파일 저장 오류: {e}", level='ERROR')
+    
+    def get_trending_keywords(self, region='south_korea', force_refresh=False):
+        """
+        구글 트렌드에서 실시간 인기 검색어 가져오기 (캐시 우선)
+        
+        Args:
+            region: 지역 (캐시 키)
+            force_refresh: True이면 캐시를 무시하고 새로 가져옴
+        """
+        if self.keyword_service:
+            try:
+                with self.tracer.span('keyword_service.trends', kind='http'):
+                    keywords = self.keyword_service.get_trending_keywords(region, force_refresh=force_refresh)
+                self._log(f"키워드 서비스에서 {len(keywords)}개 키워드 획득")
+                return keywords
+            except KeywordServiceError as e:
+                self._log(f"키워드 서비스 사용 불가, 직접 가져옵니다: {e}", level='WARNING')
+        
+        if not force_refresh:
+            keywords, state, age = self.trends_cache.lookup(region)
+            metrics.TRENDS_CACHE.inc(state=state)
+            if state == TrendsCache.FRESH:
+                self._log(f"캐시된 트렌드 키워드 사용 ({len(keywords)}개, {age:.0f}초 전)")
+                return keywords
+            if state == TrendsCache.STALE:
+                self._log(f"만료된 트렌드 캐시 반환 ({age:.0f}초 전), 백그라운드에서 갱신합니다.")
+                self._refresh_trends_in_background(region)
+                return keywords
+        
+        return self._fetch_trending_keywords(region, force=True)
     
-    def get_trending_keywords(self, region='south_korea'):
+    def _refresh_trends_in_background(self, region):
+        """다른 곳에서 갱신 중이 아니면 별도 스레드에서 트렌드 캐시 갱신"""
+        if self.trends_cache.is_refreshing(region):
+            return
+        thread = threading.Thread(
+            target=self._fetch_trending_keywords,
+            args=(region,),
+            name='trends-refresh',
+            daemon=True
+        )
+        thread.start()
+    
+    def _fetch_trending_keywords(self, region='south_korea', force=False):
+        """
+        Playwright로 Google Trends를 스크래핑하고 성공 시 캐시에 저장
+        """
+        with self.trends_cache.refresh_lock(region, force=force) as should_refresh:
+            if not should_refresh:
+                return self.trends_cache.lookup(region)[0] or []
+            return self._scrape_trending_keywords(region)
+    
+    def _scrape_trending_keywords(self, region):
         """
         구글 트렌드에서 실시간 인기 검색어 가져오기 (Playwright 사용)
         """
@@ -132,27 +772,21 @@ class TrendBlogSystem:
             
             keywords = []
             
-            # 1. Playwright로 실제 Google Trends 페이지 스크래핑
+            # 1. Playwright로 실제 Google Trends 페이지 스크래핑 (공유 브라우저 풀 사용)
             try:
-                self._log("Playwright import 시도 중...")
-                from playwright.sync_api import sync_playwright
-                
                 self._log("Playwright로 Google Trends 페이지 접근 중...")
                 
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True)
-                    page = browser.new_page()
-                    
+                def scrape_trends(page):
                     # Google Trends 페이지 접속
                     self._log("Google Trends 페이지 로딩 중...")
-                    page.goto('https://trends.google.co.kr/trending?geo=KR&hours=24', timeout=60000)
+                    page.goto(self.source_urls['trends'], timeout=60000)
                     
                     # 페이지 로딩 대기
                     self._log("트렌드 데이터 로딩 대기 중...")
                     page.wait_for_selector('tr[role="row"]', timeout=15000)
                     
                     # JavaScript로 키워드 추출
-                    keywords = page.evaluate('''() => {
+                    return page.evaluate('''() => {
                         const rows = document.querySelectorAll('tr[role="row"]');
                         const keywords = [];
                         rows.forEach(row => {
@@ -166,25 +800,29 @@ class TrendBlogSystem:
                         });
                         return keywords;
                     }''')
-                    
-                    browser.close()
-                    
-                    if keywords:
-                        self._log(f"Playwright로 {len(keywords)}개 키워드 획득")
-                        return keywords
+                
+                with self.tracer.span('browser.trends', kind='browser') as span:
+                    keywords = self.browser_pool.run(scrape_trends)
+                    span.set(items=len(keywords or []))
+                
+                if keywords:
+                    self._log(f"Playwright로 {len(keywords)}개 키워드 획득")
+                    # 더미 데이터는 캐시하지 않고 실제 스크래핑 결과만 저장
+                    self.trends_cache.set(region, keywords)
+                    return keywords
                         
             except Exception as playwright_error:
                 import traceback
                 error_msg = str(playwright_error) if str(playwright_error) else "알 수 없는 오류"
-                self._log(f"Playwright 트렌드 가져오기 실패: {error_msg}")
-                self._log(f"상세 에러:\n{traceback.format_exc()}")
+                self._log(f"Playwright 트렌드 가져오기 실패: {error_msg}", level='ERROR')
+                self._log(f"상세 에러:\n{traceback.format_exc()}", level='ERROR')
 
             # 4. 모든 방법 실패 시 테스트용 더미 데이터 반환
-            self._log("모든 트렌드 소스 가져오기 실패. 테스트용 더미 데이터를 사용합니다.")
+            self._log("모든 트렌드 소스 가져오기 실패. 테스트용 더미 데이터를 사용합니다.", level='WARNING')
             return ['생성형 AI', '파이썬 자동화', '주말 날씨', '최신 영화 순위', '맛집 추천']
         
         except Exception as e:
-            self._log(f"트렌드 가져오기 치명적 오류: {e}")
+            self._log(f"트렌드 가져오기 치명적 오류: {e}", level='ERROR')
             return ['테스트 키워드']
     
     def fetch_google_news(self, keyword, max_news=3):
@@ -194,25 +832,26 @@ class TrendBlogSystem:
         Returns:
             list: [{'title': str, 'url': str, 'image': str, 'summary': str, 'source': str}, ...]
         """
+        if self.keyword_service:
+            try:
+                with self.tracer.span('keyword_service.news', kind='http'):
+                    return self.keyword_service.fetch_google_news(keyword, max_news=max_news)
+            except KeywordServiceError as e:
+                self._log(f"키워드 서비스 뉴스 조회 실패, 직접 가져옵니다: {e}", level='WARNING')
+        
         try:
             self._log(f"'{keyword}' 관련 Google 뉴스 검색 중...")
             
-            from playwright.sync_api import sync_playwright
             import urllib.parse
             
-            news_list = []
-            
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                
+            def scrape_news(page):
                 # Google 뉴스 검색
-                search_url = f"https://www.google.com/search?q={urllib.parse.quote(keyword)}&tbm=nws&hl=ko"
+                search_url = self.source_urls['news_search'].format(query=urllib.parse.quote(keyword))
                 page.goto(search_url, timeout=30000)
                 page.wait_for_timeout(2000)
                 
                 # 뉴스 항목 추출
-                news_data = page.evaluate('''() => {
+                return page.evaluate('''() => {
                     const newsItems = [];
                     const articles = document.querySelectorAll('div.SoaBEf, div.WlydOe');
                     
@@ -273,15 +912,17 @@ class TrendBlogSystem:
                     
                     return newsItems;
                 }''')
-                
-                browser.close()
-                
-                if news_data:
-                    self._log(f"{len(news_data)}개의 뉴스 항목 발견")
-                    return news_data[:max_news]
+            
+            with self.tracer.span('browser.news', kind='browser') as span:
+                news_data = self.browser_pool.run(scrape_news)
+                span.set(items=len(news_data or []))
+            
+            if news_data:
+                self._log(f"{len(news_data)}개의 뉴스 항목 발견")
+                return news_data[:max_news]
                 
         except Exception as e:
-            self._log(f"Google 뉴스 가져오기 실패: {e}")
+            self._log(f"Google 뉴스 가져오기 실패: {e}", level='ERROR')
         
         return []
     
@@ -292,7 +933,6 @@ class TrendBlogSystem:
         try:
             self._log(f"'{keyword}' 관련 AI 이미지 생성 시도 중...")
             import os
-            import requests
             from datetime import datetime
             api_key = os.getenv('GEMINI_API_KEY')
             if not api_key:
@@ -300,7 +940,9 @@ class TrendBlogSystem:
                 return None
                 
             # Imagen 4.0 API 호출 (REST)
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/imagen-4.0-generate-001:predict?key={api_key}"
+            image_model = 'imagen-4.0-generate-001'
+            api_base = self.gemini_api_base or "https://generativelanguage.googleapis.com"
+            url = f"{api_base}/v1beta/models/{image_model}:predict?key={api_key}"
             
             # 보다 구체적인 이미지 생성을 위한 프롬프트 가공
             prompt = f"A professional, photorealistic blog header image for the topic: '{keyword}'. High quality, centered composition, no text."
@@ -310,7 +952,21 @@ class TrendBlogSystem:
                 "parameters": {"sampleCount": 1}
             }
             
-            response = requests.post(url, json=data, timeout=30)
+            def predict():
+                response = self._http('POST', url, 'imagen.predict', json=data, timeout=30)
+                if response.status_code in rate_limiter.RETRYABLE_STATUS_CODES:
+                    raise rate_limiter.RetryableError(
+                        f"HTTP {response.status_code}: {response.text[:100]}",
+                        status_code=response.status_code,
+                        retry_after=rate_limiter.parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                return response
+            
+            try:
+                response = self._call_with_rate_limit(image_model, predict)
+            except rate_limiter.RetryableError as e:
+                self._log(f"AI 이미지 생성 실패 (재시도 한도 초과): {e}", level='WARNING')
+                return None
             
             if response.status_code == 200:
                 result = response.json()
@@ -323,7 +979,7 @@ class TrendBlogSystem:
                         
                         # 로컬 저장
                         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                        filename = f"ai_featured_{timestamp}.png"
+                        filename = f"ai_featured_{timestamp}_{keyword}.png"
                         filepath = os.path.join(self.blog_posts_dir, 'images', filename)
                         
                         if not os.path.exists(os.path.join(self.blog_posts_dir, 'images')):
@@ -337,12 +993,22 @@ class TrendBlogSystem:
                         return f"images/{filename}"
             
             # 실패 시 로그 남기고 None 반환 (자동으로 기존 구글 이미지 fetch로 넘어감)
-            self._log(f"AI 이미지 생성 실패 (HTTP {response.status_code}): {response.text[:100]}")
+            self._log(f"AI 이미지 생성 실패 (HTTP {response.status_code}): {response.text[:100]}", level='ERROR')
             return None
         except Exception as e:
-            self._log(f"AI 이미지 생성 중 오류: {e}")
+            self._log(f"AI 이미지 생성 중 오류: {e}", level='ERROR')
             return None
 
+    def _fetch_featured_image(self, keyword):
+        """
+        대표 이미지 가져오기 (AI 우선, 실패 시 Google)
+        """
+        featured_image = self.fetch_ai_image(keyword)
+        if not featured_image:
+            self._log("AI 이미지 생성 실패 또는 권한 없음. Google 이미지를 사용합니다.", level='WARNING')
+            featured_image = self.fetch_google_image(keyword)
+        return featured_image
+
     def fetch_google_image(self, keyword):
         """
         Google 이미지 검색에서 첫 번째 이미지 URL 가져오기
@@ -350,38 +1016,43 @@ class TrendBlogSystem:
         Returns:
             str: 이미지 URL 또는 None
         """
+        if self.keyword_service:
+            try:
+                with self.tracer.span('keyword_service.image', kind='http'):
+                    return self.keyword_service.fetch_google_image(keyword)
+            except KeywordServiceError as e:
+                self._log(f"키워드 서비스 이미지 조회 실패, 직접 가져옵니다: {e}", level='WARNING')
+        
         try:
             self._log(f"'{keyword}' 관련 Google 이미지 검색 중...")
             
-            from playwright.sync_api import sync_playwright
             import urllib.parse
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                
+            def scrape_image(page):
                 # Google 이미지 검색
-                search_url = f"https://www.google.com/search?q={urllib.parse.quote(keyword)}&tbm=isch&hl=ko"
+                search_url = self.source_urls['image_search'].format(query=urllib.parse.quote(keyword))
                 page.goto(search_url, timeout=30000)
                 page.wait_for_timeout(2000)
                 
                 # 첫 번째 이미지 URL 추출
-                image_url = page.evaluate('''() => {
+                return page.evaluate('''() => {
                     const img = document.querySelector('img[data-src], img.rg_i');
                     if (img) {
                         return img.src || img.getAttribute('data-src');
                     }
                     return null;
                 }''')
-                
-                browser.close()
-                
-                if image_url and image_url.startswith('http'):
-                    self._log(f"대표 이미지 발견: {image_url[:50]}...")
-                    return image_url
+            
+            with self.tracer.span('browser.image_search', kind='browser') as span:
+                image_url = self.browser_pool.run(scrape_image)
+                span.set(items=1 if image_url else 0)
+            
+            if image_url and image_url.startswith('http'):
+                self._log(f"대표 이미지 발견: {image_url[:50]}...")
+                return image_url
                 
         except Exception as e:
-            self._log(f"Google 이미지 가져오기 실패: {e}")
+            self._log(f"Google 이미지 가져오기 실패: {e}", level='ERROR')
         
     def fetch_youtube_video(self, keyword):
         """
@@ -389,12 +1060,12 @@ class TrendBlogSystem:
         """
         try:
             self._log(f"'{keyword}' 관련 YouTube 영상 검색 중...")
-            import requests
             import re
+            import urllib.parse
             search_query = f"{keyword} 최신 뉴스"
-            url = f"https://www.youtube.com/results?search_query={search_query}"
+            url = self.source_urls['youtube_search'].format(query=urllib.parse.quote(search_query))
             headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._http('GET', url, 'youtube.search', headers=headers, timeout=10)
             
             if response.status_code == 200:
                 # 비디오 목록에서 실제 검색 결과 비디오 ID만 추출하기 위해 "videoRenderer" 패턴 사용
@@ -420,44 +1091,53 @@ class TrendBlogSystem:
             
             return None
         except Exception as e:
-            self._log(f"YouTube 영상 검색 실패: {e}")
+            self._log(f"YouTube 영상 검색 실패: {e}", level='ERROR')
             return None
 
-    def get_related_posts(self, current_keyword):
+    def get_related_posts(self, current_keyword, context=None, category=None):
         """
-        기존 게시물 중 현재 키워드와 연관성 높은 2개 선정
+        기존 게시물 중 현재 키워드와 연관성 높은 글 선정 (관련 글 색인의 유사도 순)
+        
+        Args:
+            current_keyword: 키워드
+            context: 유사도 계산에 함께 쓸 텍스트 (뉴스 제목/요약 등)
+            category: 분류 카테고리 (같은 카테고리 글 우선)
+        
+        Returns:
+            list: [{'title', 'filename', 'score'}, ...]
         """
         try:
-            if not os.path.exists(self.blog_posts_dir):
-                return []
-                
-            all_files = [f for f in os.listdir(self.blog_posts_dir) if f.endswith('.md')]
-            if not all_files:
-                return []
-            
-            # 현재 키워드 제외
-            other_files = [f for f in all_files if current_keyword not in f]
-            if not other_files:
-                return []
-            
-            # 간단하게 최근 게시물 2개 반환
-            other_files.sort(reverse=True)
-            related = []
-            for f in other_files[:2]:
-                # 파일명에서 키워드 추출 (timestamp_keyword.md)
-                parts = f.replace('.md', '').split('_')
-                if len(parts) >= 3:
-                    title = " ".join(parts[2:]) # 언더스코어가 더 있을 수 있으므로
-                    related.append({'title': title, 'filename': f})
-                else:
-                    # 형식이 다르면 그냥 파일명 사용
-                    related.append({'title': f.replace('.md', ''), 'filename': f})
-            return related
+            entries = self._related_entries(current_keyword, context, category)
+            return [{'title': entry['title'] or entry['keyword'], 'filename': entry['filename'], 'score': score}
+                    for score, entry in entries]
         except Exception as e:
-            self._log(f"관련 게시물 검색 실패: {e}")
+            self._log(f"관련 게시물 검색 실패: {e}", level='ERROR')
             return []
-            
     
+    def _related_entries(self, current_keyword, context=None, category=None, where=None):
+        """
+        유사도 상위 글, 부족하면 최근 글로 채움
+        
+        Returns:
+            list: [(점수, 카탈로그 항목), ...] (최근 글로 채운 항목의 점수는 0)
+        """
+        k = self.related_top_k
+        with self.tracer.span('related_lookup') as span:
+            related = self.related_index.top_k(current_keyword, context=context, category=category, k=k, where=where)
+            span.set(matched=len(related))
+        
+        if len(related) < k:
+            chosen = {entry['filename'] for _, entry in related}
+            for entry in self.post_catalog.list(limit=k + 20):
+                if len(related) >= k:
+                    break
+                if entry['filename'] in chosen or current_keyword in entry['filename']:
+                    continue
+                if where is not None and not where(entry):
+                    continue
+                related.append((0.0, entry))
+        return related
+
     def select_keyword(self, keywords):
         """
         사용되지 않은 첫 번째 키워드 선택
@@ -468,49 +1148,215 @@ class TrendBlogSystem:
         Returns:
             str: 선택된 키워드 또는 None
         """
-        used_keywords = self._load_used_keywords()
+        selected = self.select_keywords(keywords, limit=1)
+        return selected[0] if selected else None
+
+    def select_keywords(self, keywords, limit=1, categories=None):
+        """
+        사용되지 않은 키워드를 순서대로 최대 limit개 선택
+        
+        Args:
+            keywords: 키워드 리스트 (트렌드 순위 순)
+            limit: 선택할 최대 개수
+            categories: 허용할 카테고리 목록 (지정 시 분류 캐시 기준으로 필터링)
+        
+        Returns:
+            list: 선택된 키워드 리스트
+        """
+        used_keywords = self.keyword_store.used_among(keywords)
+        allowed = set(categories) if categories else None
+        selected = []
+        dedupe = self._get_keyword_dedupe()
+        # 이번에 함께 선택된 키워드끼리도 유사 중복 검사
+        selected_index = KeywordDedupeIndex(threshold=dedupe.threshold) if dedupe is not None else None
         
         for keyword in keywords:
-            if keyword not in used_keywords:
-                self._log(f"선택된 키워드: {keyword}")
-                return keyword
+            if keyword in used_keywords or keyword in selected:
+                continue
+            if allowed is not None:
+                classification = self._get_cached_classification(keyword)
+                if classification is None or classification[0] not in allowed:
+                    continue
+            if dedupe is not None and self._is_duplicate_keyword(keyword, dedupe, selected_index):
+                continue
+            selected.append(keyword)
+            if selected_index is not None:
+                selected_index.add(keyword, {'kind': 'selected'})
+            if len(selected) >= limit:
+                break
         
-        self._log("사용 가능한 새로운 키워드가 없습니다.")
-        return None
+        if selected:
+            self._log(f"선택된 키워드: {', '.join(selected)}")
+        elif allowed is not None:
+            self._log(f"카테고리 조건({', '.join(sorted(allowed))})에 맞는 새로운 키워드가 없습니다.")
+        else:
+            self._log("사용 가능한 새로운 키워드가 없습니다.")
+        return selected
+
+    def _get_keyword_dedupe(self):
+        """
+        유사 키워드 색인 (사용 중인 키워드 + 최근 포스트 제목 구절, rebuild_hours마다 다시 구성)
+        
+        Returns:
+            KeywordDedupeIndex 또는 None (비활성화 시)
+        """
+        config = self.keyword_dedupe_config
+        if not config.get('enabled', True):
+            return None
+        
+        with self._keyword_dedupe_lock:
+            # 오래 실행되는 스케줄러에서도 만료된 키워드가 다시 허용되도록 주기적으로 재구성
+            if self._keyword_dedupe is not None and time.time() - self._keyword_dedupe_built < config['rebuild_hours'] * 3600:
+                return self._keyword_dedupe
+            
+            started = time.perf_counter()
+            dedupe = KeywordDedupeIndex(threshold=config['threshold'])
+            for entry in self.keyword_store.entries(include_expired=False):
+                dedupe.add(entry['keyword'], {'kind': 'keyword', 'keyword': entry['keyword'], 'post_path': entry['post_path']})
+            
+            since = time.time() - config['title_days'] * 86400
+            for post in self.post_catalog.list(limit=config['recent_posts']):
+                if post['created_at'] < since or not post['title']:
+                    continue
+                source = {'kind': 'title', 'keyword': post['keyword'], 'post_path': post['path']}
+                for phrase in title_phrases(post['title']):
+                    dedupe.add(phrase, source)
+            
+            self._keyword_dedupe = dedupe
+            self._keyword_dedupe_built = time.time()
+            self._log(f"유사 키워드 색인 구성: {len(dedupe)}개 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+            return dedupe
+    
+    def _is_duplicate_keyword(self, keyword, dedupe, selected_index=None):
+        """
+        사용된 키워드/최근 포스트와 유사한 키워드인지 검사
+        (action이 'merge'면 기존 포스트에 연결해 사용된 키워드로 기록)
+        """
+        matches = dedupe.find(keyword)
+        if not matches and selected_index is not None:
+            matches = selected_index.find(keyword)
+        if not matches:
+            return False
+        
+        score, matched, source = matches[0]
+        source = source or {}
+        kind = {'keyword': '사용된 키워드', 'title': '최근 포스트 제목', 'selected': '함께 선택된 키워드'}.get(source.get('kind'), '기존 항목')
+        if self.keyword_dedupe_config['action'] == 'merge' and source.get('kind') in ('keyword', 'title'):
+            self.keyword_store.mark_used(keyword, post_path=source.get('post_path'))
+            self._log(f"유사 키워드 병합: '{keyword}' → {kind} '{matched}' (유사도 {score:.2f})")
+        else:
+            self._log(f"유사 키워드 건너뜀: '{keyword}' ≈ {kind} '{matched}' (유사도 {score:.2f})")
+        return True
+    
+    def _classification_cache_key(self, keyword):
+        return self.response_cache.make_key(self.model_name, 'classification', self.prompts.version, keyword.strip())
+
+    def _get_cached_classification(self, keyword):
+        """
+        분류 캐시에서 키워드 카테고리 조회
+        
+        Returns:
+            tuple: (category, focus) 또는 None
+        """
+        cached = self.response_cache.get(self._classification_cache_key(keyword), namespace='classification')
+        if cached is None:
+            return None
+        try:
+            data = json.loads(cached)
+            return data['category'], data['focus']
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _set_cached_classification(self, keyword, category, focus):
+        ttl = self.llm_cache_policies.get('category', {}).get('ttl_hours', 72)
+        self.response_cache.set(
+            self._classification_cache_key(keyword),
+            json.dumps({'category': category, 'focus': focus}, ensure_ascii=False),
+            ttl=ttl * 3600 if ttl else None,
+            namespace='classification'
+        )
+
+    def classify_keywords(self, keywords):
+        """
+        여러 키워드를 한 번의 Gemini 요청(JSON 응답)으로 분류하여 분류 캐시에 저장
+        
+        이미 분류된 키워드는 요청에서 제외되며, 키워드가 많으면 
+        config의 classification_batch_size 단위로 나누어 요청한다.
+        
+        Args:
+            keywords: 키워드 리스트
+        
+        Returns:
+            dict: {keyword: (category, focus)} - 분류에 실패한 키워드는 포함되지 않음
+        """
+        results = {}
+        pending = []
+        for keyword in dict.fromkeys(keywords):
+            cached = self._get_cached_classification(keyword)
+            if cached is not None:
+                results[keyword] = cached
+            else:
+                pending.append(keyword)
+        
+        if not pending or not self.client_ready:
+            return results
+        
+        chunk_size = max(1, int(self.config.get('classification_batch_size', 30)))
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            self._log(f"키워드 일괄 분류 중... ({len(chunk)}개)")
+            try:
+                results.update(self._classify_keyword_chunk(chunk))
+            except Exception as e:
+                self._log(f"키워드 일괄 분류 실패: {e}", level='ERROR')
+        
+        return results
+
+    def _classify_keyword_chunk(self, keywords):
+        prompt = self.prompts.keyword_classification(keywords)
+        
+        text = self._generate_text(prompt, 'classification', generation_config={'response_mime_type': 'application/json'})
+        text = text.strip()
+        # 코드 블록으로 감싸서 응답하는 경우 대비
+        if text.startswith('```'):
+            text = text.strip('`')
+            text = text[text.find('['):]
+        items = json.loads(text)
+        
+        requested = set(keywords)
+        classified = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            keyword = str(item.get('keyword', '')).strip()
+            if keyword not in requested:
+                continue
+            category = str(item.get('category', 'OTHER')).strip().upper()
+            if category not in VALID_CATEGORIES:
+                category = 'OTHER'
+            focus = str(item.get('focus', '')).strip() or "정보 전달 및 개요 설명"
+            self._set_cached_classification(keyword, category, focus)
+            classified[keyword] = (category, focus)
+        
+        missing = requested - set(classified)
+        if missing:
+            self._log(f"일괄 분류 응답에서 누락된 키워드: {', '.join(missing)}")
+        return classified
 
     def _analyze_keyword_category(self, keyword):
         """
         키워드 카테고리 분석 (Gemini 사용) - 세분화된 14개 카테고리
+        classify_keywords로 미리 분류된 키워드는 분류 캐시에서 바로 반환
         """
+        cached = self._get_cached_classification(keyword)
+        if cached is not None:
+            self._log(f"키워드 분석 결과 (분류 캐시): {cached[0]} / {cached[1]}")
+            return cached
+        
         try:
-            prompt = f"""
-            다음 키워드를 분석하여 아래 세부 카테고리 중 하나로 분류하고, 글의 핵심 포커스를 한 문장으로 요약해줘.
-            
-            [키워드] : {keyword}
-            
-            [세부 카테고리]
-            1. SPORTS_MATCH (경기 일정, 결과, 중계 정보)
-            2. SPORTS_GENERAL (선수 이적, 부상, 팀 이슈, 일반 스포츠 뉴스)
-            3. STOCK (개별 주식 종목, 기업 실적, 공시)
-            4. ECONOMY (거시 경제, 부동산, 정책, 환율, 금리)
-            5. SOCIAL_ISSUE (사회적 논란, 쟁점, 찬반 토론)
-            6. SOCIAL_INCIDENT (사건, 사고, 재해, 팩트 중심)
-            7. POLITICS (정치, 선거, 정당, 법안)
-            8. ENTERTAINMENT_NEWS (연예인 가십, 열애, 사건, 근황)
-            9. ENTERTAINMENT_CONTENT (드라마, 영화, 웹툰, 방송 프로그램 리뷰/정보)
-            10. TECH_DEVICE (스마트폰, 가전, 하드웨어 스펙/비교)
-            11. TECH_TREND (IT 서비스, AI, 플랫폼, 소프트웨어 트렌드)
-            12. HEALTH (건강 정보, 질병, 운동, 의학)
-            13. LIVING_INFO (생활 꿀팁, 날씨, 여행, 요리, 쇼핑 정보)
-            14. OTHER (그 외 분류하기 어려운 일반 정보)
+            prompt = self.prompts.category_analysis(keyword)
             
-            [응답 형식]
-            Category: [카테고리명]
-            Focus: [핵심 포커스]
-            """
-            
-            response = self.model.generate_content(prompt)
-            result = response.text.strip()
+            result = self._generate_text(prompt, 'category').strip()
             
             category = "OTHER"
             focus = "정보 전달 및 개요 설명"
@@ -521,408 +1367,181 @@ class TrendBlogSystem:
                 elif line.startswith('Focus:'):
                     focus = line.replace('Focus:', '').strip()
             
-            # 유효한 카테고리인지 확인
-            valid_categories = [
-                'SPORTS_MATCH', 'SPORTS_GENERAL', 
-                'STOCK', 'ECONOMY', 
-                'SOCIAL_ISSUE', 'SOCIAL_INCIDENT', 'POLITICS',
-                'ENTERTAINMENT_NEWS', 'ENTERTAINMENT_CONTENT',
-                'TECH_DEVICE', 'TECH_TREND',
-                'HEALTH', 'LIVING_INFO', 'OTHER'
-            ]
-            
             # 매칭되는 것이 없으면 유사한 것 찾거나 OTHER
-            if category not in valid_categories:
+            if category not in VALID_CATEGORIES:
                 # 공백이나 특수문자 제거 후 비교 등 유연한 처리 가능하나 일단 OTHER
                 category = 'OTHER'
-                
+            
+            self._set_cached_classification(keyword, category, focus)
             self._log(f"키워드 분석 결과: {category} / {focus}")
             return category, focus
             
         except Exception as e:
-            self._log(f"키워드 분석 실패: {e}")
+            self._log(f"키워드 분석 실패: {e}", level='ERROR')
             return "OTHER", "정보 전달"
 
-    def _get_persona_instruction(self):
-        """
-        설정된 페르소나에 따른 글쓰기 지침 반환
-        """
-        if self.persona == 'professional':
-            return """
-            [Persona: Professional (전문가형)]
-            - 말투: 신뢰감 있고 깔끔한 '하십시오체' 또는 단정한 '해요체'를 사용하십시오.
-            - 어조: 객관적이고 권위 있는 정보를 전달하는 전문가의 목소리를 유지하십시오.
-            - 특징: 불필요한 수식어를 줄이고, 정확한 용어와 논리적인 구조로 독자의 이해를 돕습니다.
-            """
-        elif self.persona == 'analytical':
-            return """
-            [Persona: Analytical (분석가형)]
-            - 말투: 논리적이고 객관적인 어조를 사용하십시오. (~입니다, ~함)
-            - 어조: 현상의 이면을 분석하고 데이터나 근거를 바탕으로 다각도의 시각을 제공하십시오.
-            - 특징: 단순 정보 전달을 넘어 '왜' 이런 일이 일어났는지, 앞으로 어떤 영향을 미칠지에 집중합니다.
-            """
-        else:  # friendly (default)
-            return """
-            [Persona: Friendly (친근한 이웃형)]
-            - 말투: 다정하고 친근한 '해요체'를 사용하세요. 가끔 이모지(😊, ✨ 등)를 적절히 섞어주세요.
-            - 어조: 친구에게 이야기하듯 편안하면서도 유익한 정보를 전달하는 따뜻한 목소리입니다.
-            - 특징: 독자의 공감을 이끌어내는 문구(예: "여러분도 궁금하셨죠?", "정말 놀랍지 않나요?")를 포함합니다.
-            """
-
-    def _get_category_prompt(self, keyword, category, news_items_text, news_summary):
+    def _get_prompt_prefix(self, category):
         """
-        세분화된 카테고리별 맞춤 프롬프트 생성 (페르소나 및 팩트체크 포함)
-        """
-        persona_instruction = self._get_persona_instruction()
-        
-        fact_check_instruction = """
-        [Fact-Check 및 정보 통합 지침]
-        - 제공된 여러 뉴스 항목({len(news_items_text)}개)을 면밀히 비교하여 공통된 핵심 사실을 추출하십시오.
-        - 뉴스 간에 내용이 상충되는 경우, 가장 최신의 정보이거나 더 구체적인 보도를 우선시하되, 불확실한 부분은 '~라고 전해졌습니다'와 같은 신중한 표현을 사용하십시오.
-        - 단순히 기사를 나열하지 말고, 전체적인 맥락을 파악하여 하나의 완성된 스토리로 재구성하십시오.
+        (페르소나, 카테고리)별 고정 지침 - 본문 요청마다 동일하므로 컨텍스트 캐시 대상
         """
+        return self.prompts.article_prefix(self.persona, category)
 
-        base_instructions = f"""
-        이 글은 반드시 'front-matter + 본문'을 함께 생성해야 하며,
-        front-matter의 성격은 본문 내용과 정확히 일치해야 한다.
-        
-        {persona_instruction}
-        
-        {fact_check_instruction}
-        
-        [Front-matter 작성 규칙]
-        **중요: 반드시 아래 형식을 정확히 따라야 합니다!**
-        
-        예시:
-        ---
-        title: '제목은 여기에'
-        categories: [정보, 분석]
-        tags: ['태그1', '태그2', '태그3']
-        description: 메타 설명은 여기에
-        ---
-        
-        **주의사항:**
-        - 시작과 끝 모두 정확히 `---` (하이픈 3개)를 사용해야 합니다
-        - `--` (하이픈 2개)는 절대 사용하지 마세요
-        - frontmatter를 ```markdown 코드 블록으로 감싸지 마세요
-        - frontmatter 다음에는 반드시 빈 줄을 하나 넣으세요
-        - title: '{keyword}' + (카테고리별 특성에 맞는 매력적인 제목)
-        - categories: 반드시 [정보, 분석, 후기] 등 적절한 것 선택 (트렌드 사용 금지)
-        - tags: ['{keyword}', 관련태그1, 관련태그2]
-        - description: 글의 핵심 내용을 요약한 메타 설명
-        
-        [공통 작성 원칙]
-        - 가독성을 위해 적절한 소헤더와 불렛 포인트 사용
-        - '최신', '트렌드' 같은 단어 남발 금지
-        - Markdown 형식 준수
+    def _get_prompt_tail(self, keyword, news_items_text, news_summary):
         """
+        요청마다 달라지는 프롬프트 (키워드, 작성 기준일, 참고 뉴스)
+        """
+        return self.prompts.article_tail(
+            keyword=keyword,
+            date=datetime.now().strftime('%Y-%m-%d'),
+            news_count=len(news_items_text),
+            news_summary=news_summary
+        )
 
-        # 1. 스포츠 매치 (경기 중심)
-        if category == 'SPORTS_MATCH':
-            return f"""
-            '{keyword}'에 대한 스포츠 경기 프리뷰 또는 리뷰를 작성해줘.
-            
-            [상황 판단 (현재: {datetime.now().strftime('%Y-%m-%d')})]
-            뉴스 데이터를 바탕으로 경기가 '예정'인지 '종료'인지 파악하여 작성.
-            
-            A. 예정된 경기:
-               - 일정(한국 시간), 장소
-               - **중계 채널 및 시청 방법** (가장 중요하게 다룸)
-               - 양팀 전력/상대 전적/관전 포인트
-               
-            B. 종료된 경기:
-               - **스코어 및 경기 결과**
-               - 주요 하이라이트 장면 설명
-               - 승패 요인 분석 및 선수 활약상
-               - 다음 일정
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-            
-        # 2. 스포츠 일반 (선수, 팀)
-        elif category == 'SPORTS_GENERAL':
-            return f"""
-            '{keyword}'에 대한 스포츠 이슈/선수 정보를 작성해줘.
-            
-            [필수 포함 내용]
-            - 이슈의 핵심 내용 (이적, 부상, 기록 달성 등)
-            - 해당 선수의 최근 활약상 또는 팀 분위기
-            - 팬들의 반응 및 전문가 의견
-            - 향후 예상되는 시나리오
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-            
-        # 3. 주식 (개별 종목)
-        elif category == 'STOCK':
-            return f"""
-            '{keyword}' 주가 흐름 및 기업 이슈 분석 글을 작성해줘.
-            
-            [필수 포함 내용]
-            - 현재 주가 동향 및 최근 흐름
-            - **상승/하락의 구체적 원인** (호재/악재, 실적, 공시)
-            - 증권가 목표가 리포트 및 투자 의견 요약
-            - 향후 주가 전망 및 체크포인트
-            
-            * 주의: "무조건 사라/팔라"는 식의 조언 금지. 객관적 정보 위주.
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-            
-        # 4. 경제 (거시/부동산/정책)
-        elif category == 'ECONOMY':
-            return f"""
-            '{keyword}' 관련 경제/정책 이슈 해설 글을 작성해줘.
-            
-            [필수 포함 내용]
-            - 이슈 개요 및 배경 설명 (초보자도 이해하기 쉽게)
-            - 이것이 우리 삶/경제에 미치는 영향
-            - 찬반 의견이나 다양한 시각
-            - 요약 및 시사점
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-            
-        # 5. 사회 이슈 (논란/쟁점)
-        elif category == 'SOCIAL_ISSUE':
-            return f"""
-            '{keyword}' 관련 사회적 이슈/논란 정리 글을 작성해줘.
-            
-            [필수 포함 내용]
-            - 논란의 발단 및 핵심 쟁점
-            - 각계의 입장 (찬성 vs 반대, 혹은 A측 vs B측)
-            - 대중의 반응 (커뮤니티, 댓글 분위기 등)
-            - 시사하는 바 및 향후 전개 예상
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-
-        # 6. 사회 사건 (팩트 중심)
-        elif category == 'SOCIAL_INCIDENT':
-            return f"""
-            '{keyword}' 사건/사고 종합 정리 글을 작성해줘.
-            
-            [필수 포함 내용]
-            - 사건 발생 일시, 장소, 경위 (육하원칙)
-            - 현재까지의 수사/진행 상황
-            - 피해 규모 또는 사회적 파장
-            - 관련 주의사항 (유사 피해 방지 등)
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-
-        # 7. 정치
-        elif category == 'POLITICS':
-            return f"""
-            '{keyword}' 관련 정치 이슈 브리핑을 작성해줘.
-            
-            [필수 포함 내용]
-            - 이슈의 핵심 내용 및 팩트
-            - 여/야 혹은 관련 정치인들의 발언 및 입장 차이
-            - 이번 사안이 갖는 정치적 의미
-            - 향후 일정 및 예상 시나리오
-            
-            * 최대한 중립적이고 객관적인 톤 유지.
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-
-        # 8. 연예 뉴스 (가십/근황)
-        elif category == 'ENTERTAINMENT_NEWS':
-            return f"""
-            '{keyword}' 관련 연예계 소식을 정리해줘.
-            
-            [필수 포함 내용]
-            - 무슨 일이 있었는지 상세 내용 (기사 내용 기반)
-            - 소속사 공식 입장 혹은 본인 해명
-            - 네티즌/팬들의 반응
-            - 과거 유사 사례 혹은 배경 지식
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-
-        # 9. 연예 콘텐츠 (드라마/영화 리뷰)
-        elif category == 'ENTERTAINMENT_CONTENT':
-            return f"""
-            '{keyword}' (드라마/영화/방송) 프리뷰 또는 리뷰를 작성해줘.
-            
-            [필수 포함 내용]
-            - 기본 정보 (출연진, 줄거리, 방영시간/개봉일)
-            - 관전 포인트 혹은 감상 포인트 (재미 요소)
-            - 시청률/관객수 추이 및 반응
-            - (종영/결말인 경우) 결말 요약 및 해석
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-
-        # 10. 테크 기기 (하드웨어)
-        elif category == 'TECH_DEVICE':
-            return f"""
-            '{keyword}' 제품에 대한 스펙/정보 리뷰를 작성해줘.
-            
-            [필수 포함 내용]
-            - 주요 스펙 및 디자인 특징
-            - 전작 대비 달라진 점 (Upgrades)
-            - 장점 및 단점 (비판적 시각 포함)
-            - 출시일, 가격, 구매 정보
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-
-        # 11. 테크 트렌드 (IT/AI)
-        elif category == 'TECH_TREND':
-            return f"""
-            '{keyword}' 관련 IT/테크 트렌드 분석 글을 작성해줘.
-            
-            [필수 포함 내용]
-            - 기술/서비스의 개념 정의
-            - 최근 화제가 된 이유 (새로운 기능, 업데이트 등)
-            - 업계 동향 및 경쟁사 상황
-            - 향후 전망 및 사용자에게 미치는 영향
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-
-        # 12. 건강
-        elif category == 'HEALTH':
-            return f"""
-            '{keyword}' 관련 건강/의학 정보를 작성해줘.
-            
-            [필수 포함 내용]
-            - 증상 및 원인 설명
-            - 치료 방법 및 예방 수칙
-            - 좋은 음식/나쁜 음식 혹은 생활 습관
-            - 전문가 조언 (뉴스 기반)
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
+    def _build_budgeted_tail(self, keyword, category, prefix, news_items):
+        """
+        프롬프트 토큰 예산(prompt_budget)에 맞게 참고 뉴스를 줄여 가변 부분 생성
+        구간별 토큰 수와 뉴스 축소 결과는 계측 파일에 기록한다.
+        """
+        if not news_items:
+            return self._get_prompt_tail(
+                keyword, [], "관련된 구체적인 뉴스 기사가 없습니다. 일반적인 정보에 기반해 작성해주세요."
+            )
+        
+        prefix_tokens = count_tokens(prefix)
+        fixed_tokens = count_tokens(self._get_prompt_tail(keyword, [], ""))
+        news_budget = min(
+            self.prompt_budget.get('max_news_tokens', 1500),
+            self.prompt_budget.get('max_prompt_tokens', 4000) - prefix_tokens - fixed_tokens
+        )
+        news_summary, news_used, stats = fit_news_items(
+            news_items,
+            budget_tokens=max(news_budget, 1),
+            max_summary_chars=self.prompt_budget.get('max_summary_chars', 300),
+            min_summary_chars=self.prompt_budget.get('min_summary_chars', 60)
+        )
+        if stats['trimmed']:
+            self._log(
+                f"참고 뉴스 축소: {stats['news_available']}개 {stats['news_tokens_original']}토큰 → "
+                f"{news_used}개 {stats['news_tokens']}토큰 (예산 {stats['budget_tokens']})"
+            )
+        
+        self.metrics.record(
+            'prompt_budget',
+            keyword=keyword,
+            category=category,
+            prompt_version=self.prompts.version,
+            sections={'prefix': prefix_tokens, 'tail': fixed_tokens, 'news': stats['news_tokens']},
+            **stats
+        )
+        return self._get_prompt_tail(keyword, news_items[:news_used], news_summary)
 
-        # 13. 생활 정보 (리빙)
-        elif category == 'LIVING_INFO':
-            return f"""
-            '{keyword}' 관련 생활 꿀팁/정보를 작성해줘.
-            
-            [필수 포함 내용]
-            - 이게 왜 필요한지/무엇인지 (관심 유발)
-            - 구체적인 정보 (날씨라면 예보, 축제라면 일정/장소, 요리라면 레시피)
-            - 이용 꿀팁 및 주의사항
-            - 요약
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
-            
-        # 14. 기타 (OTHER)
-        else:
-            return f"""
-            '{keyword}'에 대해 정보를 찾는 사용자를 위한 친절한 설명 글을 작성해줘.
-            
-            [작성 포인트]
-            - '{keyword}'의 정의 및 핵심 개요
-            - 최근 이슈가 된 이유 (있다면)
-            - 사람들이 궁금해할 만한 3가지 포인트
-            - 결론 및 요약
-            
-            [참고 뉴스]
-            {news_summary}
-            
-            {base_instructions}
-            """
+    def _get_category_prompt(self, keyword, category, news_items_text, news_summary):
+        """
+        세분화된 카테고리별 맞춤 프롬프트 생성 (페르소나 및 팩트체크 포함)
+        고정 지침(prefix) 뒤에 키워드/뉴스(tail)를 붙인 전체 프롬프트
+        """
+        return RenderedPrompt(
+            self._get_prompt_prefix(category) + "\n" + self._get_prompt_tail(keyword, news_items_text, news_summary),
+            self.prompts.version
+        )
     
-    def generate_blog_content(self, keyword):
+    def generate_blog_content(self, keyword, on_chunk=None, stream=None):
         """
         선택된 키워드로 카테고리별 맞춤 블로그 콘텐츠 생성
+        
+        Args:
+            keyword: 키워드
+            on_chunk: 스트리밍 생성 시 청크마다 호출되는 콜백 (delta, text) - False 반환 시 중단
+            stream: 스트리밍 생성 여부 (기본값: on_chunk 지정 시 또는 config의 stream_generation)
         """
+        with self.tracer.span('generate_blog_content', keyword=keyword) as span:
+            content = self._generate_blog_content(keyword, on_chunk=on_chunk, stream=stream)
+            if content:
+                span.set(bytes=len(content.encode('utf-8')))
+            else:
+                span.set(outcome='failed')
+            return content
+    
+    def _generate_blog_content(self, keyword, on_chunk=None, stream=None):
+        """generate_blog_content 본체 (리서치 → 본문 생성 → Markdown 조립)"""
+        if stream is None:
+            stream = on_chunk is not None or self.config.get('stream_generation', False)
+        
         if not self.client_ready:
             return f"<h1>{keyword}에 대한 블로그 포스트</h1><p>(API 키 설정 필요)</p>"
         
         try:
             self._log(f"'{keyword}' 키워드로 블로그 콘텐츠 생성 시작...")
-            
-            # 1. Google 뉴스 가져오기
-            news_items = self.fetch_google_news(keyword, max_news=5)
-            
-            # 뉴스 요약 텍스트 생성 (프롬프트 참고용)
-            news_summary = ""
-            if news_items:
-                for idx, item in enumerate(news_items):
-                    news_summary += f"{idx+1}. {item['title']} ({item.get('source', '')}): {item['summary']}\n"
-            else:
-                news_summary = "관련된 구체적인 뉴스 기사가 없습니다. 일반적인 정보에 기반해 작성해주세요."
-
-            # 2. 키워드 카테고리 분석
-            category, category_focus = self._analyze_keyword_category(keyword)
-            
-            # 3. 이미지 가져오기 (AI 우선, 실패 시 Google)
-            featured_image = self.fetch_ai_image(keyword)
-            if not featured_image:
-                self._log("AI 이미지 생성 실패 또는 권한 없음. Google 이미지를 사용합니다.")
-                featured_image = self.fetch_google_image(keyword)
-            
-            # 4. 맞춤형 프롬프트 생성
-            prompt = self._get_category_prompt(keyword, category, news_items, news_summary)
-            
-            self._log(f"Gemini 콘텐츠 생성 중... (Category: {category})")
-            
-            # 5. AI 생성
-            response = self.model.generate_content(prompt)
-            main_content = response.text
-            
-            # 6. 추가 콘텐츠 fetching
-            youtube_embed = self.fetch_youtube_video(keyword)
-            related_posts = self.get_related_posts(keyword)
-            
-            # 7. Markdown 콘텐츠 조립
-            markdown_content = self._build_markdown_content(
-                keyword, main_content, news_items, featured_image, 
-                youtube_embed=youtube_embed, related_posts=related_posts
-            )
+            started = time.time()
+            # 관련 글/본문 서명 색인을 리서치 동안 백그라운드에서 카탈로그와 맞춤
+            self.related_index.warm()
+            if self.content_dedupe_config.get('enabled', True):
+                self.content_index.warm()
+            
+            # 1. 리서치 단계: 서로 독립적인 조회를 동시에 시작
+            with ThreadPoolExecutor(max_workers=5, thread_name_prefix='research') as executor:
+                # (각 작업은 워커 스레드에서도 현재 실행의 하위 스팬으로 기록됨)
+                trace = self.tracer.wrap
+                news_future = executor.submit(trace(self.fetch_google_news, 'news'), keyword, max_news=self.config.get('max_news', 5))
+                category_future = executor.submit(trace(self._analyze_keyword_category, 'category'), keyword)
+                image_future = executor.submit(trace(self._fetch_featured_image, 'featured_image'), keyword)
+                youtube_future = executor.submit(trace(self.fetch_youtube_video, 'youtube'), keyword)
+                
+                # 2. 본문 프롬프트에 필요한 뉴스와 카테고리만 먼저 대기
+                news_items = news_future.result()
+                category, category_focus = category_future.result()
+                
+                # 관련 글은 뉴스 내용과 카테고리까지 반영해 본문 생성과 동시에 조회
+                related_context = ' '.join(f"{news.get('title', '')} {news.get('summary', '')}" for news in news_items or [])
+                related_future = executor.submit(
+                    trace(self.get_related_posts, 'related_posts'), keyword, context=related_context, category=category
+                )
+                
+                # 3. 맞춤형 프롬프트 생성 (고정 지침은 컨텍스트 캐시에 등록하고 키워드/뉴스만 전송)
+                prefix = self._get_prompt_prefix(category)
+                prompt = self._build_budgeted_tail(keyword, category, prefix, news_items)
+                
+                self._log(f"Gemini 콘텐츠 생성 중... (Category: {category})")
+                
+                # 4. AI 생성 (이미지/영상/관련글 조회는 그동안 계속 진행)
+                with self.tracer.span('article', stream=stream) as span:
+                    if stream:
+                        main_content = self._stream_article(prompt, keyword, on_chunk=on_chunk, prefix=prefix)
+                    else:
+                        main_content = self._generate_text(prompt, 'article', prefix=prefix)
+                    span.set(bytes=len((main_content or '').encode('utf-8')))
+                
+                # 5. 나머지 리서치 결과 수집
+                featured_image = image_future.result()
+                youtube_embed = youtube_future.result()
+                related_posts = related_future.result()
+            
+            self._log(f"리서치 및 본문 생성 완료 ({time.time() - started:.1f}초)")
+            
+            # 6. Markdown 콘텐츠 조립 (이미지는 먼저 내려받아 두고 리서치 결과와 함께 보관)
+            with self.tracer.span('build_markdown'):
+                featured_image, news_items = self._localize_images(keyword, featured_image, news_items)
+                self._research.latest = {
+                    'keyword': keyword, 'category': category, 'prefix': prefix, 'prompt': prompt,
+                    'news_items': news_items, 'featured_image': featured_image,
+                    'youtube_embed': youtube_embed, 'related_posts': related_posts,
+                }
+                markdown_content = self._build_markdown_content(
+                    keyword, main_content, news_items, featured_image, 
+                    youtube_embed=youtube_embed, related_posts=related_posts
+                )
             
             self._log("블로그 콘텐츠 생성 완료")
             return markdown_content
         
+        except GenerationAborted:
+            self._log(f"'{keyword}' 콘텐츠 생성이 중단되었습니다.")
+            return None
+        
         except Exception as e:
-            self._log(f"콘텐츠 생성 오류: {e}")
+            self._log(f"콘텐츠 생성 오류: {e}", level='ERROR')
             import traceback
-            self._log(traceback.format_exc())
+            self._log(traceback.format_exc(), level='ERROR')
             return None
     
     def download_image(self, image_url, keyword, index=0):
@@ -933,7 +1552,6 @@ class TrendBlogSystem:
             str: 로컬 이미지 경로 또는 원본 URL
         """
         try:
-            import requests
             import os
             from urllib.parse import urlparse
             
@@ -949,7 +1567,7 @@ class TrendBlogSystem:
             filepath = os.path.join(images_dir, filename)
             
             # 이미지 다운로드
-            response = requests.get(image_url, timeout=10, headers={
+            response = self._http('GET', image_url, 'image.download', timeout=10, headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             })
             
@@ -963,23 +1581,34 @@ class TrendBlogSystem:
                 return relative_path
             
         except Exception as e:
-            self._log(f"이미지 다운로드 실패: {e}")
+            self._log(f"이미지 다운로드 실패: {e}", level='ERROR')
         
         return image_url  # 실패 시 원본 URL 반환
     
-    def _build_markdown_content(self, keyword, main_content, news_items, featured_image, youtube_embed=None, related_posts=None):
+    def _localize_images(self, keyword, featured_image, news_items):
         """
-        Markdown 콘텐츠 생성 (Frontmatter 포함)
+        대표 이미지와 뉴스 이미지를 내려받아 로컬 경로로 교체
+        (본문만 다시 생성해 Markdown을 새로 조립할 때 같은 이미지를 다시 내려받지 않도록 한 번만 수행)
+        
+        Returns:
+            tuple: (대표 이미지 경로, 이미지 경로를 바꾼 뉴스 목록)
         """
-        # 대표 이미지 처리
-        local_featured_image = None
-        if featured_image:
-            if featured_image.startswith('http'):
-                local_featured_image = self.download_image(featured_image, keyword, 'featured')
-            else:
-                # 이미 로컬 경로인 경우 (AI 생성 등)
-                local_featured_image = featured_image
+        # AI 생성 이미지는 이미 로컬 경로
+        if featured_image and featured_image.startswith('http'):
+            featured_image = self.download_image(featured_image, keyword, 'featured')
         
+        localized = []
+        for idx, news in enumerate(news_items or []):
+            news_image = news.get('image', '')
+            if news_image and news_image.startswith('http'):
+                news = {**news, 'image': self.download_image(news_image, keyword, f'news_{idx}')}
+            localized.append(news)
+        return featured_image, localized
+    
+    def _build_markdown_content(self, keyword, main_content, news_items, featured_image, youtube_embed=None, related_posts=None):
+        """
+        Markdown 콘텐츠 생성 (Frontmatter 포함, 이미지는 _localize_images로 내려받은 경로를 그대로 사용)
+        """
         # 날짜 생성
         today = datetime.now().strftime('%Y-%m-%d')
         
@@ -997,19 +1626,19 @@ class TrendBlogSystem:
                 markdown += frontmatter
                 
                 # 대표 이미지 추가 (Frontmatter 직후)
-                if local_featured_image:
-                    markdown += f"![{keyword}]({local_featured_image})\n\n"
+                if featured_image:
+                    markdown += f"![{keyword}]({featured_image})\n\n"
                 
                 markdown += f"{body}\n\n"
             else:
                 # Frontmatter 형식이 이상하면 그냥 합치기
-                if local_featured_image:
-                    markdown += f"![{keyword}]({local_featured_image})\n\n"
+                if featured_image:
+                    markdown += f"![{keyword}]({featured_image})\n\n"
                 markdown += f"{main_content}\n\n"
         else:
             # Frontmatter가 없는 경우 (만약을 대비해)
-            if local_featured_image:
-                markdown += f"![{keyword}]({local_featured_image})\n\n"
+            if featured_image:
+                markdown += f"![{keyword}]({featured_image})\n\n"
             markdown += f"{main_content}\n\n"
         
         # YouTube 섹션 추가
@@ -1020,12 +1649,8 @@ class TrendBlogSystem:
         # 뉴스 섹션 추가
         if news_items:
             markdown += "## 📰 관련 뉴스\n\n"
-            for idx, news in enumerate(news_items):
-                # 뉴스 이미지 다운로드
+            for news in news_items:
                 news_image = news.get('image', '')
-                if news_image and news_image.startswith('http'):
-                    news_image = self.download_image(news_image, keyword, f'news_{idx}')
-                
                 markdown += f"### [{news['title']}]({news['url']})\n"
                 markdown += f"* **출처**: {news.get('source', 'Unknown Source')}\n"
                 if news_image:
@@ -1241,64 +1866,416 @@ class TrendBlogSystem:
             
             self._log(f"블로그 포스트 저장 완료: {filepath}")
             
-            # 사용된 키워드 목록에 추가 (중복 방지)
-            used_keywords = self._load_used_keywords()
-            if keyword not in used_keywords:
-                used_keywords.append(keyword)
-                self._save_used_keywords(used_keywords)
+            # 사용된 키워드로 기록 (포스트 파일, 실행 ID 연결)
+            span = current_span()
+            self.keyword_store.mark_used(keyword, post_path=filepath, run_id=span.run_id if span else None)
+            with self._keyword_dedupe_lock:
+                if self._keyword_dedupe is not None:
+                    self._keyword_dedupe.add(keyword, {'kind': 'keyword', 'keyword': keyword, 'post_path': filepath})
+            
+            # 카탈로그에 등록 (제목/태그는 frontmatter에서, 카테고리는 분류 캐시에서)
+            try:
+                classification = self._get_cached_classification(keyword)
+                entry = self.post_catalog.add(filepath, content, keyword=keyword,
+                                              category=classification[0] if classification else None)
+                self.related_index.add(entry, content)
+                if self.content_dedupe_config.get('enabled', True):
+                    self.content_index.add(entry, content)
+            except Exception as e:
+                self._log(f"포스트 카탈로그 등록 오류: {e}", level='WARNING')
             
             return filepath
         
         except Exception as e:
-            self._log(f"블로그 포스트 저장 오류: {e}")
+            self._log(f"블로그 포스트 저장 오류: {e}", level='ERROR')
             return None
     
-    def run_blog_creation(self):
+    def _dedupe_content(self, keyword, content):
         """
-        전체 블로그 작성 프로세스 실행
+        생성된 본문을 기존 글과 비교해 content_dedupe 정책 적용
+        
+        유사도가 threshold 이상이면 action에 따라
+        'regenerate'는 리서치 결과는 그대로 두고 비슷한 글과 다르게 쓰라는 지침을 덧붙여
+        본문만 max_regenerations번까지 다시 생성하고(그래도 비슷하면 보류),
+        'hold'는 blog_posts/held/에 따로 저장, 'skip'은 저장하지 않는다.
+        보류/건너뛴 키워드는 같은 이슈로 다시 생성하지 않도록 사용된 키워드로 기록한다.
+        
+        Returns:
+            tuple: (저장할 콘텐츠 또는 None(보류/건너뜀), {'action', 'matches', 'held_path'})
         """
-        self._log("=" * 50)
-        self._log("블로그 작성 프로세스 시작")
+        config = self.content_dedupe_config
+        outcome = {'action': None, 'matches': [], 'held_path': None}
+        if not config.get('enabled', True):
+            return content, outcome
+        
+        attempts = int(config['max_regenerations']) if config['action'] == 'regenerate' else 0
+        for attempt in range(attempts + 1):
+            with self.tracer.span('content_dedupe', keyword=keyword, attempt=attempt) as span:
+                matches = self.content_index.check(content, top=config['top'])
+                best = matches[0]['similarity'] if matches else 0.0
+                span.set(similarity=best, candidates=len(matches))
+            outcome['matches'] = matches
+            if best < config['threshold']:
+                if attempt:
+                    outcome['action'] = 'regenerated'
+                return content, outcome
+            
+            closest = matches[0]
+            self._log(f"기존 글과 본문이 비슷합니다: '{keyword}' ≈ '{closest['keyword']}' "
+                      f"({closest['filename']}, 유사도 {best:.2f})", level='WARNING')
+            if attempt >= attempts:
+                break
+            self._log(f"본문 다시 생성 ({attempt + 1}/{attempts}): {keyword}")
+            regenerated = self._regenerate_blog_content(keyword, closest)
+            if not regenerated:
+                break
+            content = regenerated
+        
+        outcome['action'] = 'skip' if config['action'] == 'skip' else 'hold'
+        if outcome['action'] == 'hold':
+            held_dir = os.path.join(self.blog_posts_dir, config['held_dir'])
+            os.makedirs(held_dir, exist_ok=True)
+            outcome['held_path'] = os.path.join(held_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{keyword}.md")
+            with open(outcome['held_path'], 'w', encoding='utf-8') as f:
+                f.write(content)
+            self._log(f"유사 본문 보류: {outcome['held_path']}", level='WARNING')
+        else:
+            self._log(f"유사 본문이라 저장하지 않습니다: {keyword}", level='WARNING')
+        
+        span = current_span()
+        self.keyword_store.mark_used(keyword, post_path=outcome['held_path'], run_id=span.run_id if span else None)
+        return None, outcome
+    
+    def _regenerate_blog_content(self, keyword, closest):
+        """
+        마지막 리서치 결과(뉴스, 카테고리, 이미지, 영상, 관련 글)로 본문만 다시 생성
+        
+        프롬프트에 비슷했던 글의 제목/키워드를 알려 다른 관점으로 쓰게 하고, 본문 응답 캐시는 건너뛴다.
+        
+        Args:
+            keyword: 키워드
+            closest: 가장 비슷한 기존 글 (ContentSignatureIndex.check 결과 항목)
+        """
+        research = getattr(self._research, 'latest', None)
+        if not research or research['keyword'] != keyword:
+            self._log(f"다시 생성할 리서치 결과가 없습니다: {keyword}", level='WARNING')
+            return None
+        
+        prompt = research['prompt'] + "\n" + self.prompts.article_rewrite(
+            title=closest.get('title') or closest['filename'],
+            matched_keyword=closest.get('keyword') or '',
+            similarity=closest['similarity']
+        )
+        stream = self.config.get('stream_generation', False)
+        self._cache_bypass.purposes = ('article',)
+        try:
+            with self.tracer.span('article', stream=stream, regenerate=True) as span:
+                if stream:
+                    main_content = self._stream_article(prompt, keyword, prefix=research['prefix'])
+                else:
+                    main_content = self._generate_text(prompt, 'article', prefix=research['prefix'])
+                span.set(bytes=len((main_content or '').encode('utf-8')))
+        except GenerationAborted:
+            return None
+        except Exception as e:
+            self._log(f"본문 다시 생성 오류: {e}", level='ERROR')
+            return None
+        finally:
+            self._cache_bypass.purposes = ()
         
-        # 1. 트렌드 키워드 가져오기
-        keywords = self.get_trending_keywords()
+        if not main_content:
+            return None
+        return self._build_markdown_content(
+            keyword, main_content, research['news_items'], research['featured_image'],
+            youtube_embed=research['youtube_embed'], related_posts=research['related_posts']
+        )
+    
+    def _apply_duplicate_result(self, result, duplicate):
+        """보류/건너뛴 유사 본문을 create_post 결과와 알림에 반영"""
+        closest = duplicate['matches'][0] if duplicate['matches'] else {}
+        result['error'] = f"유사 본문 ({'보류' if duplicate['action'] == 'hold' else '건너뜀'})"
+        result['duplicate_of'] = closest.get('filename')
+        result['similarity'] = closest.get('similarity')
+        result['held_path'] = duplicate['held_path']
+        self._send_telegram_notification(
+            f"♻️ *유사 본문 {'보류' if duplicate['action'] == 'hold' else '건너뜀'}*\n\n*키워드*: {result['keyword']}\n"
+            f"*비슷한 글*: `{closest.get('filename')}` (유사도 {closest.get('similarity')})"
+        )
+    
+    def create_post(self, keyword):
+        """
+        단일 키워드로 블로그 콘텐츠 생성 및 저장
+        
+        Returns:
+            dict: {'keyword': str, 'success': bool, 'filepath': str, 'error': str, 'duration': float}
+        """
+        started = time.time()
+        result = {'keyword': keyword, 'success': False, 'filepath': None, 'error': None}
+        
+        try:
+            # 1. 블로그 콘텐츠 생성
+            content = self.generate_blog_content(keyword)
+            
+            if content:
+                # 2. 기존 글과 본문 중복 검사 (정책에 따라 다시 생성/보류/건너뜀)
+                content, duplicate = self._dedupe_content(keyword, content)
+                if content is None:
+                    self._apply_duplicate_result(result, duplicate)
+                    result['duration'] = round(time.time() - started, 1)
+                    return result
+            
+            if not content:
+                self._log(f"콘텐츠 생성에 실패했습니다: {keyword}", level='ERROR')
+                result['error'] = "콘텐츠 생성 실패"
+            else:
+                # 3. 블로그 포스트 저장
+                with self.tracer.span('save_blog_post'):
+                    filepath = self.save_blog_post(keyword, content)
+                
+                if filepath:
+                    self._log(f"블로그 작성 완료: {keyword}")
+                    self._send_telegram_notification(f"✅ *블로그 생성 완료*\n\n*키워드*: {keyword}\n*파일*: `{os.path.basename(filepath)}`")
+                    result['success'] = True
+                    result['filepath'] = filepath
+                else:
+                    self._log("블로그 저장에 실패했습니다.", level='ERROR')
+                    self._send_telegram_notification(f"❌ *블로그 생성 실패*\n\n*키워드*: {keyword}\n*원인*: 파일 저장 실패")
+                    result['error'] = "파일 저장 실패"
+        except Exception as e:
+            self._log(f"블로그 작성 오류 ({keyword}): {e}", level='ERROR')
+            result['error'] = str(e)
+        
+        result['duration'] = round(time.time() - started, 1)
+        return result
+
+    def _run_creation_batch(self, create_fn, batch_size=None, concurrency=None):
+        """
+        트렌드 키워드를 한 번 가져와 상위 N개 미사용 키워드를 동시에 생성
+        
+        Args:
+            create_fn: 키워드 하나를 받아 create_post 형식의 결과 dict를 반환하는 함수
+            batch_size: 한 번에 생성할 포스트 수 (기본값: config의 batch_size)
+            concurrency: 동시 생성 수 (기본값: config의 batch_concurrency)
+        
+        Returns:
+            list: 키워드별 결과 dict 리스트
+        """
+        batch_size = max(1, int(batch_size or self.config.get('batch_size', 1)))
+        concurrency = max(1, int(concurrency or self.config.get('batch_concurrency', 2)))
+        
+        # 1. 트렌드 키워드 가져오기 (배치 전체에서 한 번만 수행)
+        with self.tracer.span('trends') as span:
+            keywords = self.get_trending_keywords()
+            span.set(items=len(keywords or []))
         
         if not keywords:
             self._log("키워드를 가져올 수 없습니다.")
-            return
+            return []
         
-        # 2. 사용 가능한 키워드 선택
-        selected_keyword = self.select_keyword(keywords)
+        # 2. 미사용 키워드를 한 번에 분류 (본문 생성 시 분류 캐시에서 재사용)
+        with self.tracer.span('classify_keywords'):
+            self.classify_keywords(self.keyword_store.unused(keywords))
         
-        if not selected_keyword:
+        # 3. 사용 가능한 키워드 선택 (keyword_categories 설정 시 해당 카테고리만)
+        selected_keywords = self.select_keywords(
+            keywords, limit=batch_size, categories=self.config.get('keyword_categories')
+        )
+        
+        if not selected_keywords:
             self._log("모든 키워드가 이미 사용되었습니다.")
-            return
+            return []
         
-        # 3. 블로그 콘텐츠 생성
-        content = self.generate_blog_content(selected_keyword)
+        # 4. 블로그 생성 (배치 모드일 경우 제한된 워커 풀에서 병렬 실행)
+        if len(selected_keywords) == 1:
+            return [self._create_traced(create_fn, selected_keywords[0])]
         
-        if not content:
-            self._log("콘텐츠 생성에 실패했습니다.")
-            return
+        self._log(f"배치 모드: {len(selected_keywords)}개 키워드 생성 (동시 실행 {concurrency}개)")
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='batch') as executor:
+            # 워커 스레드에서도 같은 실행의 스팬으로 기록되도록 현재 컨텍스트를 함께 전달
+            futures = [
+                executor.submit(self.tracer.wrap(self._create_traced), create_fn, keyword)
+                for keyword in selected_keywords
+            ]
+            results = [future.result() for future in futures]
         
-        # 4. 블로그 포스트 저장
-        filepath = self.save_blog_post(selected_keyword, content)
+        self._record_batch_results(results, time.time() - started)
+        return results
+    
+    def _create_traced(self, create_fn, keyword):
+        """키워드 하나의 생성 과정을 스팬으로 기록 (실패 결과는 outcome='failed')"""
+        with self.tracer.span('create_post', keyword=keyword) as span:
+            result = create_fn(keyword)
+            if not result.get('success'):
+                span.set(outcome='failed', error=result.get('error'))
+            return result
+
+    def _record_batch_results(self, results, elapsed):
+        """배치 실행의 키워드별 성공/실패 기록"""
+        succeeded = [r['keyword'] for r in results if r['success']]
+        failed = [r for r in results if not r['success']]
         
-        if filepath:
-            self._log(f"블로그 작성 완료: {selected_keyword}")
-            self._send_telegram_notification(f"✅ *블로그 생성 완료*\n\n*키워드*: {selected_keyword}\n*파일*: `{os.path.basename(filepath)}`")
-        else:
-            self._log("블로그 저장에 실패했습니다.")
-            self._send_telegram_notification(f"❌ *블로그 생성 실패*\n\n*키워드*: {selected_keyword}\n*원인*: 파일 저장 실패")
+        self._log(f"배치 결과: 성공 {len(succeeded)}개 / 실패 {len(failed)}개 ({elapsed:.1f}초)")
+        for r in failed:
+            self._log(f"  - 실패: {r['keyword']} ({r['error']})", level='WARNING')
         
+        record = {
+            'finished_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'elapsed': round(elapsed, 1),
+            'results': results
+        }
+        try:
+            with open(self.batch_history_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except Exception as e:
+            self._log(f"배치 기록 저장 오류: {e}", level='ERROR')
+        
+        message = f"📦 *배치 생성 결과*\n\n*성공*: {len(succeeded)}개\n*실패*: {len(failed)}개"
+        if failed:
+            message += "\n*실패 키워드*: " + ", ".join(r['keyword'] for r in failed)
+        self._send_telegram_notification(message)
+    
+    def run_blog_creation(self, batch_size=None, concurrency=None):
+        """
+        전체 블로그 작성 프로세스 실행
+        
+        Args:
+            batch_size: 한 번에 생성할 포스트 수 (기본값: config의 batch_size)
+            concurrency: 배치 모드 동시 생성 수 (기본값: config의 batch_concurrency)
+        """
+        self._log("=" * 50)
+        self._log("블로그 작성 프로세스 시작")
+        
+        with self.tracer.span('run_blog_creation', batch_size=batch_size, concurrency=concurrency) as span:
+            self._log(f"트레이스 실행 ID: {span.run_id}")
+            results = self._run_creation_batch(self.create_post, batch_size, concurrency)
+            span.set(posts=len(results), succeeded=sum(1 for r in results if r['success']))
+        
+        self._log_browser_pool_stats()
         self._log("블로그 작성 프로세스 종료")
         self._log("=" * 50)
+        return results
+    
+    def run_profiled(self, run=None, mode=None):
+        """
+        run_blog_creation 1회를 프로파일러 아래에서 실행하고 blog_posts/profiles/{run_id}.* 에 산출물 저장
+        
+        Args:
+            run: 실행할 함수 (기본값: self.run_blog_creation)
+            mode: 'deterministic' 또는 'sampling' (기본값: config의 profiling.mode)
+        
+        Returns:
+            tuple: (실행 결과, 산출물 경로 dict)
+        """
+        from profiling import Profiler
+        
+        profiling_config = self.config.get('profiling', {})
+        profiler = Profiler(
+            mode=mode or profiling_config.get('mode', 'deterministic'),
+            interval=profiling_config.get('interval_ms', 5) / 1000.0,
+            memory=profiling_config.get('memory', True)
+        )
+        profiles_dir = os.path.join(self.blog_posts_dir, profiling_config.get('directory', 'profiles'))
+        
+        # 프로파일 스팬을 루트로 열어 run_blog_creation 트레이스와 같은 실행 ID를 사용
+        with self.tracer.span('profile', mode=profiler.mode) as span:
+            run_id = span.run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+            self._log(f"프로파일링 시작 ({profiler.mode}, 실행 ID: {run_id})")
+            profiler.start()
+            try:
+                results = (run or self.run_blog_creation)()
+            finally:
+                profiler.stop()
+            
+            artifacts = profiler.write(profiles_dir, run_id, extra={
+                'posts': [{'keyword': r['keyword'], 'success': r['success'], 'filepath': r.get('filepath')}
+                          for r in results or []],
+            }, top=profiling_config.get('top', 40))
+            span.set(elapsed_seconds=round(profiler.elapsed, 3))
+        
+        self._log(f"프로파일 저장: {', '.join(path for path in artifacts.values() if path)}")
+        return results, artifacts
+
+STARTUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import trend_blog_system
+t1 = time.perf_counter()
+system = trend_blog_system.TrendBlogSystem()
+t2 = time.perf_counter()
+heavy = [m for m in ('google.generativeai', 'pytrends', 'playwright', 'requests') if m in sys.modules]
+system._log_writer.flush()
+print(json.dumps({'import_ms': (t1 - t0) * 1000, 'init_ms': (t2 - t1) * 1000, 'heavy_modules': heavy}))
+"""
+
+def check_startup_budget(budget=None):
+    """
+    새 인터프리터에서 모듈 import 및 TrendBlogSystem 생성 시간을 측정하여 예산과 비교
+    
+    Args:
+        budget: {'import_ms': float, 'init_ms': float} (기본값: config의 startup_budget)
+    
+    Returns:
+        dict: 측정값, 예산, 초과 여부 및 미리 로드된 무거운 모듈 목록
+    """
+    import subprocess
+    import sys
+    
+    if budget is None:
+        with open('system_config.json', 'r', encoding='utf-8') as f:
+            budget = json.load(f).get('startup_budget', {})
+    budget = {'import_ms': 150, 'init_ms': 50, **budget}
+    
+    result = subprocess.run(
+        [sys.executable, '-c', STARTUP_PROBE],
+        capture_output=True, text=True, encoding='utf-8',
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    
+    # 생성자 로그가 stdout에 섞이므로 마지막 줄만 측정 결과로 사용
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    measured['budget'] = budget
+    measured['within_budget'] = (
+        measured['import_ms'] <= budget['import_ms']
+        and measured['init_ms'] <= budget['init_ms']
+        and not measured['heavy_modules']
+    )
+    return measured
 
 def main():
     """
     메인 실행 함수 - 스케줄링 설정
     """
+    import argparse
+    import schedule
+    
+    # CLI 인자 파싱
+    parser = argparse.ArgumentParser(description='Trend Blog System')
+    parser.add_argument('--batch', type=int, default=None, help='Number of posts to generate per scheduled run (default: config batch_size)')
+    parser.add_argument('--concurrency', type=int, default=None, help='Max posts generated in parallel in batch mode (default: config batch_concurrency)')
+    parser.add_argument('--startup-check', action='store_true', help='Measure import/construction time against the startup budget and exit')
+    parser.add_argument('--metrics-port', type=int, default=None, help='Serve Prometheus metrics on this localhost port (default: config metrics.port)')
+    parser.add_argument('--profile', action='store_true', help='Run run_blog_creation once under the profiler, save artifacts to blog_posts/profiles/ and exit')
+    parser.add_argument('--profile-mode', choices=['deterministic', 'sampling'], default=None, help='Profiler mode for --profile (default: config profiling.mode)')
+    args = parser.parse_args()
+    
+    if args.startup_check:
+        import sys
+        result = check_startup_budget()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        sys.exit(0 if result['within_budget'] else 1)
+    
     system = TrendBlogSystem()
+    system.start_metrics_server(args.metrics_port)
+    
+    if args.profile:
+        system.run_profiled(
+            lambda: system.run_blog_creation(batch_size=args.batch, concurrency=args.concurrency),
+            mode=args.profile_mode
+        )
+        return
     
     # 설정에서 발행 시간 가져오기
     publication_times = system.config.get('publication_times', ["08:00", "12:00", "16:00", "20:00"])
@@ -1306,12 +2283,13 @@ def main():
     # 스케줄 설정
     for t in publication_times:
         try:
-            schedule.every().day.at(t).do(system.run_blog_creation)
+            schedule.every().day.at(t).do(system.run_blog_creation, batch_size=args.batch, concurrency=args.concurrency)
         except Exception as e:
             print(f"스케줄 설정 오류 ({t}): {e}")
     
     print("블로그 자동 작성 시스템 시작")
     print(f"스케줄: {', '.join(publication_times)}")
+    print(f"배치 크기: {args.batch or system.config.get('batch_size', 1)}")
     print("중지하려면 Ctrl+C를 누르세요.")
     
     # 즉시 한 번 실행 (테스트용)
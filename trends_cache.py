@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+트렌드 키워드 스냅샷 캐시
+스케줄러, 대시보드, fetch_keywords.py가 같은 파일을 공유하여
+짧은 시간 안의 반복 조회에서 Chromium 실행 없이 바로 결과를 반환한다.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TrendsCache:
+    """
+    지역별 트렌드 키워드 스냅샷을 디스크에 저장하는 TTL 캐시
+
+    Args:
+        path: 캐시 파일 경로
+        ttl: 이 시간(초) 이내의 스냅샷은 그대로 사용 (fresh)
+        stale_ttl: 이 시간(초) 이내면 만료된 스냅샷을 반환하고 백그라운드에서 갱신 (stale)
+        refresh_timeout: 갱신 잠금 파일이 이 시간(초)보다 오래되면 비정상 종료로 간주
+    """
+
+    FRESH = 'fresh'
+    STALE = 'stale'
+    MISS = 'miss'
+
+    def __init__(self, path='trends_cache.json', ttl=600, stale_ttl=3600, refresh_timeout=180):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_timeout = refresh_timeout
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, region):
+        """
+        지역의 스냅샷 반환
+
+        Returns:
+            dict: {'region': str, 'keywords': list, 'fetched_at': float} 또는 None
+        """
+        entry = self._read().get(region)
+        if not entry or not entry.get('keywords'):
+            return None
+        return entry
+
+    def age(self, entry):
+        """스냅샷 생성 후 경과 시간(초)"""
+        return time.time() - entry.get('fetched_at', 0)
+
+    def lookup(self, region):
+        """
+        캐시 상태와 함께 키워드 조회
+
+        Returns:
+            tuple: (keywords 또는 None, 'fresh' | 'stale' | 'miss', 경과 시간(초) 또는 None)
+        """
+        entry = self.get(region)
+        if entry is None:
+            return None, self.MISS, None
+
+        age = self.age(entry)
+        if age < self.ttl:
+            return list(entry['keywords']), self.FRESH, age
+        if age < self.stale_ttl:
+            return list(entry['keywords']), self.STALE, age
+        return None, self.MISS, age
+
+    def set(self, region, keywords):
+        """스냅샷 저장 (임시 파일에 쓴 뒤 교체하여 다른 프로세스가 부분 파일을 읽지 않도록 함)"""
+        with self._lock:
+            data = self._read()
+            data[region] = {
+                'region': region,
+                'keywords': list(keywords),
+                'fetched_at': time.time()
+            }
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def _refresh_lock_path(self, region):
+        return f"{self.path}.{region}.lock"
+
+    def is_refreshing(self, region):
+        """다른 스레드/프로세스가 해당 지역을 갱신 중인지 확인"""
+        lock_path = self._refresh_lock_path(region)
+        try:
+            return time.time() - os.path.getmtime(lock_path) < self.refresh_timeout
+        except OSError:
+            return False
+
+    @contextmanager
+    def refresh_lock(self, region, force=False):
+        """
+        갱신 잠금 (프로세스 간 공유되는 잠금 파일)
+
+        이미 다른 곳에서 갱신 중이면 False를 yield한다.
+        force=True이면 잠금 여부와 관계없이 True를 yield한다 (강제 새로고침).
+        """
+        lock_path = self._refresh_lock_path(region)
+        acquired = False
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            acquired = True
+        except FileExistsError:
+            if not self.is_refreshing(region):
+                # 비정상 종료로 남은 잠금 파일은 인수
+                try:
+                    os.utime(lock_path, None)
+                    acquired = True
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+        try:
+            yield acquired or force
+        finally:
+            if acquired:
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
@@ -1,7 +1,7 @@
 import os
 import base64
-import requests
 import re
+import time
 from dotenv import load_dotenv
 from trend_blog_system import TrendBlogSystem
 
@@ -25,21 +25,33 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
         else:
             self._log("WordPress 설정이 없습니다. 로컬 파일로만 저장됩니다.")
 
-    def get_related_posts(self, current_keyword):
+    def get_related_posts(self, current_keyword, context=None, category=None):
         """
-        WordPress에서 최신 게시물 3개를 가져와 추천 글로 반환
+        WordPress에 게시된 글 중 연관성 높은 글을 추천 글로 반환
+        (관련 글 색인에서 게시 링크가 있는 글만 선정, 카탈로그에 게시 기록이 없으면 WordPress 최신 글 조회)
         """
         if not self.wp_url or not self.wp_username or not self.wp_app_password:
             self._log("WordPress 설정이 없어 로컬 관련글 로직을 사용합니다.")
-            return super().get_related_posts(current_keyword)
+            return super().get_related_posts(current_keyword, context=context, category=category)
 
+        try:
+            entries = self._related_entries(current_keyword, context, category, where=lambda entry: entry['wp_url'])
+            if entries:
+                return [{'title': entry['title'] or entry['keyword'], 'url': entry['wp_url'], 'score': score}
+                        for score, entry in entries]
+        except Exception as e:
+            self._log(f"관련 글 색인 조회 실패: {e}", level='WARNING')
+        return self._fetch_latest_wp_posts()
+
+    def _fetch_latest_wp_posts(self, count=3):
+        """WordPress에서 최신 게시물을 가져와 추천 글로 반환"""
         try:
             self._log("WordPress에서 최신 게시물 가져오는 중...")
             headers = self.get_wp_headers()
             
-            # 최신 게시물 3개 가져오기
-            api_url = f"{self.wp_url}/wp-json/wp/v2/posts?per_page=3&status=publish"
-            response = requests.get(api_url, headers=headers, timeout=10)
+            # 최신 게시물 가져오기
+            api_url = f"{self.wp_url}/wp-json/wp/v2/posts?per_page={count}&status=publish"
+            response = self._http('GET', api_url, 'wordpress.list_posts', headers=headers, timeout=10)
             response.raise_for_status()
             
             posts = response.json()
@@ -62,7 +74,7 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
                 return []
                 
         except Exception as e:
-            self._log(f"WordPress 게시물 가져오기 실패: {e}")
+            self._log(f"WordPress 게시물 가져오기 실패: {e}", level='ERROR')
             return []
     
     def get_wp_headers(self):
@@ -86,7 +98,7 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
         try:
             # 카테고리 검색
             search_url = f"{self.wp_url}/wp-json/wp/v2/categories?search={category_name}"
-            response = requests.get(search_url, headers=headers)
+            response = self._http('GET', search_url, 'wordpress.find_category', headers=headers)
             response.raise_for_status()
             categories = response.json()
             
@@ -99,14 +111,14 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
             self._log(f"카테고리 생성 중: {category_name}...")
             create_url = f"{self.wp_url}/wp-json/wp/v2/categories"
             data = {"name": category_name}
-            response = requests.post(create_url, headers=headers, json=data)
+            response = self._http('POST', create_url, 'wordpress.create_category', headers=headers, json=data)
             response.raise_for_status()
             category_id = response.json()['id']
             self._log(f"카테고리 생성 완료: {category_name} (ID: {category_id})")
             return category_id
             
         except Exception as e:
-            self._log(f"카테고리 관리 오류 {category_name}: {e}")
+            self._log(f"카테고리 관리 오류 {category_name}: {e}", level='ERROR')
             return None
     
     def get_or_create_tag(self, tag_name):
@@ -117,7 +129,7 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
         headers = self.get_wp_headers()
         try:
             search_url = f"{self.wp_url}/wp-json/wp/v2/tags?search={tag_name}"
-            response = requests.get(search_url, headers=headers)
+            response = self._http('GET', search_url, 'wordpress.find_tag', headers=headers)
             response.raise_for_status()
             tags = response.json()
             
@@ -127,11 +139,11 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
             
             create_url = f"{self.wp_url}/wp-json/wp/v2/tags"
             data = {"name": tag_name}
-            response = requests.post(create_url, headers=headers, json=data)
+            response = self._http('POST', create_url, 'wordpress.create_tag', headers=headers, json=data)
             response.raise_for_status()
             return response.json()['id']
         except Exception as e:
-            self._log(f"태그 관리 오류 {tag_name}: {e}")
+            self._log(f"태그 관리 오류 {tag_name}: {e}", level='ERROR')
             return None
     
     def extract_title_from_markdown(self, markdown_content):
@@ -263,7 +275,7 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
                     </div>
                     '''
                 except Exception as e:
-                    self._log(f"뉴스 아이템 파싱 오류: {e}")
+                    self._log(f"뉴스 아이템 파싱 오류: {e}", level='ERROR')
                     continue
             
             news_items_html += '</div>\n'
@@ -328,8 +340,14 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
         
         return '\n'.join(final_lines)
     
-    def post_to_wordpress(self, title, content, tags=None):
-        """WordPress에 게시글 포스팅 (스타일 시트 추가)"""
+    def post_to_wordpress(self, title, content, tags=None, keyword=None, filepath=None):
+        """
+        WordPress에 게시글 포스팅 (스타일 시트 추가)
+        
+        Args:
+            keyword: 지정 시 키워드 기록에 게시 링크를 연결
+            filepath: 지정 시 포스트 카탈로그에 게시 ID/링크를 기록
+        """
         if not self.wp_url or not self.wp_username or not self.wp_app_password:
             self._log("WordPress 설정이 없어 포스팅을 건너뜁니다.")
             return False
@@ -376,7 +394,9 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
             tag_ids = [self.get_or_create_tag(t) for t in tags if t] if tags else []
             
             # Markdown을 HTML로 변환하고 스타일 시트 추가
-            html_content = style_css + self.markdown_to_html(content)
+            with self.tracer.span('markdown_to_html') as span:
+                html_content = style_css + self.markdown_to_html(content)
+                span.set(bytes=len(html_content.encode('utf-8')))
             
             # 게시글 데이터
             wp_post_data = {
@@ -389,74 +409,114 @@ class WordPressTrendBlogSystem(TrendBlogSystem):
             
             # 포스팅
             api_url = f"{self.wp_url}/wp-json/wp/v2/posts"
-            response = requests.post(api_url, headers=headers, json=wp_post_data)
+            response = self._http('POST', api_url, 'wordpress.create_post', headers=headers, json=wp_post_data)
             response.raise_for_status()
             
-            post_link = response.json().get('link')
+            posted = response.json()
+            post_link = posted.get('link')
             self._log(f"WordPress 포스팅 성공: {post_link}")
+            if keyword and post_link:
+                self.keyword_store.link_post(keyword, post_link)
+            if filepath:
+                self.post_catalog.set_wp_post(filepath, posted.get('id'), post_link)
+                self.related_index.update_entry(os.path.basename(filepath), wp_post_id=posted.get('id'), wp_url=post_link)
             self._send_telegram_notification(f"🌐 *워드프레스 포스팅 완료*\n\n*제목*: {title}\n*링크*: {post_link}")
             return True
             
         except Exception as e:
-            self._log(f"WordPress 포스팅 오류: {e}")
+            self._log(f"WordPress 포스팅 오류: {e}", level='ERROR')
             self._send_telegram_notification(f"⚠️ *워드프레스 포스팅 오류*\n\n*제목*: {title}\n*오류*: `{str(e)[:100]}`")
             if 'response' in locals() and response:
                 self._log(f"응답: {response.text}")
             return False
     
-    def run_blog_creation(self, do_post=False):
+    def create_post(self, keyword, do_post=False):
         """
-        전체 블로그 작성 프로세스 실행 (WordPress 포스팅 포함)
+        단일 키워드로 블로그 생성, 로컬 저장 및 WordPress 포스팅
         
         Args:
+            keyword: 키워드
             do_post (bool): True일 경우에만 워드프레스에 포스팅 수행
-        """
-        self._log("=" * 50)
-        self._log(f"블로그 작성 프로세스 시작 (doPost={do_post})")
-        
-        # 1. 트렌드 키워드 가져오기
-        keywords = self.get_trending_keywords()
-        
-        if not keywords:
-            self._log("키워드를 가져올 수 없습니다.")
-            return
         
-        # 2. 사용 가능한 키워드 선택
-        selected_keyword = self.select_keyword(keywords)
-        
-        if not selected_keyword:
-            self._log("모든 키워드가 이미 사용되었습니다.")
-            return
+        Returns:
+            dict: {'keyword': str, 'success': bool, 'filepath': str, 'error': str, 'duration': float, 'posted': bool}
+        """
+        started = time.time()
+        result = {'keyword': keyword, 'success': False, 'filepath': None, 'error': None, 'posted': False}
         
-        # 3. 블로그 콘텐츠 생성 (부모 클래스의 메서드 사용 - 카테고리 로직 포함됨)
-        content = self.generate_blog_content(selected_keyword)
+        try:
+            # 1. 블로그 콘텐츠 생성 (부모 클래스의 메서드 사용 - 카테고리 로직 포함됨)
+            content = self.generate_blog_content(keyword)
+            
+            if content:
+                # 2. 기존 글과 본문 중복 검사 (보류/건너뛴 글은 저장/포스팅하지 않음)
+                content, duplicate = self._dedupe_content(keyword, content)
+                if content is None:
+                    self._apply_duplicate_result(result, duplicate)
+                    result['duration'] = round(time.time() - started, 1)
+                    return result
+            
+            if not content:
+                self._log(f"콘텐츠 생성에 실패했습니다: {keyword}", level='ERROR')
+                result['error'] = "콘텐츠 생성 실패"
+            else:
+                # 3. 블로그 포스트 저장 (로컬)
+                with self.tracer.span('save_blog_post'):
+                    filepath = self.save_blog_post(keyword, content)
+                
+                if filepath:
+                    self._log(f"블로그 작성 완료: {keyword}")
+                    result['success'] = True
+                    result['filepath'] = filepath
+                    
+                    # 4. WordPress에 포스팅 (do_post=True 일 때만)
+                    if do_post:
+                        title = self.extract_title_from_markdown(content)
+                        tags = self.extract_tags_from_markdown(content)
+                        
+                        if not tags:
+                            tags = [keyword]
+                        
+                        with self.tracer.span('post_to_wordpress') as span:
+                            result['posted'] = self.post_to_wordpress(title, content, tags, keyword=keyword, filepath=filepath)
+                            if not result['posted']:
+                                span.set(outcome='failed')
+                    else:
+                        self._log("워드프레스 포스팅 생략 (doPost=False)")
+                else:
+                    self._log("블로그 저장에 실패했습니다.", level='ERROR')
+                    result['error'] = "파일 저장 실패"
+        except Exception as e:
+            self._log(f"블로그 작성 오류 ({keyword}): {e}", level='ERROR')
+            result['error'] = str(e)
         
-        if not content:
-            self._log("콘텐츠 생성에 실패했습니다.")
-            return
+        result['duration'] = round(time.time() - started, 1)
+        return result
+    
+    def run_blog_creation(self, do_post=False, batch_size=None, concurrency=None):
+        """
+        전체 블로그 작성 프로세스 실행 (WordPress 포스팅 포함)
         
-        # 4. 블로그 포스트 저장 (로컬)
-        filepath = self.save_blog_post(selected_keyword, content)
+        Args:
+            do_post (bool): True일 경우에만 워드프레스에 포스팅 수행
+            batch_size: 한 번에 생성할 포스트 수 (기본값: config의 batch_size)
+            concurrency: 배치 모드 동시 생성 수 (기본값: config의 batch_concurrency)
+        """
+        self._log("=" * 50)
+        self._log(f"블로그 작성 프로세스 시작 (doPost={do_post})")
         
-        if filepath:
-            self._log(f"블로그 작성 완료: {selected_keyword}")
-            
-            # 5. WordPress에 포스팅 (do_post=True 일 때만)
-            if do_post:
-                title = self.extract_title_from_markdown(content)
-                tags = self.extract_tags_from_markdown(content)
-                
-                if not tags:
-                    tags = [selected_keyword]
-                
-                self.post_to_wordpress(title, content, tags)
-            else:
-                self._log("워드프레스 포스팅 생략 (doPost=False)")
-        else:
-            self._log("블로그 저장에 실패했습니다.")
+        with self.tracer.span('run_blog_creation', do_post=do_post, batch_size=batch_size, concurrency=concurrency) as span:
+            self._log(f"트레이스 실행 ID: {span.run_id}")
+            results = self._run_creation_batch(
+                lambda keyword: self.create_post(keyword, do_post=do_post),
+                batch_size, concurrency
+            )
+            span.set(posts=len(results), succeeded=sum(1 for r in results if r['success']))
         
+        self._log_browser_pool_stats()
         self._log("블로그 작성 프로세스 종료")
         self._log("=" * 50)
+        return results
 
 
 def main():
@@ -464,13 +524,17 @@ def main():
     메인 실행 함수 - 스케줄링 및 CLI 인자 처리
     """
     import schedule
-    import time
     import argparse
     import sys
     
     # CLI 인자 파싱
     parser = argparse.ArgumentParser(description='WordPress Trend Blog System')
     parser.add_argument('--doPost', action='store_true', help='Set this flag to enable posting to WordPress')
+    parser.add_argument('--batch', type=int, default=None, help='Number of posts to generate per scheduled run (default: config batch_size)')
+    parser.add_argument('--concurrency', type=int, default=None, help='Max posts generated in parallel in batch mode (default: config batch_concurrency)')
+    parser.add_argument('--metrics-port', type=int, default=None, help='Serve Prometheus metrics on this localhost port (default: config metrics.port)')
+    parser.add_argument('--profile', action='store_true', help='Run run_blog_creation once under the profiler, save artifacts to blog_posts/profiles/ and exit')
+    parser.add_argument('--profile-mode', choices=['deterministic', 'sampling'], default=None, help='Profiler mode for --profile (default: config profiling.mode)')
     args = parser.parse_args()
     
     start_msg = "블로그 자동 작성 시스템 시작"
@@ -482,20 +546,28 @@ def main():
     print(start_msg)
     
     system = WordPressTrendBlogSystem()
+    system.start_metrics_server(args.metrics_port)
     
     # 스케줄 설정: 오전 8시부터 4시간 간격
     # 인자 전달을 위해 lambda 사용
-    schedule.every().day.at("08:00").do(lambda: system.run_blog_creation(do_post=args.doPost))
-    schedule.every().day.at("12:00").do(lambda: system.run_blog_creation(do_post=args.doPost))
-    schedule.every().day.at("16:00").do(lambda: system.run_blog_creation(do_post=args.doPost))
-    schedule.every().day.at("20:00").do(lambda: system.run_blog_creation(do_post=args.doPost))
+    run_job = lambda: system.run_blog_creation(do_post=args.doPost, batch_size=args.batch, concurrency=args.concurrency)
+    
+    if args.profile:
+        system.run_profiled(run_job, mode=args.profile_mode)
+        return
+    
+    schedule.every().day.at("08:00").do(run_job)
+    schedule.every().day.at("12:00").do(run_job)
+    schedule.every().day.at("16:00").do(run_job)
+    schedule.every().day.at("20:00").do(run_job)
     
     print("스케줄: 08:00, 12:00, 16:00, 20:00")
+    print(f"배치 크기: {args.batch or system.config.get('batch_size', 1)}")
     print("중지하려면 Ctrl+C를 누르세요.")
     
     # 즉시 한 번 실행 (테스트용)
     print("초기 실행 중...")
-    system.run_blog_creation(do_post=args.doPost)
+    run_job()
     
     # 스케줄 루프 실행
     while True: